@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+"""Persistent evaluation cache for the balance tuners.
+
+One SQLite row per episode, keyed by
+(data hash, sim version, tick rate, max_waves, genome, episode seed), so a rerun
+with the same settings skips the sim entirely, and candidates sharing a seed
+reuse each other's episodes. The file lives next to the balance profile
+(override with PATHFORGE_BALANCE_CACHE=<path>, disable with =0).
+
+Workers of a ProcessPoolExecutor open their own connection: the database runs
+in WAL mode with a busy timeout, and every write is a short INSERT OR REPLACE
+transaction, so concurrent writers just serialize briefly.
+
+Rows may carry the episode's per-wave trajectory (JSON, see sim._TrajectoryRecorder)
+when the tuner ran with PATHFORGE_BALANCE_TRAJECTORY=1; balance/rescore.py scores
+genomes offline from those.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from ..core.balance_profile import PROFILE_FILE
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+_COLUMNS = ("data_hash", "sim_version", "tick_hz", "max_waves", "genome", "seed", "waves",
+            "gold_end", "lives_end", "wall_s", "created", "trajectory")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS episodes (
+    data_hash   TEXT    NOT NULL,
+    sim_version TEXT    NOT NULL,
+    tick_hz     REAL    NOT NULL,
+    max_waves   INTEGER NOT NULL,
+    genome      TEXT    NOT NULL,
+    seed        INTEGER NOT NULL,
+    waves       INTEGER NOT NULL,
+    gold_end    INTEGER,
+    lives_end   INTEGER,
+    wall_s      REAL,
+    created     REAL,
+    trajectory  TEXT,
+    PRIMARY KEY (data_hash, sim_version, tick_hz, max_waves, genome, seed)
+)
+"""
+
+
+def default_path() -> Optional[str]:
+    v = str(os.environ.get("PATHFORGE_BALANCE_CACHE", "")).strip()
+    if v.lower() in ("0", "false", "no", "off"):
+        return None
+    if v and v.lower() not in ("1", "true", "yes", "on"):
+        return v
+    return os.path.join(os.path.dirname(PROFILE_FILE), "balance_cache.sqlite")
+
+
+def data_hash(towers_db: Dict[str, Any], enemies_db: Dict[str, Any], perks_db: Any) -> str:
+    """Content hash of a set of DBs."""
+    h = hashlib.sha256()
+    for part in (towers_db, enemies_db, perks_db):
+        h.update(json.dumps(part, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()[:24]
+
+
+@functools.lru_cache(maxsize=1)
+def base_dbs() -> Tuple[Dict[str, Any], Dict[str, Any], list]:
+    """(towers_db, enemies_db, perks_db) as shipped in pathforge/data, procedural perks included.
+
+    The tuners simulate genomes on these, never on a Game()'s DBs, which carry whatever
+    balance_profile.json was saved last. Shared and read-only.
+    """
+    from ..systems.perk_factory import extend_with_procedural
+
+    dbs = []
+    for name in ("towers.json", "enemies.json", "perks.json"):
+        with open(os.path.join(DATA_DIR, name), "r", encoding="utf-8") as f:
+            dbs.append(json.load(f))
+    towers_db, enemies_db, perks_db = dbs
+    return towers_db, enemies_db, extend_with_procedural(perks_db, towers_db)
+
+
+@functools.lru_cache(maxsize=1)
+def base_data_hash() -> str:
+    """Cache key of the shipped data: the same on every machine and after any tuner run."""
+    return data_hash(*base_dbs())
+
+
+def genome_key(genome_tup: Sequence[Any]) -> str:
+    # repr keeps floats exact, so a key never aliases two different genomes
+    return ",".join(repr(float(x)) if isinstance(x, float) else str(int(x)) for x in genome_tup)
+
+
+def parse_genome_key(key: str) -> Tuple[Any, ...]:
+    return tuple(float(x) if ("." in x or "e" in x or "n" in x) else int(x) for x in str(key).split(","))
+
+
+class EvalCache:
+    def __init__(self, path: str, data_hash: str, sim_version: str, tick_hz: float):
+        self.path = path
+        self.data_hash = str(data_hash)
+        self.sim_version = str(sim_version)
+        self.tick_hz = float(tick_hz)
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            d = os.path.dirname(self.path)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("PRAGMA busy_timeout=30000")
+            db.execute(_SCHEMA)
+            cols = {r[1] for r in db.execute("PRAGMA table_info(episodes)")}
+            if "trajectory" not in cols:
+                # cache files written before trajectories were recorded
+                try:
+                    db.execute("ALTER TABLE episodes ADD COLUMN trajectory TEXT")
+                except sqlite3.OperationalError as ex:
+                    # another process sharing the file migrated it first
+                    if "duplicate column name" not in str(ex).lower():
+                        raise
+            self._db = db
+        return self._db
+
+    def get(self, genome_tup: Sequence[Any], seeds: Iterable[int], max_waves: int,
+            with_trajectory: bool = False) -> Dict[int, int]:
+        """{seed: waves_cleared} for the seeds already recorded (only rows with a trajectory if asked)."""
+        seeds = [int(s) for s in seeds]
+        if not seeds:
+            return {}
+        q = ("SELECT seed, waves FROM episodes WHERE data_hash=? AND sim_version=? AND tick_hz=? "
+             "AND max_waves=? AND genome=? AND seed IN (%s)" % ",".join("?" * len(seeds)))
+        if with_trajectory:
+            q += " AND trajectory IS NOT NULL"
+        args = [self.data_hash, self.sim_version, self.tick_hz, int(max_waves), genome_key(genome_tup)] + seeds
+        try:
+            return {int(s): int(w) for s, w in self._conn().execute(q, args)}
+        except sqlite3.Error:
+            return {}
+
+    def put(self, genome_tup: Sequence[Any], max_waves: int,
+            rows: Iterable[Tuple[Any, ...]]):
+        """rows: (seed, waves, gold_end, lives_end, wall_s[, trajectory dict]) per episode."""
+        g = genome_key(genome_tup)
+        now = time.time()
+        data = []
+        for s, w, gold, lives, wall, *traj in rows:
+            tj = json.dumps(traj[0], separators=(",", ":")) if traj and traj[0] is not None else None
+            data.append((self.data_hash, self.sim_version, self.tick_hz, int(max_waves), g, int(s), int(w),
+                         gold, lives, wall, now, tj))
+        if not data:
+            return
+        try:
+            db = self._conn()
+            db.execute("BEGIN IMMEDIATE")
+            db.executemany("INSERT OR REPLACE INTO episodes (%s) VALUES (%s)"
+                           % (",".join(_COLUMNS), ",".join("?" * len(_COLUMNS))), data)
+            db.execute("COMMIT")
+        except sqlite3.Error:
+            try:
+                self._db.execute("ROLLBACK")
+            except Exception:
+                pass
+
+    def trajectories(self, max_waves: Optional[int] = None) -> Iterator[Tuple[Tuple[Any, ...], int, int, Dict[str, Any]]]:
+        """(genome tuple, seed, max_waves, trajectory) for every stored trajectory under this
+        data hash / sim version / tick rate (any max_waves unless given)."""
+        q = ("SELECT genome, seed, max_waves, trajectory FROM episodes WHERE data_hash=? AND sim_version=? "
+             "AND tick_hz=? AND trajectory IS NOT NULL")
+        args: list = [self.data_hash, self.sim_version, self.tick_hz]
+        if max_waves is not None:
+            q += " AND max_waves=?"
+            args.append(int(max_waves))
+        try:
+            rows = self._conn().execute(q, args).fetchall()
+        except sqlite3.Error:
+            return
+        for g, s, mw, tj in rows:
+            try:
+                yield parse_genome_key(g), int(s), int(mw), json.loads(tj)
+            except (ValueError, TypeError):
+                continue
+
+    def close(self):
+        if self._db is not None:
+            try:
+                self._db.close()
+            except Exception:
+                pass
+            self._db = None
@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+"""Multi-node episode evaluation: a TCP coordinator and pull-based workers.
+
+The tuner side (Coordinator) looks like a ProcessPoolExecutor that only runs
+`_eval_episode_task`: submit() queues a (genome, seed) job and returns a
+concurrent.futures.Future, so tune_ga's as_completed() loop is unchanged.
+
+Workers (`python -m pathforge.balance worker --connect host:port`) connect,
+receive the tower/enemy/perk DBs once (skipped on reconnect when the data hash
+matches), then pull small batches and send one result per episode. Jobs held
+by a worker whose connection drops, or whose lease expires, go back to the
+front of the queue; late duplicate results are ignored.
+
+The random-search pruning bound (best score so far) is pushed with every batch
+of jobs, and a worker's running episode polls it at wave boundaries (at most
+every BOUND_POLL_S), so remote episodes see improvements found after they started.
+
+Wire format: one JSON object per line (no pickle, so nothing executable crosses
+the network). The init message also carries the sim settings that key cached
+results (projectile mode, tick rate), so every worker simulates what the
+coordinator caches. An optional shared token (PATHFORGE_BALANCE_TOKEN) is checked in
+the hello message. The coordinator binds 127.0.0.1 unless told otherwise.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Deque, Dict, Optional, Tuple
+
+LEASE_S = 900.0        # a job not answered within this is handed to another worker
+WAIT_S = 0.25          # idle worker back-off when the queue is empty
+RECONNECT_MAX_S = 5.0
+BOUND_POLL_S = 1.0
+
+
+def parse_addr(addr: str, default_host: str = "127.0.0.1") -> Tuple[str, int]:
+    host, _, port = str(addr).rpartition(":")
+    return (host or default_host), int(port)
+
+
+def _send(f, msg: Dict[str, Any]):
+    f.write(json.dumps(msg, separators=(",", ":")).encode("utf-8") + b"\n")
+    f.flush()
+
+
+def _recv(f) -> Optional[Dict[str, Any]]:
+    line = f.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+class Coordinator:
+    def __init__(self, addr: str, towers_db: Dict[str, Any], enemies_db: Dict[str, Any], perks_db: list,
+                 data_hash: str, token: Optional[str] = None, log_level: int = 1):
+        self.host, self.port = parse_addr(addr)
+        self.data = {"towers": towers_db, "enemies": enemies_db, "perks": perks_db}
+        self.data_hash = str(data_hash)
+        self.token = token if token is not None else os.environ.get("PATHFORGE_BALANCE_TOKEN") or None
+        self.log_level = int(log_level)
+        self._lock = threading.Lock()
+        self._pending: Deque[int] = deque()
+        self._jobs: Dict[int, Tuple[list, Future]] = {}
+        self._leases: Dict[int, Tuple[int, float]] = {}   # job id -> (conn id, sent at)
+        self._conns: Dict[int, Dict[str, Any]] = {}       # conn id -> {"name", "slots", "done"}
+        self._next_id = 0
+        self._next_conn = 0
+        self._closing = False
+        self.bound = float("inf")
+        self._server = None
+        self._thread = None
+
+    # ---- executor-like API ----
+    @property
+    def slots(self) -> int:
+        with self._lock:
+            return max(1, sum(int(c.get("slots", 1)) for c in self._conns.values()))
+
+    def start(self) -> "Coordinator":
+        coord = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                coord._serve(self.rfile, self.wfile, self.client_address)
+
+        class Server(socketserver.ThreadingTCPServer):
+            allow_reuse_address = True
+            daemon_threads = True
+
+        self._server = Server((self.host, self.port), Handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="pf-coordinator", daemon=True)
+        self._thread.start()
+        if self.log_level:
+            print(f"[BAL][NET] coordinator on {self.host}:{self.port} (data={self.data_hash[:10]})", flush=True)
+        return self
+
+    def submit(self, fn, *args) -> Future:
+        if getattr(fn, "__name__", "") != "_eval_episode_task":
+            raise ValueError("Coordinator only runs _eval_episode_task jobs")
+        fut: Future = Future()
+        with self._lock:
+            jid = self._next_id
+            self._next_id += 1
+            self._jobs[jid] = (list(args), fut)
+            self._pending.append(jid)
+        return fut
+
+    def set_bound(self, value: float):
+        self.bound = float(value)
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        with self._lock:
+            self._closing = True
+            for jid in list(self._pending):
+                _, fut = self._jobs.pop(jid, (None, None))
+                if fut is not None and not fut.done():
+                    fut.cancel()
+            self._pending.clear()
+        if self._server is not None:
+            # let connected workers receive "bye" on their next pull
+            deadline = time.time() + (2.0 if wait else 0.0)
+            while wait and time.time() < deadline:
+                with self._lock:
+                    if not self._conns:
+                        break
+                time.sleep(0.05)
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    # ---- server side ----
+    def _requeue(self, conn_id: Optional[int] = None, expired_before: Optional[float] = None):
+        # caller holds the lock
+        back = [jid for jid, (cid, t) in self._leases.items()
+                if (conn_id is not None and cid == conn_id) or (expired_before is not None and t < expired_before)]
+        for jid in back:
+            del self._leases[jid]
+            if jid in self._jobs:
+                self._pending.appendleft(jid)
+        return len(back)
+
+    def _take(self, conn_id: int, n: int) -> list:
+        with self._lock:
+            self._requeue(expired_before=time.time() - LEASE_S)
+            out = []
+            while self._pending and len(out) < n:
+                jid = self._pending.popleft()
+                if jid not in self._jobs:
+                    continue
+                args, fut = self._jobs[jid]
+                if fut.done():
+                    self._jobs.pop(jid, None)
+                    continue
+                self._leases[jid] = (conn_id, time.time())
+                out.append({"id": jid, "args": args})
+            return out
+
+    def _complete(self, jid: int, res: Optional[list], err: Optional[str]):
+        with self._lock:
+            self._leases.pop(jid, None)
+            item = self._jobs.pop(jid, None)
+        if item is None:
+            return  # duplicate after a re-queue
+        fut = item[1]
+        if fut.done():
+            return
+        if err is not None:
+            fut.set_exception(RuntimeError(err))
+        else:
+            fut.set_result(tuple(res))
+
+    @staticmethod
+    def _sim_env() -> Dict[str, str]:
+        from .sim import projectile_mode, resolve_tick_hz
+        return {"PATHFORGE_BALANCE_PROJECTILES": projectile_mode(), "PATHFORGE_BALANCE_TICK_HZ": repr(resolve_tick_hz(None))}
+
+    def _serve(self, rfile, wfile, client):
+        hello = _recv(rfile)
+        if not hello or hello.get("op") != "hello" or (self.token and hello.get("token") != self.token):
+            _send(wfile, {"op": "bye", "reason": "unauthorized"})
+            return
+        with self._lock:
+            cid = self._next_conn
+            self._next_conn += 1
+            self._conns[cid] = {"name": str(hello.get("name", client[0])), "slots": int(hello.get("slots", 1)), "done": 0}
+        name = self._conns[cid]["name"]
+        if self.log_level:
+            print(f"[BAL][NET] worker {name} connected", flush=True)
+        try:
+            if hello.get("data") == self.data_hash:
+                _send(wfile, {"op": "init", "data": self.data_hash, "env": self._sim_env()})
+            else:
+                _send(wfile, {"op": "init", "data": self.data_hash, "env": self._sim_env(), "dbs": self.data})
+            while True:
+                msg = _recv(rfile)
+                if msg is None:
+                    return
+                op = msg.get("op")
+                if op == "result":
+                    self._complete(int(msg["id"]), msg.get("res"), msg.get("error"))
+                    self._conns[cid]["done"] += 1
+                elif op == "pull":
+                    if self._closing:
+                        _send(wfile, {"op": "bye"})
+                        return
+                    jobs = self._take(cid, max(1, int(msg.get("n", 1))))
+                    if jobs:
+                        _send(wfile, {"op": "jobs", "jobs": jobs, "bound": self.bound})
+                    else:
+                        _send(wfile, {"op": "wait", "s": WAIT_S})
+                elif op == "bound":
+                    _send(wfile, {"op": "bound", "value": self.bound})
+        except (OSError, ValueError):
+            return
+        finally:
+            with self._lock:
+                n = self._requeue(conn_id=cid)
+                self._conns.pop(cid, None)
+            if self.log_level:
+                print(f"[BAL][NET] worker {name} gone ({n} jobs re-queued)", flush=True)
+
+
+class _RemoteBound:
+    """Stands in for the pool's shared Value on a remote worker: `.value` asks the
+    coordinator (rate-limited) between sim steps, while the connection is otherwise idle."""
+
+    def __init__(self, f, value: float = float("inf")):
+        self.f = f
+        self._value = float(value)
+        self._at = time.time()
+
+    @property
+    def value(self) -> float:
+        if time.time() - self._at >= BOUND_POLL_S:
+            self._at = time.time()
+            try:
+                _send(self.f, {"op": "bound"})
+                msg = _recv(self.f)
+                if msg and msg.get("op") == "bound":
+                    self._value = float(msg["value"])
+            except (OSError, ValueError):
+                pass  # the job loop notices the broken connection
+        return self._value
+
+    def push(self, value):
+        if value is not None:
+            self._value = float(value)
+            self._at = time.time()
+
+
+def worker_main(addr: str, batch: int = 2, name: Optional[str] = None, token: Optional[str] = None,
+                log_level: int = 1, give_up_s: float = 300.0):
+    """Pull episodes from a coordinator until it says bye; reconnect on connection loss.
+
+    Gives up after give_up_s seconds without reaching the coordinator (<= 0: never).
+    """
+    from .tune import _RESIDENT, _eval_episode_task, _init_episode_worker
+
+    host, port = parse_addr(addr)
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    token = token if token is not None else os.environ.get("PATHFORGE_BALANCE_TOKEN") or None
+    data_hash = None
+    backoff = 0.5
+    done = 0
+    lost_at = time.time()
+    while True:
+        try:
+            sock = socket.create_connection((host, port), timeout=30.0)
+        except OSError:
+            if give_up_s > 0 and time.time() - lost_at > give_up_s:
+                if log_level:
+                    print(f"[BAL][NET] {name}: no coordinator at {host}:{port}, exiting ({done} episodes)", flush=True)
+                return done
+            time.sleep(backoff)
+            backoff = min(RECONNECT_MAX_S, backoff * 2)
+            continue
+        backoff = 0.5
+        sock.settimeout(None)
+        f = sock.makefile("rwb")
+        try:
+            _send(f, {"op": "hello", "name": name, "slots": 1, "data": data_hash, "token": token})
+            init = _recv(f)
+            if not init or init.get("op") != "init":
+                if log_level:
+                    print(f"[BAL][NET] rejected by {host}:{port}: {(init or {}).get('reason')}", flush=True)
+                return done
+            os.environ.update({str(k): str(v) for k, v in (init.get("env") or {}).items()})
+            if "dbs" in init:
+                dbs = init["dbs"]
+                _init_episode_worker(dbs["towers"], dbs["enemies"], dbs["perks"])
+                data_hash = init.get("data")
+            bound = _RemoteBound(f)
+            _RESIDENT["bound"] = bound
+            if log_level:
+                print(f"[BAL][NET] {name} ready on {host}:{port}", flush=True)
+            while True:
+                _send(f, {"op": "pull", "n": int(batch)})
+                msg = _recv(f)
+                if msg is None:
+                    break
+                op = msg.get("op")
+                if op == "bye":
+                    return done
+                if op == "wait":
+                    time.sleep(float(msg.get("s", WAIT_S)))
+                    continue
+                bound.push(msg.get("bound"))
+                for job in msg.get("jobs", []):
+                    try:
+                        # JSON turns the genome tuple into a list; the per-genome DB memo compares tuples
+                        args = job["args"]
+                        res = _eval_episode_task(tuple(args[0]), *args[1:])
+                        _send(f, {"op": "result", "id": job["id"], "res": list(res)})
+                    except (OSError, ValueError):
+                        raise
+                    except Exception as ex:
+                        _send(f, {"op": "result", "id": job["id"], "error": repr(ex)})
+                    done += 1
+        except (OSError, ValueError):
+            pass
+        finally:
+            try:
+                f.close()
+                sock.close()
+            except Exception:
+                pass
+        if log_level:
+            print(f"[BAL][NET] {name} lost {host}:{port}, reconnecting", flush=True)
+        lost_at = time.time()
+        time.sleep(backoff)
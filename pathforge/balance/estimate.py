@@ -0,0 +1,425 @@
+from __future__ import annotations
+
+"""Analytical DPS / effective-HP estimate of waves cleared (no simulation).
+
+A closed-form stand-in for run_episode, good enough to tell "hopeless" genomes
+from plausible ones before spending episodes on them:
+
+- enemies: expected WaveDirector.spawn_list composition per wave (theme weights
+  averaged over the themes a wave can roll), scaled by core/difficulty tiers and
+  the genome's enemy multipliers: HP, shield (with caps), armor, regen, speed;
+- economy: the AutoBot loop without the map: start gold, the composition cycle
+  and tower cap of place_towers, one cheapest upgrade per wave, kill gold and
+  end-of-wave income, the bot's assault multi rule and talent unlocks;
+- combat: per tower, damage per shot after armor / weakness / resists / shield
+  multipliers, times the time it can spend on each enemy (path dwell inside its
+  range vs. spawn spacing), times targets per shot (splash, chain, pulses).
+
+An enemy type leaks a share 1/(1+q^p) of its count, q = damage available per
+enemy / damage needed. Lives drop by the leaks; the estimate is the last wave
+survived plus the share of the fatal wave. A few constants absorb what the
+model leaves out (map geometry, perks, targeting waste): an overall damage
+efficiency, a per-wave growth and a linear output map, fitted against simulated
+episodes by `python -m pathforge.balance estimate`, saved next to the profile
+and loaded by the tuners. About 0.2 ms per genome, against seconds per episode.
+"""
+
+import json
+import os
+import random
+import statistics
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..core import difficulty as _difficulty
+from ..core.balance_profile import PROFILE_FILE
+
+SPAWN_GAP_S = 0.28      # compile_assault gap used by the sim
+PATH_TILES = 44.0       # typical snake built by AutoBot.build_path_snake
+COVER_PER_RANGE = 2.6   # path tiles inside a tower's range, per tile of range
+LEAK_POWER = 3.0
+FOCUS_SHARE = 0.5     # share of the towers in range of the enemy they focus
+HOPELESS_RANK = 3
+
+# fitted on 190 random genomes x 2-3 episodes (v4.7.2 data, 25 waves): holdout MAE ~1.2 waves
+DEFAULT_CALIB = {"eff": 2.52, "growth": 0.0, "a": -0.09, "b": 0.828}
+
+# bot constants mirrored from balance/bot.py and balance/sim.py
+_UPGRADE_DMG = (0.16, 9, 0.08, 3.0)   # per level up to 9, then per level, cap x base
+_UPGRADE_RATE = (0.06, 1.85)
+_UPGRADE_RANGE = (0.03, 1.45)
+
+
+def calibration_path() -> str:
+    return PROFILE_FILE.replace("balance_profile.json", "balance_estimate.json")
+
+
+def load_calibration() -> Optional[Dict[str, Any]]:
+    try:
+        with open(calibration_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def _wave_mix(director, wave: int) -> Dict[str, float]:
+    """Expected enemy counts for one (multi=1) wave, averaged over the themes it can roll."""
+    from ..systems.wave_director import WavePlan
+
+    plan = director.plan(wave, relics_in_path=0)
+    mix: Dict[str, float] = {}
+    if plan.boss:
+        for k in director.spawn_list(plan):
+            mix[k] = mix.get(k, 0.0) + 1.0
+        return mix
+    # plan() draws the theme from a seed that includes the relics on the built path
+    themes = {tuple(director.plan(wave, relics_in_path=r).keywords[:2]) for r in range(64)}
+    for th in themes:
+        weights, count = director.spawn_weights(WavePlan(wave=wave, boss=False, keywords=list(th), relics_in_path=0))
+        # same quantized weights the alias table samples from
+        qw = {k: max(1, int(round(v * 10))) for k, v in weights.items()}
+        tot = float(sum(qw.values()))
+        for k, v in qw.items():
+            mix[k] = mix.get(k, 0.0) + count * v / tot / len(themes)
+    return mix
+
+
+class BalanceEstimator:
+    """Predict mean waves cleared for a genome from the base DBs without simulating.
+
+    Everything that doesn't depend on the genome (wave mixes, tiers, unlocks,
+    composition cycles) is computed once here; estimate() only walks the waves.
+    """
+
+    def __init__(self, towers_db: Dict[str, Any], enemies_db: Dict[str, Any], max_waves: int = 25,
+                 calib: Optional[Dict[str, Any]] = None):
+        from ..systems.wave_director import WaveDirector
+        from ..stats import CombatStats
+        from .bot import AutoBot
+
+        self.max_waves = int(max_waves)
+        calib = calib or DEFAULT_CALIB
+        self.eff = float(calib.get("eff", 1.0))
+        self.growth = float(calib.get("growth", 0.0))
+        self.a = float(calib.get("a", 0.0))
+        self.b = float(calib.get("b", 1.0))
+        self._best_dist: Dict[float, List[float]] = {}
+
+        self._tower_keys = list(towers_db.keys())
+        self._towers: Dict[str, Tuple] = {}
+        for k, td in towers_db.items():
+            b = td.get("base") or {}
+            role = str(td.get("role", "DPS")).upper()
+            dtype = str(td.get("dmg_type", ""))
+            splash = float(b.get("splash", 0.0))
+            # targets per shot: 0 single, 1 chain (Tesla: 2 hops at 72%), 2 splash, 3 pulse on all in range
+            kind = 3 if role in ("CONTROL", "DOT") else (1 if role == "CHAIN" else (2 if splash > 0 else 0))
+            armor_coef = 0.5 if dtype == "PIERCE" else (1.0 if dtype in ("KINETIC", "EXPLOSIVE") else 0.0)
+            self._towers[k] = (int(td.get("cost", 0)), float(b.get("damage", 0.0)), float(b.get("rate", 0.0)),
+                               float(b.get("range", 0.0)), splash, dtype, kind, armor_coef)
+        dtypes = {t[5] for t in self._towers.values()}
+
+        # per enemy: damage multiplier by type on HP (weakness x resist) and on shields
+        self._enemies: Dict[str, Tuple] = {}
+        for k, ed in enemies_db.items():
+            resist = dict(ed.get("resist") or {})
+            smult = dict(ed.get("shield_mult") or {})
+            weak = ed.get("weak")
+            hp_mul = {dt: (1.8 if weak and dt == weak else 1.0) * float(resist.get(dt, 1.0)) for dt in dtypes}
+            sh_mul = {dt: float(smult.get(dt, 1.0)) for dt in dtypes}
+            self._enemies[k] = (float(ed.get("hp", 1.0)), float(ed.get("spd", 1.0)), float(ed.get("armor", 0)),
+                                float(ed.get("regen", 0.0)), float(ed.get("shield", 0)), list(ed.get("tags") or []),
+                                hp_mul, sh_mul)
+
+        # per-wave enemy data (multi stacks waves up to max_waves + 2)
+        director = WaveDirector(random.Random(0))
+        self._waves: List[List[Tuple]] = [[]]
+        for w in range(1, self.max_waves + 3):
+            rows = []
+            for k, n in _wave_mix(director, w).items():
+                if k not in self._enemies:
+                    continue
+                tags = self._enemies[k][5]
+                rows.append((k, float(n), _difficulty.hp_tier(w), _difficulty.shield_tier(w),
+                             float(_difficulty.armor_multiplier(w, tags)), float(_difficulty.elite_shield_multiplier(w, tags)),
+                             float(_difficulty.shield_cap_pct(tags)), int(5 + w * 1.6)))
+            self._waves.append(rows)
+
+        # talents the bot buys (start points, +1 every 5 waves, +1 on boss waves): unlocks
+        # and global multipliers in effect during each wave, and its composition cycle
+        stats = CombatStats()
+        self._start = (float(stats.gold), float(stats.lives))
+        bot = AutoBot(random.Random(0))
+        self._wave_bot: List[Tuple] = [()]
+        for w in range(1, self.max_waves + 1):
+            if w > 1:
+                stats.talent_pts += int((w - 1) % 5 == 0) + int((w - 1) % 10 == 0)
+            try:
+                bot.spend_talents(stats, wave=w)
+            except Exception:
+                pass
+            unlocked = [k for k in (getattr(stats, "unlocked_towers", None) or self._tower_keys) if k in self._towers]
+            unlocked.sort(key=lambda k: self._towers[k][0])
+            cycle = [k for k in AutoBot(random.Random(w)).choose_composition(unlocked, w) if k in self._towers]
+            type_mul = dict(getattr(stats, "dmg_type_mul", {}) or {})
+            self._wave_bot.append((tuple(unlocked), tuple(cycle), float(stats.dmg_mul), float(stats.rate_mul),
+                                   float(stats.range_mul), type_mul))
+
+    # ---- model ----
+    def _place(self, towers: List[List[Any]], gold: float, cost: Dict[str, int], wave: int, cap: int, cyc_i: int) -> Tuple[float, int]:
+        unlocked, cycle = self._wave_bot[wave][0], self._wave_bot[wave][1]
+        while len(towers) < cap:
+            key = cycle[cyc_i % len(cycle)] if cycle else None
+            cyc_i += 1
+            picked = None
+            for k in ((key,) if key else ()) + unlocked:
+                if gold >= cost[k]:
+                    picked = k
+                    break
+            if picked is None:
+                break
+            gold -= cost[picked]
+            towers.append([picked, 1])
+        return gold, cyc_i
+
+    def estimate(self, genome) -> float:
+        """Predicted mean waves cleared for a Genome-like object (td, tr, tc, eh, aa, es, er, sh)."""
+        v = self.a + self.b * self._walk(genome)
+        return 0.0 if v < 0.0 else (float(self.max_waves) if v > self.max_waves else v)
+
+    def _walk(self, genome) -> float:
+        # uncalibrated waves survived (fractional)
+        td, tr, tc = float(genome.td), float(genome.tr), float(genome.tc)
+        eh, aa, es, er, shm = float(genome.eh), float(genome.aa), float(genome.es), float(genome.er), float(genome.sh)
+        cost = {k: int(round(t[0] * tc)) for k, t in self._towers.items()}
+        # profiled enemy records, same rounding as apply_profile
+        en = {}
+        for k, (hp, spd, armor, regen, shield, _, hp_mul, sh_mul) in self._enemies.items():
+            en[k] = (hp * eh, max(0.05, spd * es), float(int(round(armor + aa))), regen * er,
+                     float(int(round(shield * shm))), hp_mul, sh_mul)
+
+        gold, lives = self._start
+        towers: List[List[Any]] = []
+        gold, cyc_i = self._place(towers, gold, cost, 1, 10, 0)
+        last_lost = 0.0
+        for wave in range(1, self.max_waves + 1):
+            _, _, g_dmg, g_rate, g_rng, type_mul = self._wave_bot[wave]
+            # AutoBot.choose_wave_multi
+            multi = 1
+            if wave >= 6 and last_lost <= 0:
+                if lives >= 18 and gold >= 520 and wave >= 12:
+                    multi = 3
+                elif lives >= 16 and gold >= 320 and wave >= 8:
+                    multi = 2
+            # one upgrade per wave: the cheapest one
+            if towers:
+                best = min(towers, key=lambda t: int(cost[t[0]] * 0.65 + 40 * t[1]))
+                uc = int(cost[best[0]] * 0.65 + 40 * best[1])
+                if uc > 0 and gold >= uc:
+                    gold -= uc
+                    best[1] += 1
+            # the bot refreshes its composition cycle each wave, except wave 1 (same as the opening build)
+            gold, cyc_i = self._place(towers, gold, cost, wave, 12 + wave // 6, cyc_i if wave == 1 else 0)
+
+            # tower groups: (dmg per shot, dmg/s of the group, path tiles covered, splash, kind, type, armor coef)
+            groups: Dict[Tuple[str, int], int] = {}
+            for k, lvl in towers:
+                groups[(k, lvl)] = groups.get((k, lvl), 0) + 1
+            guns = []
+            for (k, lvl), n in groups.items():
+                _, dmg, rate, rng_t, splash, dtype, kind, acoef = self._towers[k]
+                if dmg <= 0 or rate <= 0:
+                    continue
+                l = lvl - 1
+                d = dmg * td
+                d = min(d * (1.0 + _UPGRADE_DMG[0] * min(l, _UPGRADE_DMG[1])) * (1.0 + _UPGRADE_DMG[2] * max(0, l - _UPGRADE_DMG[1])),
+                        d * _UPGRADE_DMG[3]) * g_dmg * float(type_mul.get(dtype, 1.0))
+                r = min(rate * tr * (1.0 + _UPGRADE_RATE[0] * l), rate * tr * _UPGRADE_RATE[1]) * g_rate
+                rg = rng_t * min(1.0 + _UPGRADE_RANGE[0] * l, _UPGRADE_RANGE[1]) * g_rng
+                guns.append((d, d * r * n, min(PATH_TILES, COVER_PER_RANGE * rg), splash, kind, dtype, acoef))
+
+            rows = []
+            for i in range(multi):
+                rows.extend(self._waves[min(wave + i, len(self._waves) - 1)])
+            n_total = sum(r[1] for r in rows) or 1.0
+            power = self.eff * (1.0 + self.growth) ** (wave - 1)
+            leaks = 0.0
+            gold_kill = 0.0
+            shield_base = _difficulty.CFG.shield_base_factor
+            for k, n, t_hp, t_sh, a_mul, e_sh, cap_pct, reward in rows:
+                hp, spd, armor, regen, shield, hp_mul, sh_mul = en[k]
+                max_hp = hp * t_hp
+                shield_hp = min(shield * shield_base * t_sh * e_sh, max_hp * cap_pct)
+                armor *= a_mul
+                spacing = spd * SPAWN_GAP_S  # tiles between consecutive enemies
+                raw = 0.0
+                hp_eff = 0.0
+                sh_eff = 0.0
+                focus = 0.0
+                for d, dps, cover, splash, kind, dtype, acoef in guns:
+                    if kind == 0:
+                        targets = 1.0
+                    elif kind == 1:
+                        targets = 2.44
+                    elif kind == 2:
+                        targets = min(n_total, 1.0 + 2.0 * splash / spacing)
+                    else:
+                        targets = max(1.0, min(n_total, cover / spacing))
+                    # a single-target tower splits its time between the enemies in range
+                    dwell = cover / spd
+                    dealt = dps * (dwell if dwell < SPAWN_GAP_S * targets else SPAWN_GAP_S * targets)
+                    f = hp_mul[dtype]
+                    if acoef:
+                        red = d - armor * acoef
+                        f *= (red if red > 1.0 else 1.0) / d
+                    raw += dealt
+                    hp_eff += dealt * f
+                    sh_eff += dealt * sh_mul[dtype]
+                    focus += dps * f
+                if raw <= 0:
+                    leaks += n
+                    continue
+                # regen only heals while the enemy is being shot: it eats into the damage
+                # rate of the towers focusing it (those around the killzone)
+                focus *= power * FOCUS_SHARE
+                if regen >= focus:
+                    leaks += n
+                    continue
+                need = shield_hp / max(1e-6, sh_eff / raw) + max_hp * focus / (focus - regen) / max(1e-6, hp_eff / raw)
+                q = power * raw / need
+                leak = n / (1.0 + q ** LEAK_POWER)
+                leaks += leak
+                gold_kill += (n - leak) * reward
+            if leaks >= lives:
+                return wave - 1 + max(0.0, lives / leaks)
+            lives -= leaks
+            last_lost = leaks if leaks >= 0.5 else 0.0
+            gold += gold_kill + int((85 + wave * 7) * (1.0 + 0.55 * max(0, multi - 1)))
+        return float(self.max_waves)
+
+    def hopeless(self, genome, target_wave: float, margin: float) -> bool:
+        """True when the estimate is `margin` waves further from the target than the 3rd closest so far.
+
+        Relative on purpose: when nothing can reach the target (20 waves is beyond most of the
+        box with the current bot) it still screens out the clearly weaker genomes; the 3rd best
+        rather than the best so one over-estimated genome doesn't reject everything else.
+        """
+        dist = abs(self.estimate(genome) - float(target_wave))
+        best = self._best_dist.setdefault(float(target_wave), [])
+        ref = best[-1] if len(best) >= HOPELESS_RANK else float("inf")
+        if len(best) < HOPELESS_RANK or dist < best[-1]:
+            best.append(dist)
+            best.sort()
+            del best[HOPELESS_RANK:]
+        return dist > ref + float(margin)
+
+
+def estimator_for(max_waves: int, calib: Optional[Dict[str, Any]] = None) -> BalanceEstimator:
+    """Estimator on the shipped DBs (the ones the tuners simulate) with the saved calibration (if any)."""
+    from .cache import base_dbs
+
+    towers_db, enemies_db, _ = base_dbs()
+    return BalanceEstimator(towers_db, enemies_db, max_waves=max_waves,
+                            calib=calib if calib is not None else load_calibration())
+
+
+def _affine(pred: Sequence[float], obs: Sequence[float]) -> Tuple[float, float]:
+    """Least-squares obs ~ a + b * pred."""
+    mp, mo = statistics.fmean(pred), statistics.fmean(obs)
+    vp = sum((p - mp) ** 2 for p in pred)
+    b = sum((p - mp) * (o - mo) for p, o in zip(pred, obs)) / vp if vp > 1e-12 else 0.0
+    return mo - b * mp, b
+
+
+def fit_calibration(est: BalanceEstimator, genomes: Sequence[Any], observed: Sequence[float]) -> Tuple[float, float, float]:
+    """Grid search of (eff, growth), each with its least-squares output map, minimizing mean
+    |predicted - observed|. Sets them on `est`; returns (eff, growth, mae)."""
+    best = (est.eff, est.growth, float("inf"), 0.0, 1.0)
+    for growth in (0.0, 0.01, 0.02, 0.03, 0.04, 0.06, 0.08):
+        for i in range(-24, 25):
+            est.eff, est.growth = 2.0 ** (i / 6.0), growth
+            raw = [est._walk(g) for g in genomes]
+            a, b = _affine(raw, observed)
+            mae = statistics.fmean(abs(a + b * p - y) for p, y in zip(raw, observed))
+            if mae < best[2]:
+                best = (est.eff, growth, mae, a, b)
+    est.eff, est.growth, est.a, est.b = best[0], best[1], best[3], best[4]
+    return best[0], best[1], best[2]
+
+
+def validate_estimator(game, n: int = 60, episodes: int = 3, seed: int = 123, max_waves: int | None = None) -> Dict[str, Any]:
+    """Simulate n random genomes, fit the calibration on half, score it on the other half.
+
+    The final calibration (fitted on all points) is saved for the tuners; a report goes
+    to balance_estimate.md.
+    """
+    from .tune import EpisodeEvaluator, _rand_genome, _spearman
+
+    log_level = int(os.environ.get("PATHFORGE_BALANCE_LOG", "1"))
+    os.environ.setdefault("PATHFORGE_BALANCE_TRACE", "0")
+    if max_waves is None:
+        max_waves = int(os.environ.get("PATHFORGE_BALANCE_MAX_WAVES", "25"))
+    rng = random.Random(seed)
+    genomes = [_rand_genome(rng) for _ in range(max(4, int(n)))]
+    seeds = [rng.randint(0, 1_000_000) for _ in range(max(1, int(episodes)))]
+
+    ev = EpisodeEvaluator(game, len(seeds), max_waves, log_level=log_level, tag="[BAL][EST]")
+    t0 = time.perf_counter()
+    try:
+        ev.prefill(genomes, seeds)
+        observed = [ev.evaluate(g, seeds)[0] for g in genomes]
+    finally:
+        ev.close()
+    sim_s = time.perf_counter() - t0
+
+    est = BalanceEstimator(ev.towers_db, ev.enemies_db, max_waves=max_waves)
+    fit_idx = list(range(0, len(genomes), 2))
+    hold_idx = list(range(1, len(genomes), 2))
+    fit_calibration(est, [genomes[i] for i in fit_idx], [observed[i] for i in fit_idx])
+    hold_pred = [est.estimate(genomes[i]) for i in hold_idx]
+    hold_obs = [observed[i] for i in hold_idx]
+    hold_mae = statistics.fmean(abs(p - y) for p, y in zip(hold_pred, hold_obs))
+    hold_rho = _spearman(hold_pred, hold_obs)
+    base_mae = statistics.fmean(abs(statistics.fmean(observed[i] for i in fit_idx) - y) for y in hold_obs)
+
+    eff, growth, mae = fit_calibration(est, genomes, observed)
+    pred = [est.estimate(g) for g in genomes]
+    rho = _spearman(pred, observed)
+    t1 = time.perf_counter()
+    reps = 0
+    while time.perf_counter() - t1 < 0.5:
+        for g in genomes:
+            est.estimate(g)
+        reps += 1
+    us = (time.perf_counter() - t1) / max(1, reps * len(genomes)) * 1e6
+    vs = f"{sim_s / ev.episodes_run * 1e3:.0f} ms per simulated episode" if ev.episodes_run else "episodes all cached"
+
+    calib = {"eff": eff, "growth": growth, "a": est.a, "b": est.b, "max_waves": max_waves, "data": ev.dhash, "n": len(genomes),
+             "episodes": len(seeds), "mae": round(mae, 3), "spearman": round(rho, 3),
+             "holdout_mae": round(hold_mae, 3), "holdout_spearman": round(hold_rho, 3)}
+    if log_level:
+        print(f"[BAL][EST] calibration eff={eff:.3f} growth={growth:.3f} out={est.a:+.2f}{est.b:+.3f}x: holdout MAE={hold_mae:.2f} waves "
+              f"(predict-the-mean {base_mae:.2f}), Spearman={hold_rho:.2f}; all points MAE={mae:.2f} rho={rho:.2f}", flush=True)
+        print(f"[BAL][EST] {us:.0f} us per genome ({vs})", flush=True)
+    try:
+        os.makedirs(os.path.dirname(calibration_path()), exist_ok=True)
+        with open(calibration_path(), "w", encoding="utf-8") as f:
+            json.dump(calib, f, indent=2)
+        md_path = PROFILE_FILE.replace("balance_profile.json", "balance_estimate.md")
+        lines = []
+        lines.append("# Pathforge Balance Estimator\n\n")
+        lines.append(f"- Genomes: **{len(genomes)}** random (GA box) | episodes/genome: **{len(seeds)}** | max waves: **{max_waves}**\n")
+        lines.append(f"- Calibration: eff `{eff:.4f}`, growth `{growth:.4f}`, output `{est.a:+.3f} {est.b:+.4f}·x` (saved to `{os.path.basename(calibration_path())}`)\n")
+        lines.append(f"- Holdout (fit on half): MAE **{hold_mae:.2f}** waves (predicting the mean: {base_mae:.2f}), Spearman **{hold_rho:.2f}**\n")
+        lines.append(f"- All points: MAE **{mae:.2f}** waves, Spearman **{rho:.2f}**\n")
+        lines.append(f"- Cost: **{us:.0f} µs** per genome ({vs})\n")
+        lines.append("\n| genome | sim mean | estimate |\n|---|---:|---:|\n")
+        for g, y, p in sorted(zip(genomes, observed, pred), key=lambda x: x[1]):
+            lines.append(f"| td={g.td:.2f} tr={g.tr:.2f} tc={g.tc:.2f} eh={g.eh:.2f} aa={g.aa} es={g.es:.2f} er={g.er:.2f} sh={g.sh:.2f} | {y:.2f} | {p:.2f} |\n")
+        with open(md_path, "w", encoding="utf-8") as mf:
+            mf.write("".join(lines))
+        if log_level:
+            print(f"[BAL] wrote summary {md_path}", flush=True)
+    except Exception:
+        pass
+    return calib
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+"""Batch ask/tell optimizers for the balance tuner (CMA-ES, differential evolution).
+
+Both work on the 8-D unit cube (tune.py maps it to genome bounds) and minimize:
+ask() proposes a whole generation, the caller simulates it in parallel, tell()
+feeds the scores back. Pure Python on purpose: the tuner must run where numpy
+is not installed, and at 8 dimensions the linear algebra is negligible next to
+one simulated episode.
+"""
+
+import math
+import random
+from typing import List, Optional, Sequence, Tuple
+
+Vec = List[float]
+
+
+def _clip01(x: Sequence[float]) -> Vec:
+    return [0.0 if v < 0.0 else (1.0 if v > 1.0 else float(v)) for v in x]
+
+
+def _jacobi_eigh(a: List[List[float]], sweeps: int = 30) -> Tuple[Vec, List[List[float]]]:
+    """Eigen-decomposition of a small symmetric matrix: (eigenvalues, eigenvectors as columns)."""
+    n = len(a)
+    a = [row[:] for row in a]
+    v = [[1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]
+    for _ in range(sweeps):
+        off = sum(a[i][j] * a[i][j] for i in range(n) for j in range(i + 1, n))
+        if off < 1e-22:
+            break
+        for p in range(n - 1):
+            for q in range(p + 1, n):
+                if abs(a[p][q]) < 1e-300:
+                    continue
+                theta = (a[q][q] - a[p][p]) / (2.0 * a[p][q])
+                t = (1.0 if theta >= 0 else -1.0) / (abs(theta) + math.sqrt(theta * theta + 1.0))
+                c = 1.0 / math.sqrt(t * t + 1.0)
+                s = t * c
+                for k in range(n):
+                    akp, akq = a[k][p], a[k][q]
+                    a[k][p] = c * akp - s * akq
+                    a[k][q] = s * akp + c * akq
+                for k in range(n):
+                    apk, aqk = a[p][k], a[q][k]
+                    a[p][k] = c * apk - s * aqk
+                    a[q][k] = s * apk + c * aqk
+                for k in range(n):
+                    vkp, vkq = v[k][p], v[k][q]
+                    v[k][p] = c * vkp - s * vkq
+                    v[k][q] = s * vkp + c * vkq
+    return [a[i][i] for i in range(n)], v
+
+
+class Optimizer:
+    """ask(n) -> candidate points in [0,1]^dim; tell(points, scores) with lower = better."""
+
+    name = "?"
+
+    def __init__(self, dim: int, rng: random.Random):
+        self.dim = int(dim)
+        self.rng = rng
+        self.best_x: Optional[Vec] = None
+        self.best_f = float("inf")
+        self.evals = 0
+
+    @property
+    def batch(self) -> int:
+        raise NotImplementedError
+
+    def ask(self, n: Optional[int] = None) -> List[Vec]:
+        raise NotImplementedError
+
+    def tell(self, xs: Sequence[Sequence[float]], fs: Sequence[float]):
+        for x, f in zip(xs, fs):
+            self.evals += 1
+            if f < self.best_f:
+                self.best_f, self.best_x = float(f), list(x)
+
+
+class CMAES(Optimizer):
+    """(mu/mu_w, lambda)-CMA-ES (Hansen's tutorial defaults), box handled by clipping."""
+
+    name = "CMA"
+
+    def __init__(self, dim: int, rng: random.Random, popsize: Optional[int] = None, sigma0: float = 0.3,
+                 x0: Optional[Sequence[float]] = None):
+        super().__init__(dim, rng)
+        n = self.dim
+        self.lam = int(popsize) if popsize else 4 + int(3 * math.log(n))
+        self.mu = self.lam // 2
+        w = [math.log(self.mu + 0.5) - math.log(i + 1) for i in range(self.mu)]
+        sw = sum(w)
+        self.weights = [x / sw for x in w]
+        self.mueff = 1.0 / sum(x * x for x in self.weights)
+        self.cc = (4 + self.mueff / n) / (n + 4 + 2 * self.mueff / n)
+        self.cs = (self.mueff + 2) / (n + self.mueff + 5)
+        self.c1 = 2 / ((n + 1.3) ** 2 + self.mueff)
+        self.cmu = min(1 - self.c1, 2 * (self.mueff - 2 + 1 / self.mueff) / ((n + 2) ** 2 + self.mueff))
+        self.damps = 1 + 2 * max(0.0, math.sqrt((self.mueff - 1) / (n + 1)) - 1) + self.cs
+        self.chin = math.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n * n))
+        self.mean: Vec = list(x0) if x0 is not None else [0.5] * n
+        self.sigma = float(sigma0)
+        self.pc = [0.0] * n
+        self.ps = [0.0] * n
+        self.C = [[1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]
+        self.B = [[1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]
+        self.D = [1.0] * n
+        self.gen = 0
+        self._eigen_gen = 0
+
+    @property
+    def batch(self) -> int:
+        return self.lam
+
+    def _update_eigen(self):
+        vals, vecs = _jacobi_eigh(self.C)
+        self.D = [math.sqrt(max(1e-20, v)) for v in vals]
+        self.B = vecs
+        self._eigen_gen = self.gen
+
+    def ask(self, n: Optional[int] = None) -> List[Vec]:
+        out = []
+        for _ in range(int(n or self.lam)):
+            z = [self.rng.gauss(0.0, 1.0) for _ in range(self.dim)]
+            dz = [self.D[j] * z[j] for j in range(self.dim)]
+            y = [sum(self.B[i][j] * dz[j] for j in range(self.dim)) for i in range(self.dim)]
+            out.append(_clip01(self.mean[i] + self.sigma * y[i] for i in range(self.dim)))
+        return out
+
+    def tell(self, xs: Sequence[Sequence[float]], fs: Sequence[float]):
+        super().tell(xs, fs)
+        n = self.dim
+        order = sorted(range(len(xs)), key=lambda i: fs[i])[:self.mu]
+        sel = [list(xs[i]) for i in order]
+        old = self.mean
+        self.mean = [sum(w * x[i] for w, x in zip(self.weights, sel)) for i in range(n)]
+        step = [(self.mean[i] - old[i]) / self.sigma for i in range(n)]
+        # C^-1/2 * step = B D^-1 B^T step
+        bt = [sum(self.B[k][j] * step[k] for k in range(n)) / self.D[j] for j in range(n)]
+        cinv = [sum(self.B[i][j] * bt[j] for j in range(n)) for i in range(n)]
+        a = math.sqrt(self.cs * (2 - self.cs) * self.mueff)
+        self.ps = [(1 - self.cs) * self.ps[i] + a * cinv[i] for i in range(n)]
+        self.gen += 1
+        ps_norm = math.sqrt(sum(v * v for v in self.ps))
+        hsig = ps_norm / math.sqrt(1 - (1 - self.cs) ** (2 * self.gen)) / self.chin < 1.4 + 2 / (n + 1)
+        a = math.sqrt(self.cc * (2 - self.cc) * self.mueff)
+        self.pc = [(1 - self.cc) * self.pc[i] + (a * step[i] if hsig else 0.0) for i in range(n)]
+        ys = [[(x[i] - old[i]) / self.sigma for i in range(n)] for x in sel]
+        c_old = 1 - self.c1 - self.cmu + (0.0 if hsig else self.c1 * self.cc * (2 - self.cc))
+        for i in range(n):
+            for j in range(i + 1):
+                rank_mu = sum(w * y[i] * y[j] for w, y in zip(self.weights, ys))
+                v = c_old * self.C[i][j] + self.c1 * self.pc[i] * self.pc[j] + self.cmu * rank_mu
+                self.C[i][j] = self.C[j][i] = v
+        self.sigma *= math.exp((self.cs / self.damps) * (ps_norm / self.chin - 1))
+        self.sigma = min(self.sigma, 1.0)
+        if self.gen - self._eigen_gen >= 1:
+            self._update_eigen()
+
+
+class DifferentialEvolution(Optimizer):
+    """DE/rand/1/bin: ask() returns one trial per population member, tell() keeps the better of each pair."""
+
+    name = "DE"
+
+    def __init__(self, dim: int, rng: random.Random, popsize: Optional[int] = None, F: float = 0.6, CR: float = 0.9):
+        super().__init__(dim, rng)
+        self.np = max(4, int(popsize) if popsize else 10 + 2 * self.dim)
+        self.F = float(F)
+        self.CR = float(CR)
+        self.pop: List[Vec] = []
+        self.fit: List[float] = []
+
+    @property
+    def batch(self) -> int:
+        return self.np
+
+    def ask(self, n: Optional[int] = None) -> List[Vec]:
+        if not self.pop:
+            # first generation: the initial population itself
+            return [[self.rng.random() for _ in range(self.dim)] for _ in range(self.np)]
+        out = []
+        for i in range(self.np):
+            a, b, c = self.rng.sample([k for k in range(self.np) if k != i], 3)
+            jr = self.rng.randrange(self.dim)
+            trial = []
+            for j in range(self.dim):
+                if j == jr or self.rng.random() < self.CR:
+                    v = self.pop[a][j] + self.F * (self.pop[b][j] - self.pop[c][j])
+                    # bounce back inside the box instead of piling up on the border
+                    if v < 0.0:
+                        v = self.rng.uniform(0.0, self.pop[i][j])
+                    elif v > 1.0:
+                        v = self.rng.uniform(self.pop[i][j], 1.0)
+                    trial.append(v)
+                else:
+                    trial.append(self.pop[i][j])
+            out.append(trial)
+        return out
+
+    def tell(self, xs: Sequence[Sequence[float]], fs: Sequence[float]):
+        super().tell(xs, fs)
+        if not self.pop:
+            self.pop = [list(x) for x in xs]
+            self.fit = [float(f) for f in fs]
+            return
+        for i, (x, f) in enumerate(zip(xs, fs)):
+            if f <= self.fit[i]:
+                self.pop[i], self.fit[i] = list(x), float(f)
+
+
+def make_optimizer(algo: str, dim: int, rng: random.Random, popsize: Optional[int] = None) -> Optimizer:
+    a = str(algo).strip().upper()
+    if a in ("CMA", "CMAES", "CMA-ES"):
+        return CMAES(dim, rng, popsize=popsize)
+    if a in ("DE", "DIFF_EVO", "DIFFERENTIAL_EVOLUTION"):
+        return DifferentialEvolution(dim, rng, popsize=popsize)
+    raise ValueError(f"unknown optimizer {algo!r}")
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+"""Offline re-scoring of stored episodes from their per-wave trajectories.
+
+A tuner run with PATHFORGE_BALANCE_TRAJECTORY=1 stores every episode's per-wave
+arrays (lives, gold, leaks, kills, damage by type, towers, perk) in the eval
+cache. A different objective, target wave, wave cap or std penalty can then rank
+every stored genome again without simulating anything:
+`python -m pathforge.balance rescore --target 12`.
+
+Capping works because waves past the cap never change what happened before it:
+an episode recorded with max_waves=25 scores as the max_waves=12 run would have.
+Only trajectories recorded under the current data hash, sim version, projectile
+mode and tick rate are used.
+"""
+
+import os
+import statistics
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..core.balance_profile import PROFILE_FILE
+
+LEAK_WEIGHT = 0.05      # "leaks" objective: score per life lost on a cleared wave
+
+
+def waves_cleared(traj: Dict[str, Any], cap: Optional[int] = None) -> int:
+    """Waves cleared, from the lives array (the losing wave is recorded with lives <= 0)."""
+    n = sum(1 for v in traj.get("lives") or [] if v > 0)
+    return min(n, int(cap)) if cap is not None else n
+
+
+def usable(traj: Dict[str, Any], recorded_max_waves: int, cap: int) -> bool:
+    """An episode speaks for `cap` waves if it ran that far or lost before it."""
+    lives = traj.get("lives") or []
+    return int(recorded_max_waves) >= int(cap) or (bool(lives) and lives[-1] <= 0)
+
+
+def _obj_target(trajs: Sequence[Dict[str, Any]], target_wave: float, cap: int, std_pen: float) -> float:
+    from .tune import _score_mean
+
+    waves = [waves_cleared(t, cap) for t in trajs]
+    std = statistics.pstdev(waves) if len(waves) >= 2 else 0.0
+    return _score_mean(statistics.fmean(waves), target_wave) + std_pen * std
+
+
+def _obj_leaks(trajs: Sequence[Dict[str, Any]], target_wave: float, cap: int, std_pen: float) -> float:
+    # target score, plus lives bled on the waves that were cleared (favours clean holds)
+    leaks = []
+    for t in trajs:
+        n = waves_cleared(t, cap)
+        leaks.append(sum((t.get("leaks") or [])[:n]))
+    return _obj_target(trajs, target_wave, cap, std_pen) + LEAK_WEIGHT * statistics.fmean(leaks)
+
+
+# name -> f(trajectories of one genome, target_wave, cap, std_pen) -> score, lower = better
+OBJECTIVES: Dict[str, Callable[[Sequence[Dict[str, Any]], float, int, float], float]] = {
+    "target": _obj_target,
+    "leaks": _obj_leaks,
+}
+
+
+def load_trajectories(cap: int) -> Dict[Tuple[Any, ...], Dict[int, Dict[str, Any]]]:
+    """{genome tuple: {seed: trajectory}} usable at `cap`, for the shipped data."""
+    from .cache import EvalCache, base_data_hash, default_path
+    from .sim import resolve_tick_hz, sim_key
+
+    path = default_path()
+    if not path or not os.path.exists(path):
+        return {}
+    cache = EvalCache(path, base_data_hash(), sim_key(), resolve_tick_hz(None))
+    out: Dict[Tuple[Any, ...], Dict[int, Dict[str, Any]]] = {}
+    try:
+        for gt, seed, mw, traj in cache.trajectories():
+            if usable(traj, mw, cap):
+                out.setdefault(gt, {}).setdefault(seed, traj)
+    finally:
+        cache.close()
+    return out
+
+
+def _damage_share(trajs: Sequence[Dict[str, Any]], cap: int) -> Dict[str, float]:
+    tot: Dict[str, float] = {}
+    for t in trajs:
+        for k, v in (t.get("dmg") or {}).items():
+            tot[k] = tot.get(k, 0.0) + sum(v[:cap])
+    s = sum(tot.values())
+    return {k: v / s for k, v in sorted(tot.items(), key=lambda kv: -kv[1])} if s > 0 else {}
+
+
+def rescore_report(target_wave: float = 12.0, cap: int | None = None, objective: str = "target",
+                   std_pen: float = 0.12, min_episodes: int = 3, top: int = 15) -> Dict[str, Any]:
+    """Rank every stored genome under `objective` and write balance_rescore.md."""
+    log_level = int(os.environ.get("PATHFORGE_BALANCE_LOG", "1"))
+    if cap is None:
+        cap = int(os.environ.get("PATHFORGE_BALANCE_MAX_WAVES", "25"))
+    if objective not in OBJECTIVES:
+        raise ValueError(f"unknown objective {objective!r} ({', '.join(OBJECTIVES)})")
+    score_fn = OBJECTIVES[objective]
+
+    stored = load_trajectories(cap)
+    rows: List[Dict[str, Any]] = []
+    for gt, by_seed in stored.items():
+        if len(by_seed) < max(1, int(min_episodes)):
+            continue
+        trajs = [by_seed[s] for s in sorted(by_seed)]
+        waves = [waves_cleared(t, cap) for t in trajs]
+        rows.append({"genome": list(gt), "score": score_fn(trajs, float(target_wave), cap, float(std_pen)),
+                     "mean": statistics.fmean(waves), "std": statistics.pstdev(waves) if len(waves) >= 2 else 0.0,
+                     "waves": waves, "trajs": trajs})
+    rows.sort(key=lambda r: r["score"])
+    if log_level:
+        print(f"[BAL][RESCORE] {len(rows)} genomes with >= {min_episodes} stored trajectories "
+              f"({sum(len(v) for v in stored.values())} episodes), objective={objective} target={target_wave:g} cap={cap}", flush=True)
+        if not rows:
+            print("[BAL][RESCORE] nothing to score: run a tuner with PATHFORGE_BALANCE_TRAJECTORY=1 first", flush=True)
+        for i, r in enumerate(rows[:top], start=1):
+            print(f"[BAL][RESCORE] {i:2d}. score={r['score']:.3f} mean={r['mean']:.2f} std={r['std']:.2f} "
+                  f"n={len(r['waves'])} {tuple(r['genome'])}", flush=True)
+
+    report = {"objective": objective, "target_wave": target_wave, "cap": cap, "std_pen": std_pen,
+              "genomes": len(rows), "ranking": [{k: r[k] for k in ("genome", "score", "mean", "std", "waves")} for r in rows[:top]]}
+
+    try:
+        md_path = PROFILE_FILE.replace("balance_profile.json", "balance_rescore.md")
+        lines = []
+        lines.append("# Pathforge Balance Re-score\n\n")
+        lines.append(f"- Objective: **{objective}** | target wave: **{target_wave:g}** | cap: **{cap}** waves | std penalty: **{std_pen:g}**\n")
+        lines.append(f"- Genomes scored: **{len(rows)}** (>= {min_episodes} stored trajectories each), no episode simulated\n")
+        if rows:
+            lines.append("\n| # | score | mean | std | n | td | tr | tc | eh | aa | es | er | sh |\n")
+            lines.append("|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|\n")
+            for i, r in enumerate(rows[:top], start=1):
+                g = " | ".join(str(int(v)) if isinstance(v, int) else f"{v:.3f}" for v in r["genome"])
+                lines.append(f"| {i} | {r['score']:.3f} | {r['mean']:.2f} | {r['std']:.2f} | {len(r['waves'])} | {g} |\n")
+            best = rows[0]
+            n = max(len(t.get("lives") or []) for t in best["trajs"])
+            n = min(n, cap)
+            lines.append("\n## Best genome, mean per wave\n\n")
+            lines.append("| wave | episodes | lives | gold | leaks | kills | towers |\n")
+            lines.append("|---:|---:|---:|---:|---:|---:|---:|\n")
+            for w in range(n):
+                at = [t for t in best["trajs"] if len(t.get("lives") or []) > w]
+
+                def m(k):
+                    return statistics.fmean(t[k][w] for t in at)
+                lines.append(f"| {w + 1} | {len(at)} | {m('lives'):.1f} | {m('gold'):.0f} | {m('leaks'):.1f} | {m('kills'):.1f} | {m('towers'):.1f} |\n")
+            share = _damage_share(best["trajs"], cap)
+            if share:
+                lines.append("\nDamage by type: " + ", ".join(f"{k} {v:.0%}" for k, v in share.items()) + "\n")
+        os.makedirs(os.path.dirname(md_path), exist_ok=True)
+        with open(md_path, "w", encoding="utf-8") as mf:
+            mf.write("".join(lines))
+        if log_level:
+            print(f"[BAL] wrote summary {md_path}", flush=True)
+    except Exception:
+        pass
+
+    return report
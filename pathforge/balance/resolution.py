@@ -0,0 +1,117 @@
+from __future__ import annotations
+import os, random, statistics, time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Sequence
+
+from .cache import base_dbs
+from .tune import Genome, _eval_genome_worker, _rand_genome, _spearman
+from ..core.balance_profile import PROFILE_FILE
+
+# ------------------------------
+# Sim resolution validation (v4.7.2)
+# ------------------------------
+# Runs the same genomes x seeds battery at several tick rates and compares each
+# rate against the first (reference) one. What matters for tuning is that the GA
+# ranks genomes the same way, so besides per-episode waves divergence we report
+# the Spearman rank correlation of genome means and whether the best genome agrees.
+
+
+def resolution_report(game, rates: Sequence[float] = (60.0, 30.0, 20.0), genomes: int = 6, episodes: int = 4, seed: int = 123,
+                      max_waves: int | None = None, min_spearman: float = 0.9, max_abs_diff: float = 0.5) -> Dict[str, Any]:
+    """Evaluate a fixed genome battery at each tick rate and report divergence vs rates[0].
+
+    The recommended rate is the coarsest one whose Spearman rank correlation stays
+    >= min_spearman and whose mean |waves delta| per episode stays <= max_abs_diff.
+    """
+    log_level = int(os.environ.get("PATHFORGE_BALANCE_LOG", "1"))
+    if max_waves is None:
+        max_waves = int(os.environ.get("PATHFORGE_BALANCE_MAX_WAVES", "25"))
+    rates = [float(r) for r in rates] or [60.0]
+    rng = random.Random(seed)
+    # neutral profile first, then random GA-range genomes
+    pop: List[Genome] = [Genome(1.0, 1.0, 1.0, 1.0, 0, 1.0, 1.0, 1.0)]
+    pop += [_rand_genome(rng) for _ in range(max(0, int(genomes) - 1))]
+    eval_seeds = [rng.randint(0, 1_000_000) for _ in range(max(1, episodes))]
+    towers_db, enemies_db, perks_db = base_dbs()
+
+    workers = max(1, int(os.environ.get("PATHFORGE_BALANCE_WORKERS", "1")))
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    waves: Dict[float, List[List[int]]] = {}
+    wall: Dict[float, float] = {}
+    try:
+        for hz in rates:
+            t0 = time.perf_counter()
+            args = [(g.as_tuple(), towers_db, enemies_db, perks_db, eval_seeds, episodes, max_waves, hz) for g in pop]
+            if executor is not None:
+                futs = [executor.submit(_eval_genome_worker, *a) for a in args]
+                waves[hz] = [f.result()[2] for f in futs]
+            else:
+                waves[hz] = [_eval_genome_worker(*a)[2] for a in args]
+            wall[hz] = time.perf_counter() - t0
+            if log_level:
+                print(f"[BAL][RES] {hz:g} Hz: {wall[hz]:.1f}s", flush=True)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    ref = rates[0]
+    ref_means = [statistics.fmean(w) for w in waves[ref]]
+    ref_best = min(range(len(pop)), key=lambda i: -ref_means[i])
+    rows: List[Dict[str, Any]] = []
+    for hz in rates:
+        diffs = [b - a for wa, wb in zip(waves[ref], waves[hz]) for a, b in zip(wa, wb)]
+        means = [statistics.fmean(w) for w in waves[hz]]
+        rows.append({
+            "hz": hz,
+            "wall_s": round(wall[hz], 2),
+            "speedup": round(wall[ref] / max(1e-9, wall[hz]), 2),
+            "mean_abs_diff": round(statistics.fmean(abs(d) for d in diffs), 3) if diffs else 0.0,
+            "max_abs_diff": max((abs(d) for d in diffs), default=0),
+            "bias": round(statistics.fmean(diffs), 3) if diffs else 0.0,
+            "exact_frac": round(sum(1 for d in diffs if d == 0) / max(1, len(diffs)), 3),
+            "spearman": round(_spearman(ref_means, means), 3),
+            "best_agrees": min(range(len(pop)), key=lambda i: -means[i]) == ref_best,
+            "means": [round(m, 2) for m in means],
+        })
+
+    ok = [r for r in rows if r["spearman"] >= min_spearman and r["mean_abs_diff"] <= max_abs_diff]
+    recommended = min(ok, key=lambda r: r["hz"])["hz"] if ok else ref
+
+    if log_level:
+        for r in rows:
+            print(f"[BAL][RES] {r['hz']:g} Hz x{r['speedup']:.2f} |d|={r['mean_abs_diff']:.2f} max={r['max_abs_diff']} "
+                  f"bias={r['bias']:+.2f} exact={r['exact_frac']:.0%} rho={r['spearman']:.2f} best={'ok' if r['best_agrees'] else 'DIFF'}", flush=True)
+        print(f"[BAL][RES] recommended PATHFORGE_BALANCE_TICK_HZ={recommended:g}", flush=True)
+
+    report = {
+        "reference_hz": ref,
+        "recommended_hz": recommended,
+        "thresholds": {"min_spearman": min_spearman, "max_abs_diff": max_abs_diff},
+        "episodes": episodes,
+        "max_waves": max_waves,
+        "seeds": eval_seeds,
+        "genomes": [g.as_tuple() for g in pop],
+        "rates": rows,
+    }
+
+    try:
+        md_path = PROFILE_FILE.replace("balance_profile.json", "balance_resolution.md")
+        lines = []
+        lines.append("# Pathforge Sim Resolution Report\n\n")
+        lines.append(f"- Reference: **{ref:g} Hz** | genomes: **{len(pop)}** | episodes: **{episodes}** | max waves: **{max_waves}**\n")
+        lines.append(f"- Seeds: `{eval_seeds}`\n")
+        lines.append(f"- Recommended: **{recommended:g} Hz** (rho >= {min_spearman}, mean |delta waves| <= {max_abs_diff})\n\n")
+        lines.append("| Hz | wall s | speedup | mean abs delta | max abs delta | bias | exact | spearman | best agrees |\n")
+        lines.append("|---:|---:|---:|---:|---:|---:|---:|---:|:---:|\n")
+        for r in rows:
+            lines.append(f"| {r['hz']:g} | {r['wall_s']} | {r['speedup']} | {r['mean_abs_diff']} | {r['max_abs_diff']} | {r['bias']} | {r['exact_frac']} | {r['spearman']} | {'yes' if r['best_agrees'] else 'no'} |\n")
+        os.makedirs(os.path.dirname(md_path), exist_ok=True)
+        with open(md_path, "w", encoding="utf-8") as mf:
+            mf.write("".join(lines))
+        if log_level:
+            print(f"[BAL] wrote summary {md_path}", flush=True)
+    except Exception:
+        pass
+
+    return report
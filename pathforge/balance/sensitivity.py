@@ -0,0 +1,234 @@
+from __future__ import annotations
+import os, random, statistics, time
+from dataclasses import fields
+from typing import Dict, Any, List, Sequence, Tuple
+
+from .tune import EpisodeEvaluator, Genome, _GENOME_BOUNDS
+from ..core.balance_profile import PROFILE_FILE
+from ..core.difficulty import DifficultyConfig
+
+# ------------------------------
+# Global sensitivity analysis (v4.7.2)
+# ------------------------------
+# Which knobs actually move waves-cleared? Factors are the 8 Genome multipliers (GA
+# search box) plus every DifficultyConfig curve constant (default ± span). Each design
+# point is one genome + one difficulty config, scored by mean waves cleared over the
+# same seeds (common random numbers, so differences come from the knobs, not the dice).
+# The whole design goes to the shared EpisodeEvaluator in one batch (pool / remote
+# workers). Methods:
+# - Morris elementary effects: r one-at-a-time trajectories on a p-level grid;
+#   mu* (mean |effect|) ranks importance, sigma flags interactions/non-linearity.
+# - Sobol indices (Saltelli sampling, Saltelli 2010 first-order and Jansen total
+#   estimators): variance shares, costlier (N·(k+2) points).
+
+_GENOME_NAMES = ("td", "tr", "tc", "eh", "aa", "es", "er", "sh")
+
+
+def factors(cfg_span: float = 0.25) -> List[Tuple[str, float, float]]:
+    """(name, lo, hi) per factor; difficulty ones are prefixed `cfg.`."""
+    out = [(n, lo, hi) for n, (lo, hi) in zip(_GENOME_NAMES, _GENOME_BOUNDS)]
+    base = DifficultyConfig()
+    for f in fields(DifficultyConfig):
+        v = float(getattr(base, f.name))
+        out.append((f"cfg.{f.name}", v * (1.0 - cfg_span), v * (1.0 + cfg_span)))
+    return out
+
+
+def _decode(u: Sequence[float], facs: Sequence[Tuple[str, float, float]]) -> Tuple[Genome, Dict[str, float]]:
+    g: Dict[str, Any] = {}
+    diff: Dict[str, float] = {}
+    for x, (name, lo, hi) in zip(u, facs):
+        v = lo + min(1.0, max(0.0, float(x))) * (hi - lo)
+        if name.startswith("cfg."):
+            diff[name[4:]] = v
+        else:
+            g[name] = v
+    g["aa"] = int(round(g["aa"]))
+    return Genome(**g), diff
+
+
+def morris_design(k: int, r: int, levels: int, rng: random.Random) -> List[List[List[float]]]:
+    """r trajectories of k+1 points; consecutive points differ in exactly one factor by ±delta."""
+    delta = levels / (2.0 * (levels - 1))
+    grid = [i / (levels - 1) for i in range(levels)]
+    trajs = []
+    for _ in range(r):
+        x = [rng.choice([v for v in grid if v + delta <= 1.0 + 1e-9]) for _ in range(k)]
+        # start low or high per factor so the step stays inside the box
+        x = [v + delta if rng.random() < 0.5 and v + delta <= 1.0 + 1e-9 else v for v in x]
+        pts = [list(x)]
+        for j in rng.sample(range(k), k):
+            x = list(x)
+            x[j] = x[j] - delta if x[j] - delta >= -1e-9 else x[j] + delta
+            pts.append(x)
+        trajs.append(pts)
+    return trajs
+
+
+def morris_indices(trajs: List[List[List[float]]], ys: List[List[float]], k: int) -> List[Dict[str, float]]:
+    ee: List[List[float]] = [[] for _ in range(k)]
+    for pts, y in zip(trajs, ys):
+        for a in range(len(pts) - 1):
+            j = next(i for i in range(k) if pts[a][i] != pts[a + 1][i])
+            step = pts[a + 1][j] - pts[a][j]
+            ee[j].append((y[a + 1] - y[a]) / step)
+    out = []
+    for e in ee:
+        out.append({
+            "mu": statistics.fmean(e) if e else 0.0,
+            "mu_star": statistics.fmean(abs(v) for v in e) if e else 0.0,
+            "sigma": statistics.stdev(e) if len(e) >= 2 else 0.0,
+        })
+    return out
+
+
+def saltelli_design(k: int, n: int, rng: random.Random) -> Tuple[List[List[float]], List[List[float]], List[List[List[float]]]]:
+    A = [[rng.random() for _ in range(k)] for _ in range(n)]
+    B = [[rng.random() for _ in range(k)] for _ in range(n)]
+    # AB[j]: A with column j taken from B
+    AB = [[a[:j] + [b[j]] + a[j + 1:] for a, b in zip(A, B)] for j in range(k)]
+    return A, B, AB
+
+
+def sobol_indices(yA: List[float], yB: List[float], yAB: List[List[float]]) -> List[Dict[str, float]]:
+    n = len(yA)
+    allv = yA + yB
+    var = statistics.pvariance(allv) if len(allv) >= 2 else 0.0
+    out = []
+    for yj in yAB:
+        if var <= 1e-12:
+            out.append({"S1": 0.0, "ST": 0.0})
+            continue
+        s1 = sum(b * (c - a) for a, b, c in zip(yA, yB, yj)) / n / var
+        st = sum((a - c) ** 2 for a, c in zip(yA, yj)) / (2.0 * n) / var
+        out.append({"S1": s1, "ST": st})
+    return out
+
+
+def sensitivity_report(game, method: str = "morris", r: int = 10, n: int = 32, levels: int = 4,
+                       episodes: int = 3, seed: int = 123, cfg_span: float | None = None,
+                       max_waves: int | None = None) -> Dict[str, Any]:
+    """Run Morris and/or Sobol ("morris", "sobol", "both") and write balance_sensitivity.md."""
+    log_level = int(os.environ.get("PATHFORGE_BALANCE_LOG", "1"))
+    os.environ.setdefault("PATHFORGE_BALANCE_TRACE", "0")
+    if max_waves is None:
+        max_waves = int(os.environ.get("PATHFORGE_BALANCE_MAX_WAVES", "25"))
+    if cfg_span is None:
+        cfg_span = float(os.environ.get("PATHFORGE_BALANCE_SENS_CFG_SPAN", "0.25"))
+    method = str(method).strip().lower()
+    facs = factors(cfg_span)
+    k = len(facs)
+    rng = random.Random(seed)
+    seeds = [rng.randint(0, 1_000_000) for _ in range(max(1, episodes))]
+
+    points: List[List[float]] = []
+    trajs = []
+    sob = None
+    if method in ("morris", "both"):
+        trajs = morris_design(k, max(2, int(r)), max(2, int(levels)), rng)
+        for t in trajs:
+            points.extend(t)
+    if method in ("sobol", "both"):
+        sob = saltelli_design(k, max(2, int(n)), rng)
+        A, B, AB = sob
+        points.extend(A)
+        points.extend(B)
+        for m in AB:
+            points.extend(m)
+    if not points:
+        raise ValueError(f"unknown method {method!r} (morris, sobol, both)")
+
+    ev = EpisodeEvaluator(game, episodes, max_waves, log_level=log_level, tag="[BAL][SENS]")
+    if log_level:
+        print(f"[BAL][SENS] {method}: {k} factors, {len(points)} points x {len(seeds)} seeds = {len(points) * len(seeds)} episodes", flush=True)
+    t0 = time.perf_counter()
+    try:
+        tasks = []
+        for u in points:
+            g, diff = _decode(u, facs)
+            for s in seeds:
+                tasks.append((g, s, None, diff))
+        res = ev.run(tasks)
+    finally:
+        ev.close()
+    wall = time.perf_counter() - t0
+    ys = []
+    for i in range(len(points)):
+        ok = [w for w, _ in res[i * len(seeds):(i + 1) * len(seeds)] if w is not None]
+        if not ok:
+            raise RuntimeError(f"[BAL][SENS] every episode of design point {i} failed")
+        ys.append(statistics.fmean(ok))
+    if log_level:
+        print(f"[BAL][SENS] {ev.episodes_run} episodes in {wall:.1f}s, waves mean={statistics.fmean(ys):.2f} "
+              f"sd={statistics.pstdev(ys):.2f}", flush=True)
+
+    rows: List[Dict[str, Any]] = [{"factor": name, "lo": lo, "hi": hi} for name, lo, hi in facs]
+    pos = 0
+    if trajs:
+        ty = []
+        for t in trajs:
+            ty.append(ys[pos:pos + len(t)])
+            pos += len(t)
+        for row, m in zip(rows, morris_indices(trajs, ty, k)):
+            row.update(m)
+    if sob is not None:
+        nA = len(sob[0])
+        yA, yB = ys[pos:pos + nA], ys[pos + nA:pos + 2 * nA]
+        pos += 2 * nA
+        yAB = [ys[pos + j * nA:pos + (j + 1) * nA] for j in range(k)]
+        for row, si in zip(rows, sobol_indices(yA, yB, yAB)):
+            row.update(si)
+
+    # rank by mu* (Morris) else total Sobol index; negligible = < 5% of the top factor
+    key = "mu_star" if trajs else "ST"
+    rows.sort(key=lambda x: -x.get(key, 0.0))
+    top = max((x.get(key, 0.0) for x in rows), default=0.0)
+    thr = float(os.environ.get("PATHFORGE_BALANCE_SENS_NEGLIGIBLE", "0.05"))
+    for x in rows:
+        x["negligible"] = top > 0 and x.get(key, 0.0) < thr * top
+    frozen = [x["factor"] for x in rows if x["negligible"]]
+
+    if log_level:
+        for i, x in enumerate(rows, start=1):
+            parts = []
+            if "mu_star" in x:
+                parts.append(f"mu*={x['mu_star']:.2f} mu={x['mu']:+.2f} sigma={x['sigma']:.2f}")
+            if "ST" in x:
+                parts.append(f"S1={x['S1']:.2f} ST={x['ST']:.2f}")
+            print(f"[BAL][SENS] {i:2d}. {x['factor']:<28} " + " ".join(parts) + (" (negligible)" if x["negligible"] else ""), flush=True)
+
+    report = {"method": method, "episodes": episodes, "max_waves": max_waves, "seeds": seeds, "cfg_span": cfg_span,
+              "points": len(points), "wall_s": round(wall, 2), "factors": rows, "negligible": frozen}
+
+    try:
+        md_path = PROFILE_FILE.replace("balance_profile.json", "balance_sensitivity.md")
+        lines = []
+        lines.append("# Pathforge Balance Sensitivity\n\n")
+        lines.append(f"- Method: **{method}** | factors: **{k}** | points: **{len(points)}** | episodes/point: **{len(seeds)}** | max waves: **{max_waves}**\n")
+        lines.append(f"- Seeds (common to all points): `{seeds}`\n")
+        lines.append(f"- Output: mean waves cleared (mean {statistics.fmean(ys):.2f}, sd {statistics.pstdev(ys):.2f})\n")
+        lines.append(f"- Difficulty constants varied ±{cfg_span:.0%} around `DifficultyConfig` defaults; genome knobs over the GA box\n")
+        if trajs:
+            lines.append(f"- Morris: r={len(trajs)} trajectories, {levels} levels; effects in waves per full range\n")
+        if sob is not None:
+            lines.append(f"- Sobol: N={len(sob[0])} (Saltelli); S1 first-order, ST total share of variance\n")
+        lines.append("\n| # | factor | range | mu* | mu | sigma | S1 | ST | |\n")
+        lines.append("|---:|---|---|---:|---:|---:|---:|---:|---|\n")
+        for i, x in enumerate(rows, start=1):
+            def f(name):
+                return f"{x[name]:.3f}" if name in x else "-"
+            lines.append(f"| {i} | {x['factor']} | {x['lo']:.3g} .. {x['hi']:.3g} | {f('mu_star')} | {f('mu')} | {f('sigma')} | {f('S1')} | {f('ST')} | {'negligible' if x['negligible'] else ''} |\n")
+        lines.append("\n## Freeze candidates\n\n")
+        if frozen:
+            lines.append(f"Effect below {thr:.0%} of the strongest factor: " + ", ".join(f"`{n}`" for n in frozen) + "\n")
+        else:
+            lines.append("None: every factor moves waves-cleared.\n")
+        os.makedirs(os.path.dirname(md_path), exist_ok=True)
+        with open(md_path, "w", encoding="utf-8") as mf:
+            mf.write("".join(lines))
+        if log_level:
+            print(f"[BAL] wrote summary {md_path}", flush=True)
+    except Exception:
+        pass
+
+    return report
@@ -1,10 +1,10 @@
 
 from __future__ import annotations
-import os, random, json
+import os, random, json, math, time
 
 TRACE = int(os.environ.get('PATHFORGE_BALANCE_TRACE','0'))
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Union
 
 from ..systems.wave_director import WaveDirector
 
@@ -26,6 +26,90 @@ class EpisodeResult:
     waves_cleared: int
     gold_end: int
     lives_end: int
+    # why the episode ended: "defeat", "max_waves", or (truncated) "predicate",
+    # "wall_budget", "tick_budget"; waves_cleared is then a lower bound
+    stop_reason: str = "max_waves"
+    truncated: bool = False
+    ticks: int = 0
+    wall_s: float = 0.0
+    # per-wave arrays when run_episode(trajectory=True), see _TrajectoryRecorder
+    trajectory: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class EpisodeProgress:
+    """What a stop predicate sees (at wave boundaries, and every N ticks if asked)."""
+    seed: int
+    wave: int            # wave about to start / in progress
+    waves_cleared: int
+    lives: int
+    gold: int
+    ticks: int           # total sim ticks so far
+    wall_s: float
+    in_wave: bool
+
+
+class StopAtWaves:
+    """Picklable predicate: stop once `n` waves are cleared (the outcome above n is irrelevant)."""
+
+    def __init__(self, n: int):
+        self.n = int(n)
+
+    def __call__(self, p: EpisodeProgress) -> Union[bool, str]:
+        return p.waves_cleared >= self.n
+
+class _TrajectoryRecorder:
+    """Per-wave arrays of one episode, small enough to persist with the eval cache.
+
+    Installed as world.telemetry, so enemies report damage (by type) and spawns to it.
+    One entry per simulated wave, the losing one included: lives and gold when the
+    fight ends (before the end-wave reward), leaks, kills, spawned, towers on the field,
+    assault multi and the perk taken ("" when none). dmg maps each damage type to
+    per-wave totals (zero-padded).
+    """
+
+    FIELDS = ("lives", "gold", "leaks", "kills", "spawned", "towers", "multi", "perk")
+
+    def __init__(self):
+        self.cols: Dict[str, List[Any]] = {k: [] for k in self.FIELDS}
+        self.dmg_waves: List[Dict[str, float]] = []
+        self._dmg: Dict[str, float] = {}
+        self.spawned = 0
+        self.leaks = 0
+        self.kills = 0
+
+    # world / enemy telemetry hooks
+    def enemy_spawned(self, key: str):
+        self.spawned += 1
+
+    def damage(self, src: str, dmg_type: str, amt: float, crit: bool = False):
+        if amt > 0:
+            self._dmg[dmg_type] = self._dmg.get(dmg_type, 0.0) + float(amt)
+
+    def end_wave(self, stats, towers: int, multi: int):
+        c = self.cols
+        c["lives"].append(int(stats.lives))
+        c["gold"].append(int(stats.gold))
+        c["leaks"].append(self.leaks)
+        c["kills"].append(self.kills)
+        c["spawned"].append(self.spawned)
+        c["towers"].append(int(towers))
+        c["multi"].append(int(multi))
+        c["perk"].append("")
+        self.dmg_waves.append(self._dmg)
+        self._dmg = {}
+        self.spawned = self.leaks = self.kills = 0
+
+    def perk_taken(self, perk: Dict[str, Any]):
+        if self.cols["perk"]:
+            self.cols["perk"][-1] = str(perk.get("rid") or perk.get("id") or "")
+
+    def as_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {k: list(v) for k, v in self.cols.items()}
+        types = sorted({t for d in self.dmg_waves for t in d})
+        out["dmg"] = {t: [round(d.get(t, 0.0), 1) for d in self.dmg_waves] for t in types}
+        return out
+
 
 def _pick_enemy_key(enemies_db: Dict[str,Any], wave:int, rng: random.Random, boss: bool=False) -> str:
     keys = list(enemies_db.keys())
@@ -59,9 +143,62 @@ def _make_wave_plan(enemies_db: Dict[str,Any], wave:int, rng: random.Random) ->
     rng.shuffle(plan)
     return plan
 
-def run_episode(towers_db: Dict[str,Any], enemies_db: Dict[str,Any], perks_roll_fn, seed:int=0, max_waves:int=35) -> EpisodeResult:
+# Reference resolution (matches the live game at 60 FPS). Coarser ticks are faster but
+# drift; `python -m pathforge.balance resolution` measures how much.
+SIM_HZ = 60.0
+# Per-wave safety cap, in simulated seconds (was 20000 ticks at 60 Hz)
+WAVE_TIMEOUT_S = 20000 / SIM_HZ
+# Bump whenever a code change alters episode outcomes: persisted eval-cache rows
+# recorded under another version are ignored.
+SIM_VERSION = "4.7.1-1"
+
+
+def projectile_mode() -> str:
+    """"integrate" (default: flying projectiles, like the live game) or "analytic"
+    (PATHFORGE_BALANCE_PROJECTILES=analytic: scheduled hits, faster but more generous,
+    since a shot that leads its target never misses a lane change or its TTL)."""
+    v = str(os.environ.get("PATHFORGE_BALANCE_PROJECTILES", "integrate")).strip().lower()
+    return "analytic" if v == "analytic" else "integrate"
+
+
+def sim_key() -> str:
+    """SIM_VERSION plus the projectile mode: the version key of cached and swept results,
+    so episodes from the two modes never mix."""
+    return f"{SIM_VERSION}/{projectile_mode()}"
+
+
+def _tick_hz_from_env() -> float:
+    try:
+        return float(os.environ.get("PATHFORGE_BALANCE_TICK_HZ", str(SIM_HZ)))
+    except Exception:
+        return SIM_HZ
+
+
+def resolve_tick_hz(tick_hz: Optional[float] = None) -> float:
+    hz = float(tick_hz) if tick_hz else _tick_hz_from_env()
+    return max(5.0, min(240.0, hz))
+
+
+def run_episode(towers_db: Dict[str,Any], enemies_db: Dict[str,Any], perks_roll_fn, seed:int=0, max_waves:int=35, tick_hz: Optional[float]=None,
+                stop_fn: Optional[Callable[[EpisodeProgress], Union[bool, str]]]=None, stop_check_ticks: int=0,
+                wall_budget_s: Optional[float]=None, tick_budget: Optional[int]=None,
+                trajectory: bool=False) -> EpisodeResult:
+    """Headless run of one seed until defeat or max_waves.
+
+    tick_hz: simulation rate (default PATHFORGE_BALANCE_TICK_HZ, else 60). Flying
+    projectiles are still integrated in <=1/60 s substeps at coarser rates.
+
+    Early abort: stop_fn is called at every wave boundary (and every stop_check_ticks
+    ticks inside a wave when > 0); a truthy return ends the episode, a string return
+    is used as the stop reason. wall_budget_s / tick_budget cap the whole episode.
+    A stopped episode returns truncated=True with the waves cleared so far.
+
+    trajectory: also return per-wave arrays (EpisodeResult.trajectory) for offline
+    re-scoring; recording does not change the outcome.
+    """
     global TRACE
     TRACE = int(os.environ.get("PATHFORGE_BALANCE_TRACE", str(TRACE)))
+    hz = resolve_tick_hz(tick_hz)
     pygame.init()
     pygame.display.set_mode((1,1))
 
@@ -88,8 +225,16 @@ def run_episode(towers_db: Dict[str,Any], enemies_db: Dict[str,Any], perks_roll_
     # Align sim with in-game behavior: World.spawn_enemy reads world.stats to apply
     # perk-driven enemy debuffs (hp/speed/armor). The live GameScene sets it.
     world.stats = stats
+    # Headless: no FX. Projectiles fly and collide as in the live game unless
+    # PATHFORGE_BALANCE_PROJECTILES=analytic (scheduled hits, no Projectile objects).
+    world.headless = True
+    if projectile_mode() == "analytic":
+        world.projectile_mode = "ANALYTIC"
     bot = AutoBot(rng)
     director = WaveDirector(rng)
+    rec = _TrajectoryRecorder() if trajectory else None
+    if rec is not None:
+        world.telemetry = rec
 
     # Spend starting talent points (may unlock towers/paths)
     try:
@@ -145,10 +290,32 @@ def run_episode(towers_db: Dict[str,Any], enemies_db: Dict[str,Any], perks_roll_
     bot.place_towers(world, stats, wave=1, max_towers=10)
 
     waves_cleared = 0
-    dt = 1/60.0
+    dt = 1.0 / hz
+    max_ticks = int(math.ceil(WAVE_TIMEOUT_S * hz))
     last_lives_lost = 0
+    t_start = time.perf_counter()
+    total_ticks = 0
+    stop_reason = None
+    check_every = int(stop_check_ticks) if stop_fn is not None and stop_check_ticks and stop_check_ticks > 0 else 0
+    wall_every = 256 if wall_budget_s else 0
+
+    def should_stop(wave: int, in_wave: bool) -> Optional[str]:
+        if tick_budget is not None and total_ticks >= tick_budget:
+            return "tick_budget"
+        wall = time.perf_counter() - t_start
+        if wall_budget_s is not None and wall >= wall_budget_s:
+            return "wall_budget"
+        if stop_fn is not None:
+            r = stop_fn(EpisodeProgress(seed=seed, wave=wave, waves_cleared=waves_cleared, lives=int(stats.lives),
+                                        gold=int(stats.gold), ticks=total_ticks, wall_s=wall, in_wave=in_wave))
+            if r:
+                return r if isinstance(r, str) else "predicate"
+        return None
 
     for wave in range(1, max_waves+1):
+        stop_reason = should_stop(wave, False)
+        if stop_reason:
+            break
         if TRACE:
             print(f"[SIM] seed={seed} wave={wave} start gold={stats.gold} lives={stats.lives} paves={getattr(stats,'paves',0)} towers={len(world.towers)}")
             if TRACE >= 2:
@@ -167,32 +334,32 @@ def run_episode(towers_db: Dict[str,Any], enemies_db: Dict[str,Any], perks_roll_
         bot.upgrade_towers(world, stats, wave=wave)
         bot.place_towers(world, stats, wave=wave, max_towers=12 + wave//6)
 
-        # spawn plan (supports assault multi)
-        queue: list[tuple[str,int]] = []
+        # spawn plan (supports assault multi), compiled once and consumed by cursor
         # estimate relics in the built path (affects keywords / boss escorts)
         path_cells = world.get_path() or []
         relic_set = set(getattr(gs, "relics", []) or [])
         relics_in_path = sum(1 for c in path_cells if c in relic_set)
 
-        for i in range(max(1, int(multi))):
-            wv = int(wave + i)
-            plan = director.plan(wv, relics_in_path=relics_in_path, ascension=0)
-            for k in director.spawn_list(plan):
-                queue.append((k, wv))
-        rng.shuffle(queue)
-        spawn_cd = 0.0
+        schedule = director.compile_assault(wave, multi, relics_in_path=relics_in_path, ascension=0, gap=0.28)
+        world.clear_projectiles()
 
         # simulate until wave done
         t_acc = 0.0
         ticks = 0
-        while (queue or world.enemies) and stats.lives > 0 and ticks < 20000:
+        while (not schedule.done() or world.enemies) and stats.lives > 0 and ticks < max_ticks:
             ticks += 1
+            total_ticks += 1
+            if (tick_budget is not None and total_ticks >= tick_budget) or (check_every and ticks % check_every == 0) \
+                    or (wall_every and ticks % wall_every == 0):
+                stop_reason = should_stop(wave, True)
+                if stop_reason:
+                    break
             t_acc += dt
-            spawn_cd -= dt
-            if queue and spawn_cd <= 0.0:
-                key, wv = queue.pop()
+            for key, wv in schedule.due(t_acc):
                 world.spawn_enemy(key, wave=wv, gold_bonus=getattr(stats, "gold_per_kill", 0))
-                spawn_cd = 0.28
+
+            # refresh spatial list (AoE towers / Tesla chain hops query it), like GameScene
+            world.rebuild_spatial()
 
             # compute buffs (minimal)
             buffs = {"dmg_mul":1.0, "rate_mul":1.0, "range_mul":1.0}
@@ -202,6 +369,8 @@ def run_episode(towers_db: Dict[str,Any], enemies_db: Dict[str,Any], perks_roll_
                 e.update(dt, world=world, rng=rng)
                 if getattr(e, "finished", False):
                     stats.lives -= 1
+                    if rec is not None:
+                        rec.leaks += 1
                     try:
                         world.enemies.remove(e)
                     except ValueError:
@@ -210,6 +379,8 @@ def run_episode(towers_db: Dict[str,Any], enemies_db: Dict[str,Any], perks_roll_
                     # reward (match GameScene): reward_gold + tile bonus
                     gold = int(getattr(e, "reward_gold", 0)) + int(getattr(e, "tile_gold_bonus", 0))
                     stats.gold += gold
+                    if rec is not None:
+                        rec.kills += 1
                     try:
                         world.enemies.remove(e)
                     except ValueError:
@@ -219,12 +390,21 @@ def run_episode(towers_db: Dict[str,Any], enemies_db: Dict[str,Any], perks_roll_
             for t in list(world.towers):
                 t.update(dt, world, rng, stats, buffs)
 
-        if ticks >= 20000 and (queue or world.enemies):
+            # projectile hits (scheduled impacts or flying projectiles)
+            world.update_projectiles(dt, max_step=1.0/SIM_HZ)
+
+        if stop_reason:
+            break
+
+        if ticks >= max_ticks and (not schedule.done() or world.enemies):
             if TRACE:
-                print(f"[SIM] wave={wave} TIMEOUT ticks={ticks} remaining_enemies={len(world.enemies)} remaining_queue={len(queue)}")
+                print(f"[SIM] wave={wave} TIMEOUT ticks={ticks} remaining_enemies={len(world.enemies)} remaining_queue={schedule.remaining()}")
             # Treat as fail to avoid hanging tune() for too long
             stats.lives = 0
 
+        if rec is not None:
+            rec.end_wave(stats, len(world.towers), multi)
+
         if stats.lives <= 0:
             break
 
@@ -263,6 +443,8 @@ def run_episode(towers_db: Dict[str,Any], enemies_db: Dict[str,Any], perks_roll_
         pick = bot.choose_perk(options, wave=wave)
         chosen = options[pick]
         stats.apply_perk(chosen)
+        if rec is not None:
+            rec.perk_taken(chosen)
         if TRACE >= 2:
             try:
                 print(f"[SIM] seed={seed} perk={chosen.get('name', chosen.get('id'))} rarity={chosen.get('rarity')} mods={chosen.get('mods',{})} grants={chosen.get('grants',{})}")
@@ -275,4 +457,9 @@ def run_episode(towers_db: Dict[str,Any], enemies_db: Dict[str,Any], perks_roll_
             pass
 
     pygame.quit()
-    return EpisodeResult(seed=seed, waves_cleared=waves_cleared, gold_end=stats.gold, lives_end=stats.lives)
+    if stop_reason is None:
+        stop_reason = "defeat" if stats.lives <= 0 else "max_waves"
+    return EpisodeResult(seed=seed, waves_cleared=waves_cleared, gold_end=stats.gold, lives_end=stats.lives,
+                         stop_reason=stop_reason, truncated=stop_reason not in ("defeat", "max_waves"),
+                         ticks=total_ticks, wall_s=time.perf_counter() - t_start,
+                         trajectory=rec.as_dict() if rec is not None else None)
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+"""Live throughput status of a running tuner.
+
+EpisodeEvaluator feeds every finished episode and cache lookup in here; the tuner
+main loops add their progress (generation, best score). A snapshot is rewritten
+atomically to saves/balance_status.json at most every
+PATHFORGE_BALANCE_STATUS_EVERY seconds (default 2; PATHFORGE_BALANCE_STATUS=<path>
+moves it, =0 disables it), and PATHFORGE_BALANCE_STATUS_PORT=<port> also serves
+it as JSON over HTTP on 127.0.0.1 (`curl 127.0.0.1:<port>/status`).
+
+Snapshot: episodes/sec (whole run and last minute), cache hit rate (memory and
+disk), mean wall time and ticks per simulated episode, utilization of each
+worker (episode wall time over the run's wall time) and the slowest of the last
+GENOME_WINDOW genomes evaluated (bounded, so a 264k-combo sweep costs the same).
+"""
+
+import heapq
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Optional, Sequence, Tuple
+
+from ..core.balance_profile import PROFILE_FILE
+
+RATE_WINDOW_S = 60.0
+SLOWEST_N = 5
+GENOME_WINDOW = 512     # most recently evaluated genomes considered for "slowest"
+
+
+def default_path() -> Optional[str]:
+    v = str(os.environ.get("PATHFORGE_BALANCE_STATUS", "")).strip()
+    if v.lower() in ("0", "false", "no", "off"):
+        return None
+    if v and v.lower() not in ("1", "true", "yes", "on"):
+        return v
+    return os.path.join(os.path.dirname(PROFILE_FILE), "balance_status.json")
+
+
+def default_port() -> Optional[int]:
+    v = str(os.environ.get("PATHFORGE_BALANCE_STATUS_PORT", "")).strip()
+    try:
+        return int(v) if v and int(v) > 0 else None
+    except ValueError:
+        return None
+
+
+class TunerStatus:
+    def __init__(self, tag: str, slots: int = 1, path: Optional[str] = None, port: Optional[int] = None,
+                 every_s: Optional[float] = None, log_level: int = 1):
+        self.tag = tag
+        self.slots = max(1, int(slots))
+        self.path = path
+        self.every_s = float(os.environ.get("PATHFORGE_BALANCE_STATUS_EVERY", "2")) if every_s is None else float(every_s)
+        self.log_level = int(log_level)
+        self.t0 = time.time()
+        self.progress: Dict[str, Any] = {}
+        self.episodes = 0
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.ticks = 0
+        self.stops: Dict[str, int] = {}
+        self.lookups = 0
+        self.mem_hits = 0
+        self.disk_hits = 0
+        self.workers: Dict[str, Dict[str, float]] = {}
+        # recent genome -> [episodes, wall sum, wall max], least recently used first
+        self.genomes: "OrderedDict[Tuple[Any, ...], list]" = OrderedDict()
+        self._recent: Deque[float] = deque()
+        self._last_write = 0.0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._snap: Dict[str, Any] = {}
+        self._server = None
+        if port:
+            self._serve(int(port))
+
+    # ---- feeding ----
+    def episode(self, genome_tup: Sequence[Any], wall_s: float, cpu_s: float, ticks: int, worker: str, reason: str):
+        now = time.time()
+        self.episodes += 1
+        self.wall_s += float(wall_s)
+        self.cpu_s += float(cpu_s)
+        self.ticks += int(ticks)
+        self.stops[reason] = self.stops.get(reason, 0) + 1
+        w = self.workers.setdefault(str(worker), {"episodes": 0, "busy_s": 0.0, "cpu_s": 0.0})
+        w["episodes"] += 1
+        w["busy_s"] += float(wall_s)
+        w["cpu_s"] += float(cpu_s)
+        key = tuple(genome_tup)
+        g = self.genomes.get(key)
+        if g is None:
+            g = self.genomes[key] = [0, 0.0, 0.0]
+            if len(self.genomes) > GENOME_WINDOW:
+                self.genomes.popitem(last=False)
+        else:
+            self.genomes.move_to_end(key)
+        g[0] += 1
+        g[1] += float(wall_s)
+        g[2] = max(g[2], float(wall_s))
+        self._recent.append(now)
+        self.maybe_write()
+
+    def cache(self, lookups: int, mem_hits: int = 0, disk_hits: int = 0):
+        self.lookups += int(lookups)
+        self.mem_hits += int(mem_hits)
+        self.disk_hits += int(disk_hits)
+
+    def update(self, **progress):
+        """Tuner main-loop progress (generation, best score, ...); always rewrites the snapshot."""
+        self.progress.update(progress)
+        self.maybe_write(force=True)
+
+    # ---- output ----
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.time()
+        elapsed = max(1e-9, now - self.t0)
+        while self._recent and self._recent[0] < now - RATE_WINDOW_S:
+            self._recent.popleft()
+        n = max(1, self.episodes)
+        slow = heapq.nlargest(SLOWEST_N, self.genomes.items(), key=lambda kv: kv[1][1] / kv[1][0])
+        return {
+            "tag": self.tag,
+            "state": "done" if self._closed else "running",
+            "pid": os.getpid(),
+            "started": self.t0,
+            "updated": now,
+            "elapsed_s": round(elapsed, 1),
+            "progress": dict(self.progress),
+            "episodes": {
+                "simulated": self.episodes,
+                "per_s": round(self.episodes / elapsed, 3),
+                "per_s_recent": round(len(self._recent) / min(elapsed, RATE_WINDOW_S), 3),
+                "mean_wall_s": round(self.wall_s / n, 3),
+                "mean_cpu_s": round(self.cpu_s / n, 3),
+                "mean_ticks": round(self.ticks / n, 1),
+                "stops": dict(self.stops),
+            },
+            "cache": {
+                "lookups": self.lookups,
+                "memory_hits": self.mem_hits,
+                "disk_hits": self.disk_hits,
+                "hit_rate": round((self.mem_hits + self.disk_hits) / self.lookups, 4) if self.lookups else None,
+            },
+            "workers": {
+                "slots": self.slots,
+                "utilization": round(sum(w["busy_s"] for w in self.workers.values()) / (self.slots * elapsed), 4),
+                "per_worker": {k: {"episodes": int(w["episodes"]), "busy_s": round(w["busy_s"], 2),
+                                   "cpu_s": round(w["cpu_s"], 2), "utilization": round(w["busy_s"] / elapsed, 4)}
+                               for k, w in sorted(self.workers.items())},
+            },
+            "slowest_genomes": [{"genome": list(g), "episodes": v[0], "mean_wall_s": round(v[1] / v[0], 3),
+                                 "max_wall_s": round(v[2], 3)} for g, v in slow],
+        }
+
+    def maybe_write(self, force: bool = False):
+        now = time.time()
+        if self._closed or (not force and now - self._last_write < self.every_s):
+            return
+        self._last_write = now
+        self._publish(self.snapshot())
+
+    def _publish(self, snap: Dict[str, Any]):
+        with self._lock:
+            self._snap = snap
+        if not self.path:
+            return
+        try:
+            d = os.path.dirname(self.path)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            # write + rename so a reader never sees a half-written file
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snap, f, indent=2)
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
+
+    def close(self):
+        """Final snapshot (state "done"), then stop the HTTP endpoint."""
+        if self._closed:
+            return
+        self._closed = True
+        self._publish(self.snapshot())
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _serve(self, port: int):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        status = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/status"):
+                    self.send_error(404)
+                    return
+                with status._lock:
+                    body = json.dumps(status._snap or {"tag": status.tag, "state": "starting"}).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+            self._server.daemon_threads = True
+        except OSError as ex:
+            if self.log_level:
+                print(f"{self.tag} status endpoint on 127.0.0.1:{port} failed: {ex}", flush=True)
+            return
+        threading.Thread(target=self._server.serve_forever, name="pf-status", daemon=True).start()
+        if self.log_level:
+            print(f"{self.tag} status on http://127.0.0.1:{port}/status", flush=True)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+"""Gaussian-process surrogate for GA pre-screening.
+
+Small pure-Python GP (RBF kernel, Cholesky solve) over genomes mapped to the unit
+cube. The tuner fits it on every genome it actually simulated (mean waves
+cleared) and only simulates the bred children the model finds promising or
+uncertain. The training set is capped (most recent points), so a fit stays
+O(max_points³) and runs in well under a second.
+"""
+
+import math
+from typing import List, Optional, Sequence, Tuple
+
+
+def _cholesky(a: List[List[float]]) -> List[List[float]]:
+    n = len(a)
+    L = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        Li = L[i]
+        for j in range(i + 1):
+            Lj = L[j]
+            s = a[i][j]
+            for k in range(j):
+                s -= Li[k] * Lj[k]
+            if i == j:
+                Li[i] = math.sqrt(s) if s > 1e-12 else 1e-6
+            else:
+                Li[j] = s / Lj[j]
+    return L
+
+
+def _forward(L: List[List[float]], b: Sequence[float]) -> List[float]:
+    n = len(L)
+    x = [0.0] * n
+    for i in range(n):
+        Li = L[i]
+        s = b[i]
+        for k in range(i):
+            s -= Li[k] * x[k]
+        x[i] = s / Li[i]
+    return x
+
+
+def _backward(L: List[List[float]], b: Sequence[float]) -> List[float]:
+    # solves L^T x = b
+    n = len(L)
+    x = [0.0] * n
+    for i in range(n - 1, -1, -1):
+        s = b[i]
+        for k in range(i + 1, n):
+            s -= L[k][i] * x[k]
+        x[i] = s / L[i][i]
+    return x
+
+
+class GPSurrogate:
+    def __init__(self, length_scale: float = 0.7, noise: float = 0.08, max_points: int = 160):
+        self.ls2 = float(length_scale) ** 2
+        self.noise = float(noise)
+        self.max_points = int(max_points)
+        self.X: List[Tuple[float, ...]] = []
+        self._L: Optional[List[List[float]]] = None
+        self._alpha: List[float] = []
+        self._y_mean = 0.0
+        self._y_std = 1.0
+
+    def _k(self, a: Sequence[float], b: Sequence[float]) -> float:
+        d2 = 0.0
+        for u, v in zip(a, b):
+            d2 += (u - v) * (u - v)
+        return math.exp(-0.5 * d2 / self.ls2)
+
+    @property
+    def n(self) -> int:
+        return len(self.X)
+
+    def fit(self, X: Sequence[Sequence[float]], y: Sequence[float]) -> "GPSurrogate":
+        X = [tuple(map(float, x)) for x in X][-self.max_points:]
+        y = [float(v) for v in y][-self.max_points:]
+        self.X = X
+        if not X:
+            self._L = None
+            return self
+        m = sum(y) / len(y)
+        sd = math.sqrt(sum((v - m) ** 2 for v in y) / len(y)) or 1.0
+        self._y_mean, self._y_std = m, sd
+        yn = [(v - m) / sd for v in y]
+        n = len(X)
+        K = [[self._k(X[i], X[j]) + (self.noise if i == j else 0.0) for j in range(n)] for i in range(n)]
+        self._L = _cholesky(K)
+        self._alpha = _backward(self._L, _forward(self._L, yn))
+        return self
+
+    def predict(self, x: Sequence[float]) -> Tuple[float, float]:
+        """(mean, std) in the units of y; prior (training mean, training std) when unfitted."""
+        if self._L is None:
+            return self._y_mean, self._y_std
+        ks = [self._k(x, xi) for xi in self.X]
+        mu = sum(a * k for a, k in zip(self._alpha, ks))
+        v = _forward(self._L, ks)
+        var = max(0.0, 1.0 - sum(t * t for t in v))
+        return self._y_mean + mu * self._y_std, math.sqrt(var) * self._y_std
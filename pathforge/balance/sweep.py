@@ -0,0 +1,295 @@
+from __future__ import annotations
+import hashlib, json, os, random, sqlite3, statistics, time
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+
+from .cache import base_data_hash
+from .sim import resolve_tick_hz, sim_key
+from .tune import EpisodeEvaluator, Genome, _score_mean, _to_profile, _write_profile
+from ..core.balance_profile import PROFILE_FILE
+
+# ------------------------------
+# Exhaustive grid sweep (v4.7.2)
+# ------------------------------
+# The grid (≈264k combos) is never materialized: a combo is decoded from its index
+# (mixed radix, last knob fastest, same order as the old nested loops). Shards take
+# every N-th index (`python -m pathforge.balance sweep --shard i/N`, 0 <= i < N), so
+# machines can split one sweep; within a shard, combos go through the shared
+# EpisodeEvaluator (PATHFORGE_BALANCE_WORKERS / _COORDINATOR). Each result lands in a
+# SQLite store as soon as its chunk finishes and a rerun skips completed indices.
+# All shards use the same common seeds, so their results are comparable.
+
+GRID: Tuple[Tuple[str, Tuple[float, ...]], ...] = (
+    ("td", (0.70, 0.80, 0.90, 1.00, 1.10, 1.20)),
+    ("tr", (0.80, 0.90, 1.00, 1.10, 1.20)),
+    ("tc", (0.90, 1.00, 1.10)),
+    ("eh", (0.50, 0.70, 0.85, 1.00, 1.20, 1.40, 1.70)),
+    ("aa", (-4, -2, 0, 2, 4, 6, 8)),
+    ("es", (0.85, 0.95, 1.00, 1.10, 1.20)),
+    ("er", (0.50, 0.80, 1.00, 1.20)),
+    ("sh", (0.70, 1.00, 1.30)),
+)
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS sweeps (
+        sweep   TEXT PRIMARY KEY,
+        meta    TEXT NOT NULL,
+        created REAL
+    )""",
+    """CREATE TABLE IF NOT EXISTS results (
+        sweep   TEXT    NOT NULL,
+        idx     INTEGER NOT NULL,
+        waves   TEXT    NOT NULL,
+        mean    REAL    NOT NULL,
+        std     REAL    NOT NULL,
+        shard   TEXT,
+        created REAL,
+        PRIMARY KEY (sweep, idx)
+    )""",
+)
+
+
+def grid_size() -> int:
+    n = 1
+    for _, opts in GRID:
+        n *= len(opts)
+    return n
+
+
+def combo_at(idx: int) -> Genome:
+    """Decode a grid index into its genome."""
+    idx = int(idx)
+    vals: Dict[str, Any] = {}
+    for name, opts in reversed(GRID):
+        idx, r = divmod(idx, len(opts))
+        vals[name] = opts[r]
+    vals["aa"] = int(vals["aa"])
+    return Genome(**vals)
+
+
+def parse_shard(spec: Optional[str]) -> Tuple[int, int]:
+    if not spec:
+        return 0, 1
+    i, _, n = str(spec).partition("/")
+    i, n = int(i), int(n or 1)
+    if n < 1 or not (0 <= i < n):
+        raise ValueError(f"bad shard {spec!r}: expected i/N with 0 <= i < N")
+    return i, n
+
+
+def store_path() -> str:
+    return os.environ.get("PATHFORGE_BALANCE_SWEEP_DB", "").strip() or PROFILE_FILE.replace("balance_profile.json", "balance_sweep.sqlite")
+
+
+class SweepStore:
+    def __init__(self, path: str):
+        self.path = path
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=30.0, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA busy_timeout=30000")
+        for stmt in _SCHEMA:
+            self.db.execute(stmt)
+
+    def register(self, sweep: str, meta: Dict[str, Any]):
+        self.db.execute("INSERT OR IGNORE INTO sweeps VALUES (?,?,?)", (sweep, json.dumps(meta, sort_keys=True), time.time()))
+
+    def done(self, sweep: str) -> set:
+        return {int(i) for (i,) in self.db.execute("SELECT idx FROM results WHERE sweep=?", (sweep,))}
+
+    def put(self, sweep: str, rows: Iterable[Tuple[int, List[int]]], shard: str = ""):
+        now = time.time()
+        data = []
+        for idx, waves in rows:
+            mean = float(sum(waves) / max(1, len(waves)))
+            std = float(statistics.pstdev(waves)) if len(waves) >= 2 else 0.0
+            data.append((sweep, int(idx), json.dumps(list(waves)), mean, std, shard, now))
+        if not data:
+            return
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            self.db.executemany("INSERT OR REPLACE INTO results VALUES (?,?,?,?,?,?,?)", data)
+            self.db.execute("COMMIT")
+        except sqlite3.Error:
+            self.db.execute("ROLLBACK")
+            raise
+
+    def rows(self, sweep: str) -> List[Tuple[int, float, float, List[int]]]:
+        return [(int(i), float(m), float(s), json.loads(w))
+                for i, m, s, w in self.db.execute("SELECT idx, mean, std, waves FROM results WHERE sweep=?", (sweep,))]
+
+    def close(self):
+        try:
+            self.db.close()
+        except Exception:
+            pass
+
+
+def sweep_id(episodes: int, max_waves: int, seeds: Sequence[int]) -> str:
+    """Results are only comparable for the same data, sim (incl. projectile mode), tick rate, seeds and grid.
+
+    The data part is the shipped data (not a saved balance profile), so the id survives tuner
+    runs in between and shards on machines with different saves/ agree.
+    """
+    key = json.dumps([base_data_hash(), sim_key(), resolve_tick_hz(None), int(episodes), int(max_waves), list(seeds), GRID])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def run_sweep(game, target: str = "humain_solide", episodes: int = 6, seed: int = 123,
+              shard: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+    """Evaluate this shard's remaining grid indices, then summarize everything stored so far.
+
+    limit (PATHFORGE_BALANCE_SWEEP_LIMIT) caps the combos evaluated by this call. Once the
+    whole grid is stored, the best combo is written as the balance profile.
+    """
+    log_level = int(os.environ.get("PATHFORGE_BALANCE_LOG", "1"))
+    os.environ.setdefault("PATHFORGE_BALANCE_TRACE", str(log_level))
+    max_waves = int(os.environ.get("PATHFORGE_BALANCE_MAX_WAVES", "25"))
+    target_wave = 20 if target == "humain_solide" else 12
+    if limit is None:
+        limit = int(os.environ.get("PATHFORGE_BALANCE_SWEEP_LIMIT", "0")) or None
+    si, sn = parse_shard(shard if shard is not None else os.environ.get("PATHFORGE_BALANCE_SHARD"))
+    rng = random.Random(seed)
+    seeds = [rng.randint(0, 1_000_000) for _ in range(max(1, episodes))]
+    total = grid_size()
+
+    ev = EpisodeEvaluator(game, episodes, max_waves, log_level=log_level, tag="[BAL][SWEEP]")
+    sid = sweep_id(episodes, max_waves, seeds)
+    store = SweepStore(store_path())
+    store.register(sid, {"episodes": episodes, "max_waves": max_waves, "seeds": seeds, "data": base_data_hash(),
+                         "sim": sim_key(), "tick_hz": resolve_tick_hz(None), "size": total})
+    done = store.done(sid)
+    todo = (i for i in range(si, total, sn) if i not in done)
+    mine = len(range(si, total, sn))
+    left = mine - sum(1 for i in done if i % sn == si)
+    if log_level:
+        print(f"[BAL][SWEEP] {sid} shard {si}/{sn}: {mine - left}/{mine} done, {left} to go "
+              f"(grid {total}, episodes={episodes}, max_waves={max_waves}, db={store.path})", flush=True)
+
+    chunk = max(8, 4 * ev.slots)
+    ran = 0
+    failed = 0
+    t0 = time.perf_counter()
+    t_log = t0
+    try:
+        while limit is None or ran < limit:
+            idxs = []
+            for i in todo:
+                idxs.append(i)
+                if len(idxs) >= chunk or (limit is not None and ran + len(idxs) >= limit):
+                    break
+            if not idxs:
+                break
+            genomes = [combo_at(i) for i in idxs]
+            ev.prefill(genomes, seeds)
+            # a combo with a failed episode is not stored: it stays pending and the next run retries it
+            ok = [(i, g) for i, g in zip(idxs, genomes) if not ev.failures(g, seeds)]
+            failed += len(idxs) - len(ok)
+            store.put(sid, [(i, ev.evaluate(g, seeds)[2]) for i, g in ok], shard=f"{si}/{sn}")
+            # the store is the record now; keep the in-memory episode cache small
+            ev.cache.clear()
+            ev.failed.clear()
+            ran += len(idxs)
+            ev.status.update(algo="EXHAUSTIVE", sweep=sid, shard=f"{si}/{sn}", combos_done=ran, combos=left)
+            now = time.perf_counter()
+            if log_level and (now - t_log >= 30.0 or ran == left):
+                rate = ran / max(1e-9, now - t0)
+                eta = (left - ran) / max(1e-9, rate)
+                print(f"[BAL][SWEEP] {ran}/{left} combos ({rate:.2f}/s, eta {eta / 3600.0:.1f}h)", flush=True)
+                t_log = now
+    finally:
+        ev.close()
+    if failed and log_level:
+        print(f"[BAL][SWEEP] {failed} combos had a failed episode and were not stored (retried on the next run)", flush=True)
+
+    report = summarize(store, sid, target, target_wave, max_waves, episodes, log_level=log_level)
+    store.close()
+    if report["complete"] and report["top"]:
+        best = report["top"][0]
+        profile = _to_profile(combo_at(best["idx"]))
+        profile["meta"] = {
+            "algo": "EXHAUSTIVE",
+            "target": target,
+            "episodes": episodes,
+            "max_waves": max_waves,
+            "mean_waves": best["mean"],
+            "std_waves": best["std"],
+            "seed_mode": "fixed",
+            "samples": best["waves"],
+            "best_score": best["score"],
+            "sweep": sid,
+        }
+        _write_profile(profile, target_wave, "fixed", log_level)
+        return profile
+    return {"meta": {"algo": "EXHAUSTIVE", "sweep": sid, "done": report["done"], "size": total}}
+
+
+def summarize(store: SweepStore, sid: str, target: str, target_wave: float, max_waves: int, episodes: int,
+              top_n: int = 15, region_frac: float = 0.01, log_level: int = 1) -> Dict[str, Any]:
+    """Rank stored combos and describe the best regions of the grid.
+
+    Per knob: mean/best score of every option value and its share of the top
+    region (best region_frac of stored combos, at least 10); plus the value
+    range that top region spans, i.e. the sub-box worth refining with the GA.
+    """
+    rows = store.rows(sid)
+    total = grid_size()
+    scored = sorted(((_score_mean(m, target_wave), i, m, s, w) for i, m, s, w in rows), key=lambda x: (x[0], x[1]))
+    top = [{"idx": i, "score": sc, "mean": m, "std": s, "waves": w, "genome": combo_at(i).as_tuple()}
+           for sc, i, m, s, w in scored[:top_n]]
+    k = min(len(scored), max(10, int(len(scored) * region_frac)))
+    genomes = [combo_at(x[1]) for x in scored]
+    region = genomes[:k]
+    knobs: Dict[str, Any] = {}
+    for name, opts in GRID:
+        per: Dict[Any, List[float]] = {v: [] for v in opts}
+        for x, g in zip(scored, genomes):
+            per[getattr(g, name)].append(x[0])
+        in_region = [getattr(g, name) for g in region]
+        knobs[name] = {
+            "values": [{"value": v, "n": len(per[v]), "mean_score": statistics.fmean(per[v]) if per[v] else None,
+                        "best_score": min(per[v]) if per[v] else None,
+                        "region_share": in_region.count(v) / max(1, len(region))} for v in opts],
+            "region": [min(in_region), max(in_region)] if in_region else None,
+        }
+    report = {"sweep": sid, "done": len(rows), "size": total, "complete": len(rows) >= total,
+              "top": top, "region_size": k, "knobs": knobs}
+
+    if log_level:
+        print(f"[BAL][SWEEP] {len(rows)}/{total} combos stored", flush=True)
+        if top:
+            print(f"[BAL][SWEEP] best score={top[0]['score']:.3f} mean={top[0]['mean']:.2f} {combo_at(top[0]['idx'])}", flush=True)
+            print("[BAL][SWEEP] top region: " + " ".join(f"{n}=[{kn['region'][0]}..{kn['region'][1]}]" for n, kn in knobs.items() if kn["region"]), flush=True)
+
+    try:
+        md_path = PROFILE_FILE.replace("balance_profile.json", "balance_sweep.md")
+        lines = []
+        lines.append("# Pathforge Exhaustive Sweep\n\n")
+        lines.append(f"- Sweep: `{sid}` | target: **{target}** (target_mean≈{target_wave}) | episodes: **{episodes}** | max waves: **{max_waves}**\n")
+        lines.append(f"- Progress: **{len(rows)} / {total}** combos{' (complete)' if report['complete'] else ''}\n\n")
+        lines.append(f"## Top {len(top)}\n\n")
+        lines.append("| # | score | mean | std | td | tr | tc | eh | aa | es | er | sh |\n")
+        lines.append("|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|\n")
+        for n, t in enumerate(top, start=1):
+            lines.append(f"| {n} | {t['score']:.3f} | {t['mean']:.2f} | {t['std']:.2f} | " + " | ".join(str(v) for v in t["genome"]) + " |\n")
+        lines.append(f"\n## Best region (top {k} combos)\n\n")
+        for name, kn in knobs.items():
+            if kn["region"]:
+                lines.append(f"- {name}: `{kn['region'][0]} .. {kn['region'][1]}`\n")
+        lines.append("\n## Per-knob marginals\n\n")
+        for name, kn in knobs.items():
+            cells = []
+            for v in kn["values"]:
+                if v["n"]:
+                    cells.append(f"`{v['value']}` mean={v['mean_score']:.2f} best={v['best_score']:.2f} top={v['region_share']:.0%}")
+            lines.append(f"- **{name}**: " + " | ".join(cells) + "\n")
+        os.makedirs(os.path.dirname(md_path), exist_ok=True)
+        with open(md_path, "w", encoding="utf-8") as mf:
+            mf.write("".join(lines))
+        if log_level:
+            print(f"[BAL] wrote summary {md_path}", flush=True)
+    except Exception:
+        pass
+
+    return report
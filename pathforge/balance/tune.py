@@ -1,11 +1,12 @@
 
 from __future__ import annotations
-import json, os, random, math, statistics
+import json, os, random, math, statistics, time
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import asdict, dataclass
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Tuple
 
-from .sim import run_episode
+from .sim import run_episode, resolve_tick_hz, sim_key, StopAtWaves
+from .cache import base_data_hash, base_dbs
 from ..core.balance_profile import PROFILE_FILE
 
 
@@ -17,23 +18,21 @@ def _eval_genome_worker(
     eval_seeds: list[int],
     episodes: int,
     max_waves: int,
+    tick_hz: float | None = None,
 ) -> Tuple[float, float, list[int]]:
     """Evaluate a genome in an isolated process.
 
-    - Deep-copies the base DBs
-    - Applies the balance profile
+    - Applies the balance profile as an overlay on the base DBs (no deep copy)
     - Runs multiple deterministic episodes (perk RNG is derived from episode seed)
     """
-    from ..core.balance_profile import apply_profile
+    from ..core.balance_profile import ProfileOverlay
     from ..systems.perk_factory import PerkPool
 
     # reconstruct genome/profile in the worker
     g = Genome(*genome_tup)
     profile = _to_profile(g)
 
-    towers_db = json.loads(json.dumps(base_towers_db))
-    enemies_db = json.loads(json.dumps(base_enemies_db))
-    apply_profile(towers_db, enemies_db, profile)
+    towers_db, enemies_db = ProfileOverlay(base_towers_db, base_enemies_db).apply(profile)
 
     pool = PerkPool(perks_db)
     waves: list[int] = []
@@ -43,7 +42,7 @@ def _eval_genome_worker(
         def roll_fn(n, rarity_bias=0.0):
             return pool.roll(prng, n=n, rarity_bias=rarity_bias)
 
-        res = run_episode(towers_db, enemies_db, roll_fn, seed=int(s), max_waves=max_waves)
+        res = run_episode(towers_db, enemies_db, roll_fn, seed=int(s), max_waves=max_waves, tick_hz=tick_hz)
         waves.append(int(res.waves_cleared))
 
     mean = float(sum(waves) / max(1, len(waves)))
@@ -51,6 +50,115 @@ def _eval_genome_worker(
     return mean, std, waves
 
 
+# Pool workers keep the base DBs resident (shipped once by the initializer), so tasks
+# are just (genome, seed) and idle workers pick up single episodes from the pool queue.
+_RESIDENT: Dict[str, Any] = {}
+
+
+def _init_episode_worker(base_towers_db: Dict[str, Any], base_enemies_db: Dict[str, Any], perks_db: list[dict[str, Any]],
+                         bound=None):
+    """bound: optional shared multiprocessing.Value holding the best score so far (pruning)."""
+    import socket
+    from ..core.balance_profile import ProfileOverlay
+    from ..systems.perk_factory import PerkPool
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    _RESIDENT.clear()
+    _RESIDENT.update(overlay=ProfileOverlay(base_towers_db, base_enemies_db), pool=PerkPool(perks_db),
+                     genome=None, dbs=None, bound=bound, worker=f"{socket.gethostname()}:{os.getpid()}")
+
+
+def _min_possible_score(sum_waves: float, done: int, episodes: int, max_waves: int, target_wave: float,
+                        running: Optional[int] = None) -> float:
+    """Lowest score a combo can still reach after `done` of its `episodes` episodes.
+
+    Remaining episodes can range [0, max_waves]; an episode in progress that has cleared
+    `running` waves ranges [running, max_waves] (done counts it).
+    """
+    left = max(0, episodes - done)
+    lo = (sum_waves + (running or 0)) / episodes
+    hi = (sum_waves + float(max_waves) * (left + (0 if running is None else 1))) / episodes
+    # best score over [lo, hi] occurs near target_wave or at boundaries
+    cand = [x for x in (lo, hi, float(target_wave)) if lo <= x <= hi] + [lo, hi]
+    return min(_score_mean(x, target_wave) for x in cand)
+
+
+class _PruneStop:
+    """Stop predicate: the running episode already rules its combo out against the best score.
+
+    prune = (sum_waves_before, episodes_before, episodes, target_wave, best_at_submit); the live
+    best from the shared bound (pool workers) tightens it while the episode runs.
+    """
+
+    def __init__(self, prune, max_waves: int):
+        self.sum_before, self.done_before, self.episodes, self.target_wave, self.best = prune
+        self.max_waves = int(max_waves)
+
+    def __call__(self, p) -> Any:
+        best = float(self.best)
+        shared = _RESIDENT.get("bound")
+        if shared is not None:
+            best = min(best, float(shared.value))
+        if best == float("inf"):
+            return False
+        if _min_possible_score(self.sum_before, self.done_before + 1, self.episodes, self.max_waves,
+                               self.target_wave, running=p.waves_cleared) > best:
+            return "decided"
+        return False
+
+
+def _eval_episode_task(
+    genome_tup: Tuple[float, float, float, float, int, float, float, float],
+    seed: int,
+    max_waves: int,
+    tick_hz: float | None = None,
+    stop_at: int | None = None,
+    wall_budget_s: float | None = None,
+    prune: Tuple[float, int, int, float, float] | None = None,
+    diff: Dict[str, float] | None = None,
+    trajectory: bool = False,
+) -> Tuple[Any, ...]:
+    """One episode on the worker-resident DBs.
+
+    Returns (seed, waves, gold_end, lives_end, wall_s, cpu_s, stop_reason, ticks, worker id),
+    plus the per-wave trajectory dict as a last item when trajectory is set. stop_at ends
+    the episode once that many waves are cleared; wall_budget_s caps its wall time;
+    prune (random search) ends it with "decided" once its combo can't beat the best score.
+    diff overrides DifficultyConfig fields for this episode only (sensitivity analysis).
+    """
+    t0 = time.perf_counter()
+    c0 = time.process_time()
+    if _RESIDENT.get("genome") != genome_tup:
+        # consecutive tasks are usually the same genome: keep its profiled DBs
+        _RESIDENT["dbs"] = _RESIDENT["overlay"].apply(_to_profile(Genome(*genome_tup)))
+        _RESIDENT["genome"] = genome_tup
+    towers_db, enemies_db = _RESIDENT["dbs"]
+    pool = _RESIDENT["pool"]
+    prng = random.Random(int(seed) ^ 0x9E3779B1)
+
+    def roll_fn(n, rarity_bias=0.0):
+        return pool.roll(prng, n=n, rarity_bias=rarity_bias)
+
+    stop_fn = StopAtWaves(stop_at) if stop_at else None
+    if prune is not None:
+        stop_fn = _PruneStop(prune, max_waves)
+    prev_cfg = None
+    if diff:
+        from dataclasses import replace
+        from ..core import difficulty
+        prev_cfg = difficulty.set_config(replace(difficulty.CFG, **diff))
+    try:
+        res = run_episode(towers_db, enemies_db, roll_fn, seed=int(seed), max_waves=max_waves, tick_hz=tick_hz,
+                          stop_fn=stop_fn, wall_budget_s=wall_budget_s, trajectory=bool(trajectory))
+    finally:
+        if prev_cfg is not None:
+            difficulty.set_config(prev_cfg)
+    out = (int(seed), int(res.waves_cleared), int(res.gold_end), int(res.lives_end),
+           time.perf_counter() - t0, time.process_time() - c0, res.stop_reason, int(res.ticks),
+           _RESIDENT.get("worker", ""))
+    return out + (res.trajectory,) if trajectory else out
+
+
 # ------------------------------
 # Genetic algorithm tuner (v4.7.1)
 # ------------------------------
@@ -75,6 +183,17 @@ def _clamp(x: float, lo: float, hi: float) -> float:
     return lo if x < lo else (hi if x > hi else x)
 
 
+# Search box of each gene (matches _rand_genome); used to map genomes to the unit cube
+_GENOME_BOUNDS = (
+    (0.70, 1.30), (0.80, 1.25), (0.90, 1.15), (0.50, 1.80),
+    (-6.0, 10.0), (0.85, 1.25), (0.50, 1.30), (0.70, 1.40),
+)
+
+
+def _genome_unit(g: Genome) -> Tuple[float, ...]:
+    return tuple((float(v) - lo) / (hi - lo) for v, (lo, hi) in zip(g.as_tuple(), _GENOME_BOUNDS))
+
+
 def _rand_genome(rng: random.Random) -> Genome:
     return Genome(
         td=rng.uniform(0.70, 1.30),
@@ -147,10 +266,466 @@ def _score_mean(mean: float, target_wave: float) -> float:
     return abs(mean - target_wave) + (0.4 * max(0.0, mean - target_wave))
 
 
-def tune_ga(game, target: str = "humain_solide", episodes: int = 6, seed: int = 123) -> Dict[str, Any]:
+def _episode_budget_from_env() -> float | None:
+    try:
+        return float(os.environ.get("PATHFORGE_BALANCE_EPISODE_BUDGET_S", "0")) or None
+    except Exception:
+        return None
+
+
+def _prefilter_from_env(max_waves: int, dhash: str, tag: str, log_level: int = 1):
+    """(estimator, margin) when PATHFORGE_BALANCE_PREFILTER is on, else (None, 0).
+
+    Genomes whose analytical estimate (balance/estimate.py) is PATHFORGE_BALANCE_PREFILTER_MARGIN
+    waves (default 5) further from the target than the 3rd closest estimate so far are not simulated.
+    """
+    if str(os.environ.get("PATHFORGE_BALANCE_PREFILTER", "0")).strip().lower() not in ("1", "true", "yes", "on"):
+        return None, 0.0
+    from .estimate import estimator_for, load_calibration
+
+    margin = max(0.5, float(os.environ.get("PATHFORGE_BALANCE_PREFILTER_MARGIN", "5")))
+    calib = load_calibration()
+    est = estimator_for(max_waves, calib=calib)
+    if log_level:
+        if calib is None:
+            print(f"{tag} prefilter: no calibration saved, using defaults (run `python -m pathforge.balance estimate`)", flush=True)
+        elif calib.get("data") != dhash or int(calib.get("max_waves", max_waves)) != int(max_waves):
+            print(f"{tag} prefilter: calibration was fitted on other data/max_waves, consider re-running `estimate`", flush=True)
+        print(f"{tag} prefilter: reject estimates {margin:g}+ waves further from target than the 3rd best (eff={est.eff:.2f} growth={est.growth:.3f})", flush=True)
+    return est, margin
+
+
+class EpisodeEvaluator:
+    """Shared (genome, seed) episode evaluation for the tuners.
+
+    Runs episodes inline, on a local process pool (PATHFORGE_BALANCE_WORKERS>1) or on
+    remote workers (PATHFORGE_BALANCE_COORDINATOR=host:port), with a per-episode
+    in-memory cache backed by the persistent SQLite cache (balance/cache.py).
+
+    PATHFORGE_BALANCE_TRAJECTORY=1 also records each episode's per-wave trajectory
+    (kept in self.trajectories and in the cache rows) for offline re-scoring
+    (balance/rescore.py); cached rows without one are simulated again.
+
+    Throughput (episodes/sec, cache hit rate, worker utilization, slowest genomes) is
+    published by self.status (balance/status.py); tuners add their progress to it.
+    """
+
+    def __init__(self, game, episodes: int, max_waves: int, stop_at: int | None = None,
+                 wall_budget_s: float | None = None, log_level: int = 1, tag: str = "[BAL][GA]",
+                 shared_bound: bool = False):
+        self.game = game
+        self.episodes = int(episodes)
+        self.max_waves = int(max_waves)
+        self.stop_at = stop_at
+        # stopping at N cleared waves is the same episode as max_waves=N, cache rows share that key
+        self.cache_waves = min(self.max_waves, stop_at) if stop_at else self.max_waves
+        self.wall_budget_s = wall_budget_s
+        self.log_level = int(log_level)
+        self.tag = tag
+        self.busy_s = 0.0  # worker CPU seconds since the caller last reset it (utilization report)
+        self.stop_counts: Dict[str, int] = {}
+        self.episodes_run = 0
+        self.disk_hits = 0
+        # (genome, seed) whose episode failed (worker crash, broken pool, lost remote job) even
+        # after a retry: never cached, so a later prefill tries it again
+        self.failed: set = set()
+        self.keep_trajectories = str(os.environ.get("PATHFORGE_BALANCE_TRAJECTORY", "0")).strip().lower() in ("1", "true", "yes", "on")
+        self.trajectories: Dict[Tuple[Tuple[float, float, float, float, int, float, float, float], int], Dict[str, Any]] = {}
+
+        # Parallel evaluation (opt-in) --------------------------------------------
+        # Set PATHFORGE_BALANCE_WORKERS (or PATHFORGE_BALANCE_GA_WORKERS) to >1.
+        # Uses processes because pygame + simulation loops are CPU-bound and not thread-safe.
+        workers = int(os.environ.get("PATHFORGE_BALANCE_WORKERS", os.environ.get("PATHFORGE_BALANCE_GA_WORKERS", "1")))
+        self.workers = max(1, workers)
+        # genomes are simulated on the shipped DBs, not on the game's (which carry the saved profile)
+        self.towers_db, self.enemies_db, self.perks_db = base_dbs()
+        self.dhash = base_data_hash()
+        # Multi-node: PATHFORGE_BALANCE_COORDINATOR=host:port serves episode jobs to
+        # `python -m pathforge.balance worker --connect host:port` processes (balance/cluster.py)
+        coord_addr = str(os.environ.get("PATHFORGE_BALANCE_COORDINATOR", "")).strip()
+        self.executor = None
+        self._resident = False
+        # best score shared with pool workers so a running episode sees improvements made
+        # after it was submitted (remote workers only get the value at submit time)
+        self.bound = None
+        self._best = float("inf")
+        if shared_bound and not coord_addr:
+            import multiprocessing
+            self.bound = multiprocessing.Value("d", float("inf"))
+        if coord_addr:
+            from .cluster import Coordinator
+            self.executor = Coordinator(coord_addr, self.towers_db, self.enemies_db, self.perks_db, self.dhash,
+                                        log_level=log_level).start()
+        elif self.workers > 1:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_episode_worker,
+                                                initargs=(self.towers_db, self.enemies_db, self.perks_db, self.bound))
+
+        # In-memory cache, one entry per (genome, episode seed): racing promotes a genome to a
+        # longer seed prefix and only the new seeds get simulated.
+        self.cache: Dict[Tuple[Tuple[float, float, float, float, int, float, float, float], int], int] = {}
+        # budget-truncated results of the current prefill batch: read by evaluate(), never
+        # served as cached (their wave count depends on machine load)
+        self.partial: Dict[Tuple[Tuple[float, float, float, float, int, float, float, float], int], int] = {}
+
+        # Persistent per-episode cache shared by runs and workers (balance/cache.py)
+        self.disk = None
+        try:
+            from .cache import EvalCache, default_path
+            cpath = default_path()
+            if cpath:
+                self.disk = EvalCache(cpath, self.dhash, sim_key(), resolve_tick_hz(None))
+                if log_level:
+                    print(f"{tag} eval cache {cpath} (data={self.dhash[:10]} sim={sim_key()})", flush=True)
+        except Exception:
+            self.disk = None
+
+        from .status import TunerStatus, default_path as status_path, default_port
+        self.status = TunerStatus(tag, slots=self.slots, path=status_path(), port=default_port(), log_level=log_level)
+
+    @property
+    def slots(self) -> int:
+        return int(getattr(self.executor, "slots", self.workers)) if self.executor is not None else 1
+
+    def missing(self, genome: Genome, eval_seeds: list[int]) -> list[int]:
+        """Seeds of eval_seeds[:episodes] with no result yet (memory first, then disk)."""
+        gt = genome.as_tuple()
+        want = list(dict.fromkeys(int(s) for s in eval_seeds[:self.episodes]))
+        todo = [s for s in want if (gt, s) not in self.cache]
+        known = {}
+        if todo and self.disk is not None:
+            known = self.disk.get(gt, todo, self.cache_waves, with_trajectory=self.keep_trajectories)
+            for s, w in known.items():
+                self.cache[(gt, s)] = w
+            self.disk_hits += len(known)
+            todo = [s for s in todo if s not in known]
+        self.status.cache(len(want), mem_hits=len(want) - len(todo) - len(known), disk_hits=len(known))
+        return todo
+
+    def store(self, genome: Genome, seeds: list[int], waves: list[int]):
+        gt = genome.as_tuple()
+        for s, w in zip(seeds, waves):
+            self.cache[(gt, int(s))] = int(w)
+
+    def failures(self, genome: Genome, eval_seeds: list[int]) -> list[int]:
+        """Seeds of eval_seeds[:episodes] whose last attempt failed."""
+        gt = genome.as_tuple()
+        return [int(s) for s in eval_seeds[:self.episodes] if (gt, int(s)) in self.failed]
+
+    def evaluate(self, genome: Genome, eval_seeds: list[int]) -> Tuple[float, float, list[int]]:
+        """(mean, std, waves) over the seeds that ran; failed episodes are left out, not scored 0."""
+        gt = genome.as_tuple()
+        todo = [s for s in self.missing(genome, eval_seeds) if (gt, s) not in self.partial]
+        self.run([(genome, s, None) for s in todo], check_cache=False)
+        waves = []
+        for s in eval_seeds[:self.episodes]:
+            key = (gt, int(s))
+            if key in self.cache or key in self.partial:
+                waves.append(self.cache.get(key, self.partial.get(key)))
+        if not waves:
+            raise RuntimeError(f"{self.tag} every episode of {genome} failed")
+        mean = float(sum(waves) / max(1, len(waves)))
+        std = float(statistics.pstdev(waves)) if len(waves) >= 2 else 0.0
+        return mean, std, waves
+
+    @property
+    def best_bound(self) -> float:
+        return self._best
+
+    def set_bound(self, best_score: float):
+        """Tighten the pruning bound (never loosens it); pool and remote workers see it mid-episode."""
+        if float(best_score) >= self._best:
+            return
+        self._best = float(best_score)
+        if self.bound is not None:
+            self.bound.value = self._best
+        if hasattr(self.executor, "set_bound"):
+            self.executor.set_bound(self._best)
+
+    def prefill(self, genomes: list[Genome], eval_seeds: list[int]):
+        """Run missing episodes, one task per (genome, seed) on the pool (inline when serial).
+
+        Starts a new batch: truncated results of the previous one are dropped and re-run.
+        """
+        self.partial.clear()
+        self.run([(g, s, None) for g in dict.fromkeys(genomes) for s in self.missing(g, eval_seeds)], check_cache=False)
+
+    def run(self, tasks: list, check_cache: bool = True, on_result=None) -> list[Tuple[int, str]]:
+        """Run (genome, seed, prune[, diff]) tasks; returns (waves, stop_reason) per task, in order.
+
+        Cached episodes are not re-run (reason "cached"). Pruned ("decided") and
+        budget-truncated episodes are lower bounds: returned, but never cached. Episodes
+        with DifficultyConfig overrides (diff) bypass the caches, which key on the genome.
+        A failed episode is retried once in this process; if it fails again it comes back
+        as (None, "error") and is not cached. Raises when most of the tasks failed.
+        on_result(task index, waves, reason) is called as each simulated episode completes,
+        while the rest are still running (random search tightens the bound from it).
+        """
+        out: list = [None] * len(tasks)
+        todo = []
+        for i, (g, s, prune, *diff) in enumerate(tasks):
+            key = (g.as_tuple(), int(s))
+            if check_cache and not any(diff) and key in self.cache:
+                self.status.cache(1, mem_hits=1)
+                out[i] = (self.cache[key], "cached")
+            elif check_cache and not any(diff) and not self.missing(g, [s]):
+                out[i] = (self.cache[key], "cached")
+            else:
+                todo.append(i)
+        if not todo:
+            return out
+        self.status.slots = self.slots
+        rows: Dict[Genome, list] = {}
+
+        failed: Dict[int, str] = {}
+
+        def collect(i: int, res, err: str = "error"):
+            g, s, _, *diff = tasks[i]
+            custom = any(diff)
+            if res is None:
+                failed[i] = err
+                return
+            failed.pop(i, None)
+            self.failed.discard((g.as_tuple(), int(s)))
+            _, waves, gold, lives, wall_s, cpu_s, reason, ticks, worker, *traj = res
+            traj = traj[0] if traj else None
+            self.busy_s += cpu_s
+            self.episodes_run += 1
+            self.status.episode(g.as_tuple(), wall_s, cpu_s, ticks, worker, reason)
+            self.stop_counts[reason] = self.stop_counts.get(reason, 0) + 1
+            # a budget-truncated episode is only a lower bound: never persist it
+            if reason not in ("wall_budget", "tick_budget", "decided") and not custom:
+                rows.setdefault(g, []).append((s, waves, gold, lives, wall_s, traj))
+                if traj is not None:
+                    self.trajectories[(g.as_tuple(), int(s))] = traj
+            if reason in ("wall_budget", "tick_budget"):
+                if not custom:
+                    self.partial[(g.as_tuple(), int(s))] = int(waves)
+            elif reason != "decided" and not custom:
+                self.store(g, [s], [waves])
+            out[i] = (int(waves), reason)
+            if on_result is not None:
+                on_result(i, int(waves), reason)
+
+        args = (self.max_waves, None, self.stop_at, self.wall_budget_s)
+
+        def tail(diff):
+            # diff is positional before the trajectory flag
+            return [diff[0] if diff else None, True] if self.keep_trajectories else list(diff)
+
+        def prune_arg(prune):
+            # bake the current best into the task (the only bound remote workers see)
+            return None if prune is None else tuple(prune[:4]) + (min(float(prune[4]), self._best),)
+
+        def run_inline(idxs):
+            if not self._resident:
+                # serial: the same episode tasks run inline on DBs made resident here
+                _init_episode_worker(self.towers_db, self.enemies_db, self.perks_db, self.bound)
+                self._resident = True
+            for i in idxs:
+                g, s, prune, *diff = tasks[i]
+                try:
+                    collect(i, _eval_episode_task(g.as_tuple(), s, *args, prune_arg(prune), *tail(diff)))
+                except Exception as ex:
+                    collect(i, None, repr(ex))
+
+        if self.executor is None:
+            run_inline(todo)
+        else:
+            futs = {}
+            for i in todo:
+                try:
+                    futs[self.executor.submit(_eval_episode_task, tasks[i][0].as_tuple(), tasks[i][1], *args,
+                                              prune_arg(tasks[i][2]), *tail(tasks[i][3:]))] = i
+                except Exception as ex:
+                    collect(i, None, repr(ex))
+            for fut in as_completed(futs):
+                try:
+                    res = fut.result()
+                except Exception as ex:
+                    collect(futs[fut], None, repr(ex))
+                    continue
+                collect(futs[fut], res)
+        if failed:
+            # one retry here: a broken pool or a dropped remote job should not cost the episode
+            if self.log_level:
+                print(f"{self.tag} {len(failed)} episode(s) failed ({next(iter(failed.values()))}), retrying inline", flush=True)
+            run_inline(list(failed))
+        if self.disk is not None:
+            for g, r in rows.items():
+                self.disk.put(g.as_tuple(), self.cache_waves, r)
+        if failed:
+            for i in failed:
+                self.failed.add((tasks[i][0].as_tuple(), int(tasks[i][1])))
+                out[i] = (None, "error")
+            self.stop_counts["error"] = self.stop_counts.get("error", 0) + len(failed)
+            err = next(iter(failed.values()))
+            if 2 * len(failed) > len(tasks):
+                raise RuntimeError(f"{self.tag} {len(failed)}/{len(tasks)} episodes failed: {err}")
+            if self.log_level:
+                print(f"{self.tag} {len(failed)} episode(s) failed twice, left unscored: {err}", flush=True)
+        return out
+
+    def report_utilization(self, label: str, wall_s: float):
+        slots = self.slots
+        util = self.busy_s / max(1e-9, slots * wall_s)
+        print(f"{self.tag} {label} cpu={100.0 * util:.0f}% ({self.busy_s:.1f}s busy / {slots}x{wall_s:.1f}s)", flush=True)
+
+    def close(self):
+        """Stop the pool/coordinator; later evaluations run inline."""
+        if self.executor is not None:
+            try:
+                self.executor.shutdown(wait=True, cancel_futures=False)
+            except TypeError:
+                # Python <3.9 doesn't support cancel_futures
+                self.executor.shutdown(wait=True)
+            self.executor = None
+        if self.disk is not None and self.log_level:
+            print(f"{self.tag} eval cache: {self.disk_hits} episodes served from disk", flush=True)
+        self.status.close()
+
+
+def _race_rungs(episodes: int, first: int, eta: float) -> list[int]:
+    """Seed-prefix lengths for racing, e.g. episodes=6 -> [2, 4, 6]."""
+    out = []
+    k = max(1, min(int(first), int(episodes)))
+    while k < episodes:
+        out.append(k)
+        k = max(k + 1, int(math.ceil(k * eta)))
+    out.append(int(episodes))
+    return out
+
+
+def _score_bounds(mean: float, std: float, n: int, target_wave: float, max_waves: int, z: float = 1.64) -> Tuple[float, float]:
+    """Confidence interval on the GA score given n episodes (mean ± z·sd/√n, sd floored at one wave)."""
+    hw = z * max(1.0, std) / math.sqrt(max(1, n))
+    lo = max(0.0, mean - hw)
+    hi = min(float(max_waves), mean + hw)
+    if hi < lo:
+        lo = hi = mean
+    # the score is piecewise-linear in the mean with its minimum at target_wave
+    best = _score_mean(min(max(float(target_wave), lo), hi), target_wave)
+    worst = max(_score_mean(lo, target_wave), _score_mean(hi, target_wave))
+    pen = 0.12 * std
+    return best + pen, worst + pen
+
+
+def _ranks(xs) -> list[float]:
+    """1-based ranks, ties share their average rank."""
+    order = sorted(range(len(xs)), key=lambda i: xs[i])
+    r = [0.0] * len(xs)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and xs[order[j + 1]] == xs[order[i]]:
+            j += 1
+        avg = (i + j) / 2.0 + 1.0
+        for k in range(i, j + 1):
+            r[order[k]] = avg
+        i = j + 1
+    return r
+
+
+def _spearman(a, b) -> float:
+    """Spearman rank correlation of two paired samples (resolution study, estimator validation).
+
+    Two constant rankings agree (1.0); when only one side is constant there is no
+    correlation to measure (0.0).
+    """
+    ra, rb = _ranks(a), _ranks(b)
+    ma, mb = statistics.fmean(ra) if ra else 0.0, statistics.fmean(rb) if rb else 0.0
+    va = sum((x - ma) ** 2 for x in ra)
+    vb = sum((y - mb) ** 2 for y in rb)
+    if va <= 0 or vb <= 0:
+        return 1.0 if va <= 0 and vb <= 0 else 0.0
+    return float(sum((x - ma) * (y - mb) for x, y in zip(ra, rb)) / math.sqrt(va * vb))
+
+
+def _checkpoint_path() -> str:
+    return os.environ.get("PATHFORGE_BALANCE_CHECKPOINT", "").strip() or PROFILE_FILE.replace(".json", "_ga_checkpoint.json")
+
+
+def _rng_state_to_json(state) -> list:
+    version, internal, gauss = state
+    return [version, list(internal), gauss]
+
+
+def _rng_state_from_json(data) -> tuple:
+    return (int(data[0]), tuple(int(x) for x in data[1]), data[2])
+
+
+def _write_checkpoint(path: str, state: Dict[str, Any]):
+    """Atomic: write a sibling temp file, fsync, then rename over the previous checkpoint."""
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _write_profile(profile: Dict[str, Any], target_wave: float, seed_mode: str, log_level: int = 1):
+    """Write balance_profile.json and the markdown summary next to it (profile["meta"] filled in)."""
+    meta = profile.get("meta", {})
+    mean, std, waves = meta.get("mean_waves", 0.0), meta.get("std_waves", 0.0), meta.get("samples", [])
+    os.makedirs(os.path.dirname(PROFILE_FILE), exist_ok=True)
+    with open(PROFILE_FILE, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2)
+
+    # richer markdown report
+    try:
+        md_path = PROFILE_FILE.replace(".json", ".md")
+        from ..core.difficulty import CFG
+
+        lines = []
+        lines.append("# Pathforge Balance Profile\n\n")
+        lines.append(f"- Algo: **{meta.get('algo', 'GA')}**\n")
+        lines.append(f"- Target: **{meta.get('target')}** (target_mean≈{target_wave})\n")
+        lines.append(f"- Episodes: **{meta.get('episodes')}** (seed_mode={seed_mode})\n")
+        lines.append(f"- Max waves: **{meta.get('max_waves')}**\n")
+        if meta.get("evals"):
+            lines.append(f"- Candidates evaluated: **{meta.get('evals')}** ({meta.get('episodes_run')} episodes simulated)\n")
+        lines.append(f"- Result mean waves: **{mean:.2f}** (std={std:.2f})\n")
+        lines.append(f"- Samples: `{waves}`\n")
+        if waves:
+            lines.append(f"- min/median/max: **{min(waves)} / {statistics.median(waves)} / {max(waves)}**\n")
+        lines.append("\n## Multipliers\n")
+        lines.append("### Towers\n")
+        lines.append(f"- damage_mul: `{profile['tower'].get('damage_mul')}`\n")
+        lines.append(f"- rate_mul: `{profile['tower'].get('rate_mul')}`\n")
+        lines.append(f"- range_mul: `{profile['tower'].get('range_mul')}`\n")
+        lines.append(f"- cost_mul: `{profile['tower'].get('cost_mul')}`\n")
+        lines.append("\n### Enemies\n")
+        lines.append(f"- hp_mul: `{profile['enemy'].get('hp_mul')}`\n")
+        lines.append(f"- armor_add: `{profile['enemy'].get('armor_add')}`\n")
+        lines.append(f"- speed_mul: `{profile['enemy'].get('speed_mul')}`\n")
+        lines.append(f"- regen_mul: `{profile['enemy'].get('regen_mul')}`\n")
+        lines.append(f"- shield_mul: `{profile['enemy'].get('shield_mul')}`\n")
+        lines.append("\n## Difficulty Curves (baseline v4.7.0)\n")
+        lines.append(f"- hp_slope_pre10: `{CFG.hp_slope_pre10}` | hp_slope_post10: `{CFG.hp_slope_post10}`\n")
+        lines.append(f"- shield_base_factor: `{CFG.shield_base_factor}` | shield_slope_pre10: `{CFG.shield_slope_pre10}` | shield_slope_post10: `{CFG.shield_slope_post10}`\n")
+        lines.append(f"- armor_mul_w1_5: `{CFG.armor_mul_w1_5}` | elite_shield_mul_w1_5: `{CFG.elite_shield_mul_w1_5}`\n")
+        lines.append(f"- shield caps (pct HP): default `{CFG.shield_cap_pct_default}`, elite `{CFG.shield_cap_pct_elite}`, boss `{CFG.shield_cap_pct_boss}`\n")
+
+        with open(md_path, "w", encoding="utf-8") as mf:
+            mf.write("".join(lines))
+        if log_level:
+            print(f"[BAL] wrote summary {md_path}", flush=True)
+    except Exception:
+        pass
+
+
+
+def tune_ga(game, target: str = "humain_solide", episodes: int = 6, seed: int = 123, resume: bool = False) -> Dict[str, Any]:
     """Genetic algorithm tuner.
 
     Focus: wide search, occasional big jumps, mild stability penalty.
+
+    A checkpoint is written atomically after every generation (population, RNG state,
+    per-episode cache, best-so-far, seed schedule). resume=True continues from it and
+    produces the same run as an uninterrupted one with the same settings.
     """
     rng = random.Random(seed)
     log_level = int(os.environ.get("PATHFORGE_BALANCE_LOG", "1"))
@@ -159,11 +734,39 @@ def tune_ga(game, target: str = "humain_solide", episodes: int = 6, seed: int =
 
     target_wave = 20 if target == "humain_solide" else 12
 
+    # Early abort: past target_wave + margin the exact wave count hardly moves the ranking,
+    # so episodes stop there (PATHFORGE_BALANCE_GA_STOP_MARGIN, unset = play to max_waves).
+    # PATHFORGE_BALANCE_EPISODE_BUDGET_S caps one episode's wall time (truncated result).
+    stop_at = None
+    try:
+        margin = os.environ.get("PATHFORGE_BALANCE_GA_STOP_MARGIN", "").strip()
+        if margin:
+            stop_at = int(target_wave + max(0, int(margin)))
+            if stop_at >= max_waves:
+                stop_at = None
+    except Exception:
+        stop_at = None
+    # stopping at N cleared waves is the same episode as max_waves=N, cache rows share that key
+    cache_waves = min(max_waves, stop_at) if stop_at else max_waves
+    wall_budget_s = _episode_budget_from_env()
+
     pop_n = int(os.environ.get("PATHFORGE_BALANCE_GA_POP", "26"))
     gens = int(os.environ.get("PATHFORGE_BALANCE_GA_GENS", "18"))
     elitism = int(os.environ.get("PATHFORGE_BALANCE_GA_ELITE", "4"))
     reseed_frac = float(os.environ.get("PATHFORGE_BALANCE_GA_RESEED", "0.12"))
 
+    # Adaptive episode counts (PATHFORGE_BALANCE_GA_ADAPTIVE=1, replaces racing): every genome
+    # starts with ADAPT_MIN seeds and gets one more per round only while its confidence interval
+    # still overlaps the best one's, until ADAPT_MAX (default `episodes`). A genome whose
+    # mean-waves interval already sits inside target ± ADAPT_BAND stops too.
+    adaptive = str(os.environ.get("PATHFORGE_BALANCE_GA_ADAPTIVE", "0")).strip().lower() in ("1", "true", "yes", "on")
+    adapt_min = max(1, int(os.environ.get("PATHFORGE_BALANCE_GA_ADAPT_MIN", "2")))
+    adapt_max = max(adapt_min, int(os.environ.get("PATHFORGE_BALANCE_GA_ADAPT_MAX", str(episodes))))
+    adapt_z = float(os.environ.get("PATHFORGE_BALANCE_GA_ADAPT_Z", "1.64"))
+    adapt_band = float(os.environ.get("PATHFORGE_BALANCE_GA_ADAPT_BAND", "1.0"))
+    if adaptive:
+        episodes = adapt_max
+
     # Episode seed schedule -----------------------------------------------------
     # By default we use *fixed* episode seeds shared by all candidates.
     # This massively reduces evaluation noise ("common random numbers").
@@ -185,32 +788,12 @@ def tune_ga(game, target: str = "humain_solide", episodes: int = 6, seed: int =
             return s
         return list(base_eval_seeds)
 
-    # Parallel evaluation (opt-in) ------------------------------------------------
-    # Set PATHFORGE_BALANCE_WORKERS (or PATHFORGE_BALANCE_GA_WORKERS) to >1.
-    # Uses processes because pygame + simulation loops are CPU-bound and not thread-safe.
-    workers = int(os.environ.get("PATHFORGE_BALANCE_WORKERS", os.environ.get("PATHFORGE_BALANCE_GA_WORKERS", "1")))
-    workers = max(1, workers)
-    perks_db = json.loads(json.dumps(getattr(game.perk_pool, "perks", [])))
-    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
-
-    cache: Dict[Tuple[Tuple[float, float, float, float, int, float, float, float], Tuple[int, ...]], Tuple[float, float, list[int]]] = {}
-
-    def evaluate(genome: Genome, eval_seeds: list[int]) -> Tuple[float, float, list[int]]:
-        key = (genome.as_tuple(), tuple(eval_seeds[:episodes]))
-        if key in cache:
-            return cache[key]
-
-        mean, std, waves = _eval_genome_worker(
-            genome.as_tuple(),
-            game.towers_db,
-            game.enemies_db,
-            perks_db,
-            eval_seeds,
-            episodes,
-            max_waves,
-        )
-        cache[key] = (mean, std, waves)
-        return cache[key]
+    ev = EpisodeEvaluator(game, episodes, max_waves, stop_at=stop_at, wall_budget_s=wall_budget_s, log_level=log_level)
+    dhash = ev.dhash
+    cache = ev.cache
+    stop_counts = ev.stop_counts
+    evaluate = ev.evaluate
+    prefill = ev.prefill
 
     def fitness(genome: Genome, eval_seeds: list[int]) -> Tuple[float, float, float, list[int]]:
         mean, std, waves = evaluate(genome, eval_seeds)
@@ -219,92 +802,298 @@ def tune_ga(game, target: str = "humain_solide", episodes: int = 6, seed: int =
         sc2 = sc + 0.12 * std
         return sc2, mean, std, waves
 
+    # Racing / successive halving (PATHFORGE_BALANCE_GA_RACE=0 restores full evaluation)
+    race = not adaptive and str(os.environ.get("PATHFORGE_BALANCE_GA_RACE", "1")).strip().lower() not in ("0", "false", "no", "off")
+    race_min = max(1, int(os.environ.get("PATHFORGE_BALANCE_GA_RACE_MIN", "2")))
+    race_eta = max(1.5, float(os.environ.get("PATHFORGE_BALANCE_GA_RACE_ETA", "2")))
+    race_z = float(os.environ.get("PATHFORGE_BALANCE_GA_RACE_Z", "1.64"))
+    race_work = 0
+    race_full = 0
+
+    # Surrogate pre-screening (opt-in): a GP trained on every simulated genome predicts
+    # bred children; only the most promising/uncertain share is simulated.
+    surrogate = None
+    if str(os.environ.get("PATHFORGE_BALANCE_GA_SURROGATE", "0")).strip().lower() in ("1", "true", "yes", "on", "gp"):
+        from .surrogate import GPSurrogate
+        surrogate = GPSurrogate(max_points=int(os.environ.get("PATHFORGE_BALANCE_GA_SURR_POINTS", "160")))
+    surr_frac = _clamp(float(os.environ.get("PATHFORGE_BALANCE_GA_SURR_FRAC", "0.3")), 0.05, 1.0)
+    surr_min = int(os.environ.get("PATHFORGE_BALANCE_GA_SURR_MIN", str(max(12, pop_n))))
+    surr_kappa = float(os.environ.get("PATHFORGE_BALANCE_GA_SURR_KAPPA", "1.0"))
+    train: Dict[Genome, float] = {}  # genome -> mean waves over the longest seed prefix simulated
+    elite_set: set = set()
+    surr_sims = 0
+    surr_preds = 0
+
+    # Analytical pre-filter (opt-in, PATHFORGE_BALANCE_PREFILTER=1): random and bred genomes
+    # whose DPS-vs-EHP estimate is hopelessly far from the target are redrawn (up to
+    # PATHFORGE_BALANCE_PREFILTER_TRIES draws) before anything is simulated.
+    est, est_margin = _prefilter_from_env(max_waves, dhash, "[BAL][GA]", log_level)
+    est_tries = max(1, int(os.environ.get("PATHFORGE_BALANCE_PREFILTER_TRIES", "8")))
+    est_rejects = 0
+
+    def viable(make) -> Genome:
+        nonlocal est_rejects
+        g = make()
+        for _ in range(est_tries - 1):
+            if est is None or not est.hopeless(g, target_wave, est_margin):
+                break
+            est_rejects += 1
+            g = make()
+        return g
+
     # Init population
-    pop: list[Genome] = [_rand_genome(rng) for _ in range(pop_n)]
+    pop: list[Genome] = [viable(lambda: _rand_genome(rng)) for _ in range(pop_n)]
 
     best_g = None
     best_score = 1e18
     best_meta = None
 
+    # Checkpoint / resume ---------------------------------------------------------
+    ckpt_path = _checkpoint_path()
+    settings = {
+        "target": target, "episodes": int(episodes), "seed": int(seed), "max_waves": int(max_waves),
+        "pop": pop_n, "elite": elitism, "reseed": reseed_frac, "seed_mode": seed_mode,
+        "race": [race, race_min, race_eta, race_z],
+        "surrogate": [surr_frac, surr_min, surr_kappa, surrogate.max_points] if surrogate is not None else False,
+        "prefilter": [est_margin, est_tries, est.eff, est.growth] if est is not None else False,
+        "adaptive": [adaptive, adapt_min, adapt_max, adapt_z, adapt_band] if adaptive else False,
+        "stop_at": stop_at, "tick_hz": resolve_tick_hz(None), "sim": sim_key(),
+        "data": dhash,
+    }
+    start_gen = 1
+    if resume:
+        try:
+            with open(ckpt_path, "r", encoding="utf-8") as f:
+                ck = json.load(f)
+            if ck.get("settings") != json.loads(json.dumps(settings)):
+                raise ValueError(f"settings differ: {ck.get('settings')} != {settings}")
+            if list(ck.get("base_eval_seeds", [])) != list(base_eval_seeds):
+                raise ValueError("seed schedule differs")
+            rng.setstate(_rng_state_from_json(ck["rng"]))
+            pop = [Genome(*t) for t in ck["pop"]]
+            for gt, sd, w in ck["cache"]:
+                cache[(tuple(gt), int(sd))] = int(w)
+            train.clear()
+            for gt, m in ck.get("train", []):
+                train[Genome(*gt)] = float(m)
+            elite_set = {Genome(*t) for t in ck.get("elite", [])}
+            if ck.get("best") is not None:
+                best_g = Genome(*ck["best"])
+                best_score = float(ck["best_score"])
+                best_meta = ck.get("best_meta")
+            race_work, race_full = int(ck["counters"]["race_work"]), int(ck["counters"]["race_full"])
+            surr_sims, surr_preds = int(ck["counters"]["surr_sims"]), int(ck["counters"]["surr_preds"])
+            est_rejects = int(ck["counters"].get("est_rejects", 0))
+            stop_counts.update(ck["counters"].get("stops", {}))
+            start_gen = int(ck["gen"]) + 1
+            if log_level:
+                print(f"[BAL][GA] resumed {ckpt_path} after gen {ck['gen']} (best={best_score:.3f}, {len(cache)} cached episodes)", flush=True)
+        except FileNotFoundError:
+            if log_level:
+                print(f"[BAL][GA] no checkpoint at {ckpt_path}, starting fresh", flush=True)
+        except Exception as ex:
+            raise SystemExit(f"[BAL][GA] cannot resume from {ckpt_path}: {ex}")
+
+    def save_checkpoint(gen: int):
+        state = {
+            "version": 1,
+            "gen": gen,
+            "settings": settings,
+            "base_eval_seeds": list(base_eval_seeds),
+            "rng": _rng_state_to_json(rng.getstate()),
+            "pop": [list(g.as_tuple()) for g in pop],
+            "cache": [[list(gt), sd, w] for (gt, sd), w in cache.items()],
+            "train": [[list(g.as_tuple()), m] for g, m in train.items()],
+            "elite": [list(g.as_tuple()) for g in elite_set],
+            "best": list(best_g.as_tuple()) if best_g is not None else None,
+            "best_score": best_score,
+            "best_meta": best_meta,
+            "counters": {"race_work": race_work, "race_full": race_full, "surr_sims": surr_sims,
+                         "surr_preds": surr_preds, "est_rejects": est_rejects, "stops": stop_counts},
+        }
+        try:
+            _write_checkpoint(ckpt_path, state)
+        except Exception as ex:
+            if log_level:
+                print(f"[BAL][GA] checkpoint failed: {ex}", flush=True)
+
     try:
-        for gen in range(1, gens + 1):
+        for gen in range(start_gen, gens + 1):
             eval_seeds = _eval_seeds_for_gen(gen)
+            t_gen = time.perf_counter()
+            ev.busy_s = 0.0
             if log_level and gen == 1:
                 print(f"[BAL][GA] eval_seeds(mode={seed_mode})={eval_seeds[:episodes]}", flush=True)
-            # Pre-evaluate genomes in parallel (fills cache). This keeps the rest of the GA code unchanged.
-            if executor is not None:
-                todo = [g for g in pop if (g.as_tuple(), tuple(eval_seeds[:episodes])) not in cache]
-                if todo:
-                    futs = {
-                        executor.submit(
-                            _eval_genome_worker,
-                            g.as_tuple(),
-                            game.towers_db,
-                            game.enemies_db,
-                            perks_db,
-                            eval_seeds,
-                            episodes,
-                            max_waves,
-                        ): g
-                        for g in todo
-                    }
-                    for fut in as_completed(futs):
-                        g = futs[fut]
-                        try:
-                            mean, std, waves = fut.result()
-                        except Exception:
-                            mean, std, waves = 0.0, 0.0, [0] * int(episodes)
-                        cache[(g.as_tuple(), tuple(eval_seeds[:episodes]))] = (mean, std, waves)
-
-            scored = []
-            for g in pop:
-                sc, mean, std, waves = fitness(g, eval_seeds)
-                scored.append((sc, mean, std, waves, g))
-            scored.sort(key=lambda x: x[0])
-
-            if scored and scored[0][0] < best_score:
-                best_score = scored[0][0]
-                best_g = scored[0][4]
-                best_meta = {"mean": scored[0][1], "std": scored[0][2], "waves": scored[0][3], "gen": gen}
+            # Surrogate screen: elites and genomes this run already scored (train) always go
+            # through; among the new children, keep the best optimistic predicted scores,
+            # predict the rest. The eval cache plays no part here (a warm rerun must evolve
+            # the same way), it only makes simulating the kept ones cheaper.
+            predicted: Dict[Genome, Tuple[float, float]] = {}
+            if surrogate is not None and len(train) >= surr_min:
+                cands = [g for g in dict.fromkeys(pop) if g not in elite_set and g not in train]
+                if len(cands) > 1:
+                    tg = list(train.keys())
+                    surrogate.fit([_genome_unit(g) for g in tg], [train[g] for g in tg])
+                    preds = {g: surrogate.predict(_genome_unit(g)) for g in cands}
+
+                    def optimistic(g: Genome) -> float:
+                        mu, sd = preds[g]
+                        lo, hi = mu - surr_kappa * sd, mu + surr_kappa * sd
+                        return _score_mean(min(max(float(target_wave), lo), hi), target_wave)
+
+                    order = sorted(cands, key=optimistic)
+                    n_real = max(1, int(math.ceil(surr_frac * len(order))))
+                    for g in order[n_real:]:
+                        predicted[g] = preds[g]
+                    surr_sims += n_real
+                    surr_preds += len(predicted)
+                    if log_level:
+                        print(f"[BAL][GA] surrogate gen {gen:02d}: {len(order)} new -> {n_real} simulated, {len(predicted)} predicted (n={surrogate.n})", flush=True)
+
+            # Racing: every candidate starts on a short seed prefix; those whose score is
+            # already worse (with confidence) than the keep-th best stop there, the rest are
+            # promoted to longer prefixes until the full `episodes` set.
+            alive = [g for g in pop if g not in predicted]
+            out: list = []  # eliminated: (rung, sc, mean, std, waves, g)
+            rungs = _race_rungs(episodes, race_min, race_eta) if race else [episodes]
+            if adaptive:
+                rungs = []
+                res: Dict[Genome, Tuple[float, float, float, list[int]]] = {}
+                open_ = list(dict.fromkeys(alive))
+                k, prev = min(adapt_min, episodes), 0
+                while open_:
+                    seeds_k = eval_seeds[:k]
+                    prefill(open_, seeds_k)
+                    for g in open_:
+                        res[g] = fitness(g, seeds_k)
+                    race_work += len(open_) * (k - prev)
+                    if k >= episodes:
+                        break
+                    bounds = {g: _score_bounds(r[1], r[2], len(r[3]), target_wave, cache_waves, adapt_z) for g, r in res.items()}
+                    ref_hi = min(hi for _, hi in bounds.values())
+                    if best_g is not None:
+                        ref_hi = min(ref_hi, best_score)
+                    nxt = []
+                    for g in open_:
+                        lo, hi = bounds[g]
+                        _, mean, std, waves = res[g]
+                        others_lo = min((b[0] for h, b in bounds.items() if h != g), default=float("inf"))
+                        hw = adapt_z * max(1.0, std) / math.sqrt(len(waves))
+                        in_band = target_wave - adapt_band <= mean - hw and mean + hw <= target_wave + adapt_band
+                        # undecided: neither clearly worse than the best, clearly ahead of the rest, nor settled on target
+                        if not (lo > ref_hi or hi < others_lo or in_band):
+                            nxt.append(g)
+                    open_ = nxt
+                    prev, k = k, k + 1
+                scored = sorted((res[g] + (g,) for g in alive), key=lambda x: x[0])
+                full = len(res) * episodes
+                race_full += full
+                if log_level:
+                    used = sum(len(r[3]) for r in res.values())
+                    print(f"[BAL][GA] adaptive gen {gen:02d}: {used}/{full} episodes ({full - used} saved, "
+                          f"{sum(1 for r in res.values() if len(r[3]) >= episodes)}/{len(res)} at max)", flush=True)
+            for ri, k in enumerate(rungs):
+                seeds_k = eval_seeds[:k]
+                prefill(alive, seeds_k)
+                rs = []
+                for g in alive:
+                    sc, mean, std, waves = fitness(g, seeds_k)
+                    rs.append((sc, mean, std, waves, g))
+                rs.sort(key=lambda x: x[0])
+                race_work += len(alive) * (k - (rungs[ri-1] if ri else 0))
+                if k >= episodes:
+                    alive = [x[4] for x in rs]
+                    scored = rs
+                    break
+                keep = max(1, elitism, int(math.ceil(len(rs) / float(race_eta))))
+                bounds = [_score_bounds(x[1], x[2], k, target_wave, cache_waves, race_z) for x in rs]
+                cut = max(hi for _, hi in bounds[:keep])
+                nxt = []
+                for i, x in enumerate(rs):
+                    if i < keep or bounds[i][0] <= cut:
+                        nxt.append(x[4])
+                    else:
+                        out.append((k,) + x)
+                if log_level >= 2:
+                    print(f"[BAL][GA]   race gen {gen:02d} rung {k}/{episodes} eps: {len(rs)} -> {len(nxt)}", flush=True)
+                alive = nxt
+            if not adaptive:
+                race_full += len(pop) * episodes
+            if race and log_level:
+                print(f"[BAL][GA] race gen {gen:02d}: {len(pop)} -> {len(scored)} full, {len(out)} stopped early", flush=True)
+            if ev.executor is not None and log_level:
+                ev.report_utilization(f"gen {gen:02d}", time.perf_counter() - t_gen)
+
+            if surrogate is not None:
+                for x in scored:
+                    train[x[4]] = x[1]
+                for x in out:
+                    train.setdefault(x[5], x[2])
+                if log_level >= 2 and predicted:
+                    errs = [abs(surrogate.predict(_genome_unit(x[4]))[0] - x[1]) for x in scored if x[4] not in elite_set]
+                    if errs:
+                        print(f"[BAL][GA]   surrogate |err| on simulated children: {sum(errs) / len(errs):.2f} waves", flush=True)
+
+            # predicted children compete on their predicted score (flagged: they never become
+            # best or elite); eliminated candidates rank behind (later rung first, then score)
+            if predicted:
+                scored = scored + [(_score_mean(mu, target_wave), mu, sd, [], g) for g, (mu, sd) in predicted.items()]
+                scored.sort(key=lambda x: x[0])
+            out.sort(key=lambda x: (-x[0], x[1]))
+            scored = scored + [x[1:] for x in out]
+            real = [x for x in scored if x[4] not in predicted]
+
+            if real and real[0][0] < best_score:
+                best_score = real[0][0]
+                best_g = real[0][4]
+                best_meta = {"mean": real[0][1], "std": real[0][2], "waves": real[0][3], "gen": gen}
                 if log_level:
                     print(f"[BAL][GA] NEW BEST gen={gen} score={best_score:.3f} mean={best_meta['mean']:.2f} std={best_meta['std']:.2f} {best_g}", flush=True)
 
             if log_level:
                 top = scored[:min(3, len(scored))]
-                tmsg = " | ".join([f"{i+1}:{t[0]:.2f} m={t[1]:.1f} sd={t[2]:.1f}" for i, t in enumerate(top)])
+                tmsg = " | ".join([f"{i+1}:{t[0]:.2f}{'*' if t[4] in predicted else ''} m={t[1]:.1f} sd={t[2]:.1f}" for i, t in enumerate(top)])
                 print(f"[BAL][GA] gen {gen:02d}/{gens:02d} best={best_score:.3f} :: {tmsg}", flush=True)
+            ev.status.update(algo="GA", target_wave=target_wave, gen=gen, gens=gens, best_score=best_score,
+                             gen_wall_s=round(time.perf_counter() - t_gen, 2))
 
-            # Selection (tournament)
+            # Selection (tournament) on rank: partial-rung scores aren't comparable to full ones
             def tournament(k: int = 4) -> Genome:
-                cand = [scored[rng.randrange(0, len(scored))] for _ in range(k)]
-                cand.sort(key=lambda x: x[0])
-                return cand[0][4]
+                return scored[min(rng.randrange(0, len(scored)) for _ in range(k))][4]
 
             next_pop: list[Genome] = []
-            # Elitism
-            for _, _, _, _, g in scored[:max(1, elitism)]:
+            # Elitism (simulated genomes only)
+            for _, _, _, _, g in real[:max(1, elitism)]:
                 next_pop.append(g)
+            elite_set = set(next_pop)
 
             # Breed
-            while len(next_pop) < pop_n:
-                if rng.random() < reseed_frac:
-                    next_pop.append(_rand_genome(rng))
-                    continue
+            def breed() -> Genome:
                 a = tournament()
                 b = tournament()
                 child = _crossover(a, b, rng)
                 if rng.random() < 0.90:
                     child = _mutate(child, rng)
-                next_pop.append(child)
+                return child
+
+            while len(next_pop) < pop_n:
+                if rng.random() < reseed_frac:
+                    next_pop.append(viable(lambda: _rand_genome(rng)))
+                    continue
+                next_pop.append(viable(breed))
             pop = next_pop
+            save_checkpoint(gen)
 
     finally:
-        if executor is not None:
-            try:
-                executor.shutdown(wait=True, cancel_futures=False)
-            except TypeError:
-                # Python <3.9 doesn't support cancel_futures
-                executor.shutdown(wait=True)
+        ev.close()
+        if log_level and (stop_at or wall_budget_s):
+            print(f"[BAL][GA] episode stops (stop_at={stop_at} budget={wall_budget_s}): {stop_counts}", flush=True)
+        if surrogate is not None and log_level and (surr_sims or surr_preds):
+            print(f"[BAL][GA] surrogate: {surr_sims} children simulated, {surr_preds} predicted", flush=True)
+        if est is not None and log_level:
+            print(f"[BAL][GA] prefilter: {est_rejects} hopeless genomes redrawn before simulation", flush=True)
+        if (race or adaptive) and log_level and race_full:
+            print(f"[BAL][GA] {'adaptive' if adaptive else 'race'}: {race_work}/{race_full} episode slots evaluated ({100.0 * race_work / race_full:.0f}%)", flush=True)
 
     assert best_g is not None
     profile = _to_profile(best_g)
@@ -323,65 +1112,125 @@ def tune_ga(game, target: str = "humain_solide", episodes: int = 6, seed: int =
         "best_score": best_score,
         "gen": (best_meta or {}).get("gen"),
     }
+    _write_profile(profile, target_wave, seed_mode, log_level)
 
-    os.makedirs(os.path.dirname(PROFILE_FILE), exist_ok=True)
-    with open(PROFILE_FILE, "w", encoding="utf-8") as f:
-        json.dump(profile, f, indent=2)
+    return profile
 
-    # richer markdown report
-    try:
-        md_path = PROFILE_FILE.replace(".json", ".md")
-        from ..core.difficulty import CFG
+def _genome_from_unit(u) -> Genome:
+    v = [lo + _clamp(float(x), 0.0, 1.0) * (hi - lo) for x, (lo, hi) in zip(u, _GENOME_BOUNDS)]
+    return Genome(td=v[0], tr=v[1], tc=v[2], eh=v[3], aa=int(round(v[4])), es=v[5], er=v[6], sh=v[7])
 
-        lines = []
-        lines.append("# Pathforge Balance Profile\n\n")
-        lines.append(f"- Algo: **GA**\n")
-        lines.append(f"- Target: **{target}** (target_mean≈{target_wave})\n")
-        lines.append(f"- Episodes: **{episodes}** (seed_mode={seed_mode})\n")
-        lines.append(f"- Max waves: **{max_waves}**\n")
-        lines.append(f"- Result mean waves: **{mean:.2f}** (std={std:.2f})\n")
-        lines.append(f"- Samples: `{waves}`\n")
-        if waves:
-            lines.append(f"- min/median/max: **{min(waves)} / {statistics.median(waves)} / {max(waves)}**\n")
-        lines.append("\n## Multipliers\n")
-        lines.append("### Towers\n")
-        lines.append(f"- damage_mul: `{profile['tower'].get('damage_mul')}`\n")
-        lines.append(f"- rate_mul: `{profile['tower'].get('rate_mul')}`\n")
-        lines.append(f"- range_mul: `{profile['tower'].get('range_mul')}`\n")
-        lines.append(f"- cost_mul: `{profile['tower'].get('cost_mul')}`\n")
-        lines.append("\n### Enemies\n")
-        lines.append(f"- hp_mul: `{profile['enemy'].get('hp_mul')}`\n")
-        lines.append(f"- armor_add: `{profile['enemy'].get('armor_add')}`\n")
-        lines.append(f"- speed_mul: `{profile['enemy'].get('speed_mul')}`\n")
-        lines.append(f"- regen_mul: `{profile['enemy'].get('regen_mul')}`\n")
-        lines.append(f"- shield_mul: `{profile['enemy'].get('shield_mul')}`\n")
-        lines.append("\n## Difficulty Curves (baseline v4.7.0)\n")
-        lines.append(f"- hp_slope_pre10: `{CFG.hp_slope_pre10}` | hp_slope_post10: `{CFG.hp_slope_post10}`\n")
-        lines.append(f"- shield_base_factor: `{CFG.shield_base_factor}` | shield_slope_pre10: `{CFG.shield_slope_pre10}` | shield_slope_post10: `{CFG.shield_slope_post10}`\n")
-        lines.append(f"- armor_mul_w1_5: `{CFG.armor_mul_w1_5}` | elite_shield_mul_w1_5: `{CFG.elite_shield_mul_w1_5}`\n")
-        lines.append(f"- shield caps (pct HP): default `{CFG.shield_cap_pct_default}`, elite `{CFG.shield_cap_pct_elite}`, boss `{CFG.shield_cap_pct_boss}`\n")
 
-        with open(md_path, "w", encoding="utf-8") as mf:
-            mf.write("".join(lines))
+def tune_ask_tell(game, algo: str = "CMA", target: str = "humain_solide", episodes: int = 6, seed: int = 123) -> Dict[str, Any]:
+    """CMA-ES / differential evolution tuner (balance/optim.py) over the GA's genome box.
+
+    Each generation is one ask(): the whole batch goes through the shared EpisodeEvaluator
+    (pool, remote workers, disk cache), then tell() gets the same score as the GA
+    (distance to target + 0.12*std) on fixed common seeds.
+    Budget: PATHFORGE_BALANCE_OPT_GENS generations of PATHFORGE_BALANCE_OPT_POP candidates
+    (unset = optimizer default: 10 for CMA-ES, 26 for DE in 8-D).
+    """
+    from .optim import make_optimizer
+
+    rng = random.Random(seed)
+    log_level = int(os.environ.get("PATHFORGE_BALANCE_LOG", "1"))
+    os.environ.setdefault("PATHFORGE_BALANCE_TRACE", str(log_level))
+    max_waves = int(os.environ.get("PATHFORGE_BALANCE_MAX_WAVES", "25"))
+    target_wave = 20 if target == "humain_solide" else 12
+    gens = int(os.environ.get("PATHFORGE_BALANCE_OPT_GENS", "14"))
+    pop = int(os.environ.get("PATHFORGE_BALANCE_OPT_POP", "0")) or None
+
+    opt = make_optimizer(algo, len(_GENOME_BOUNDS), rng, popsize=pop)
+    tag = f"[BAL][{opt.name}]"
+    eval_seeds = [rng.randint(0, 1_000_000) for _ in range(max(2, episodes))]
+    ev = EpisodeEvaluator(game, episodes, max_waves, wall_budget_s=_episode_budget_from_env(),
+                          log_level=log_level, tag=tag)
+    if log_level:
+        print(f"{tag} pop={opt.batch} gens={gens} eval_seeds={eval_seeds}", flush=True)
+    # candidates the analytical estimate puts far from the target are told their
+    # estimated score instead of being simulated (PATHFORGE_BALANCE_PREFILTER=1)
+    est, est_margin = _prefilter_from_env(max_waves, ev.dhash, tag, log_level)
+    est_rejects = 0
+
+    best_g = None
+    best_score = 1e18
+    best_gen = None
+    try:
+        for gen in range(1, gens + 1):
+            t_gen = time.perf_counter()
+            ev.busy_s = 0.0
+            xs = opt.ask()
+            genomes = [_genome_from_unit(x) for x in xs]
+            skip: Dict[int, float] = {}
+            if est is not None:
+                for i, g in enumerate(genomes):
+                    if est.hopeless(g, target_wave, est_margin):
+                        skip[i] = est.estimate(g)
+                if len(skip) == len(genomes):
+                    skip = {}  # nothing plausible this generation: simulate it all rather than tell only guesses
+                est_rejects += len(skip)
+            ev.prefill([g for i, g in enumerate(genomes) if i not in skip], eval_seeds)
+            scores = []
+            for i, g in enumerate(genomes):
+                if i in skip:
+                    scores.append(_score_mean(skip[i], target_wave))
+                    continue
+                mean, std, _ = ev.evaluate(g, eval_seeds)
+                sc = _score_mean(mean, target_wave) + 0.12 * std
+                scores.append(sc)
+                if sc < best_score:
+                    best_g, best_score, best_gen = g, sc, gen
+                    if log_level:
+                        print(f"{tag} NEW BEST gen={gen} score={sc:.3f} mean={mean:.2f} std={std:.2f} {g}", flush=True)
+            opt.tell(xs, scores)
+            if ev.executor is not None and log_level:
+                ev.report_utilization(f"gen {gen:02d}", time.perf_counter() - t_gen)
+            if log_level:
+                extra = f" sigma={opt.sigma:.3f}" if hasattr(opt, "sigma") else ""
+                print(f"{tag} gen {gen:02d}/{gens:02d} best={best_score:.3f} gen_best={min(scores):.3f}{extra}", flush=True)
+            ev.status.update(algo=opt.name, target_wave=target_wave, gen=gen, gens=gens, best_score=best_score,
+                             gen_wall_s=round(time.perf_counter() - t_gen, 2))
+    finally:
+        ev.close()
         if log_level:
-            print(f"[BAL] wrote summary {md_path}", flush=True)
-    except Exception:
-        pass
+            print(f"{tag} {opt.evals} candidates, {ev.episodes_run} episodes simulated"
+                  + (f", {est_rejects} rejected by the prefilter" if est is not None else ""), flush=True)
 
+    assert best_g is not None
+    profile = _to_profile(best_g)
+    mean, std, waves = ev.evaluate(best_g, eval_seeds)
+    profile["meta"] = {
+        "algo": opt.name,
+        "target": target,
+        "episodes": episodes,
+        "max_waves": max_waves,
+        "mean_waves": mean,
+        "std_waves": std,
+        "seed_mode": "fixed",
+        "samples": waves,
+        "best_score": best_score,
+        "gen": best_gen,
+        "evals": opt.evals,
+        "episodes_run": ev.episodes_run,
+    }
+    _write_profile(profile, target_wave, "fixed", log_level)
     return profile
 
-def tune(game, target: str = "humain_solide", episodes: int = 6, seed: int = 123) -> Dict[str,Any]:
+
+def tune(game, target: str = "humain_solide", episodes: int = 6, seed: int = 123, resume: bool = False) -> Dict[str,Any]:
     """Simple parameter search to reach a target survival curve.
 
     Note: This can be slow. By default we sample a subset of the full grid.
-    - Set PATHFORGE_BALANCE_EXHAUSTIVE=1 to test the entire grid.
+    - Set PATHFORGE_BALANCE_EXHAUSTIVE=1 to test the entire grid (balance/sweep.py).
     - Set PATHFORGE_BALANCE_LOG=2 for more verbose logs.
     """
     # Default algorithm for v4.7.0 is GA (wider exploration, escapes local minima).
     algo = str(os.environ.get("PATHFORGE_BALANCE_ALGO", "GA")).strip().upper()
     # If user explicitly requests GA, use it unless exhaustive grid is requested.
     if algo in ("GA", "GENETIC", "GENETIC_ALGO") and str(os.environ.get("PATHFORGE_BALANCE_EXHAUSTIVE", "0")).strip().lower() not in ("1","true","yes","on"):
-        return tune_ga(game, target=target, episodes=episodes, seed=seed)
+        return tune_ga(game, target=target, episodes=episodes, seed=seed, resume=resume)
+    if algo in ("CMA", "CMAES", "CMA-ES", "DE", "DIFF_EVO", "DIFFERENTIAL_EVOLUTION"):
+        return tune_ask_tell(game, algo=algo, target=target, episodes=episodes, seed=seed)
 
     rng = random.Random(seed)
     log_level = int(os.environ.get("PATHFORGE_BALANCE_LOG", "1"))
@@ -394,169 +1243,247 @@ def tune(game, target: str = "humain_solide", episodes: int = 6, seed: int = 123
     # desired mean cleared waves
     target_wave = 20 if target == "humain_solide" else 12
 
+    if exhaustive:
+        # full grid: lazy, sharded and resumable (balance/sweep.py)
+        from .sweep import run_sweep
+        return run_sweep(game, target=target, episodes=episodes, seed=seed)
+
     # search space
     # We explore a wider space than the initial coarse grid so the tuner can both ease or harden the game.
-    # When not exhaustive, we sample continuously (faster, more diverse).
-    if exhaustive:
-        tower_dmg_opts = [0.70, 0.80, 0.90, 1.00, 1.10, 1.20]
-        tower_rate_opts = [0.80, 0.90, 1.00, 1.10, 1.20]
-        tower_cost_opts = [0.90, 1.00, 1.10]
-        enemy_hp_opts = [0.50, 0.70, 0.85, 1.00, 1.20, 1.40, 1.70]
-        enemy_armor_opts = [-4, -2, 0, 2, 4, 6, 8]
-        enemy_speed_opts = [0.85, 0.95, 1.00, 1.10, 1.20]
-        enemy_regen_opts = [0.50, 0.80, 1.00, 1.20]
-        enemy_shield_opts = [0.70, 1.00, 1.30]
-        combos = [
-            (td, tr, tc, eh, aa, es, er, sh)
-            for td in tower_dmg_opts
-            for tr in tower_rate_opts
-            for tc in tower_cost_opts
-            for eh in enemy_hp_opts
-            for aa in enemy_armor_opts
-            for es in enemy_speed_opts
-            for er in enemy_regen_opts
-            for sh in enemy_shield_opts
-        ]
-    else:
-        combos = []
-        for _ in range(max(1, sample_n)):
-            td = rng.uniform(0.70, 1.30)
-            tr = rng.uniform(0.80, 1.25)
-            tc = rng.uniform(0.90, 1.15)
-            eh = rng.uniform(0.50, 1.80)
-            aa = rng.randint(-6, 10)
-            es = rng.uniform(0.85, 1.25)
-            er = rng.uniform(0.50, 1.30)
-            sh = rng.uniform(0.70, 1.40)
-            combos.append((td, tr, tc, eh, aa, es, er, sh))
-        mode = "EXHAUSTIVE" if exhaustive else f"SAMPLED({len(combos)})"
-        print(f"[BAL] tune target={target} target_mean≈{target_wave} episodes={episodes} max_waves={max_waves} mode={mode}")
+    # We sample continuously (faster, more diverse).
+    combos = []
+    for _ in range(max(1, sample_n)):
+        td = rng.uniform(0.70, 1.30)
+        tr = rng.uniform(0.80, 1.25)
+        tc = rng.uniform(0.90, 1.15)
+        eh = rng.uniform(0.50, 1.80)
+        aa = rng.randint(-6, 10)
+        es = rng.uniform(0.85, 1.25)
+        er = rng.uniform(0.50, 1.30)
+        sh = rng.uniform(0.70, 1.40)
+        combos.append((td, tr, tc, eh, aa, es, er, sh))
+    mode = f"SAMPLED({len(combos)})"
+    print(f"[BAL] tune target={target} target_mean≈{target_wave} episodes={episodes} max_waves={max_waves} mode={mode}")
 
     best = None
     best_score = 1e9
 
-    def score_mean(mean: float) -> float:
-        return abs(mean - target_wave) + (0.4*max(0.0, mean - target_wave))
-
-    def min_possible_score(sum_waves: float, done: int) -> float:
-        # remaining episodes can range [0, max_waves]
-        left = max(0, episodes - done)
-        lo = (sum_waves + 0.0*left) / episodes
-        hi = (sum_waves + float(max_waves)*left) / episodes
-        # best score over [lo, hi] occurs near target_wave or at boundaries
-        cand = [lo, hi, float(target_wave)]
-        cand = [x for x in cand if lo <= x <= hi] + [lo, hi]
-        return min(score_mean(x) for x in cand)
-
-    for i, (td, tr, tc, eh, aa, es, er, sh) in enumerate(combos, start=1):
-        t0 = __import__("time").time()
+    # Combos run on the shared EpisodeEvaluator (pool / remote workers with
+    # PATHFORGE_BALANCE_WORKERS / _COORDINATOR). Episode seeds are drawn per combo up front
+    # and every episode rolls perks from its own seed, so a combo's result doesn't depend
+    # on scheduling. A block of combos advances one episode per round; a running episode
+    # aborts once the shared best score rules its combo out.
+    ev = EpisodeEvaluator(game, episodes, max_waves, log_level=log_level, tag="[BAL]", shared_bound=True)
+    block = 1 if ev.executor is None else max(1, 2 * ev.slots)
+    combo_seeds = [[rng.randint(0, 1_000_000) for _ in range(episodes)] for _ in combos]
+    # analytical pre-filter (PATHFORGE_BALANCE_PREFILTER=1): combos whose estimate is
+    # hopelessly far from the target are dropped (with their seeds) before simulation
+    est, est_margin = _prefilter_from_env(max_waves, ev.dhash, "[BAL]", log_level)
+    if est is not None:
+        keep = [i for i, c in enumerate(combos)
+                if not est.hopeless(Genome(*c[:4], int(c[4]), *c[5:]), target_wave, est_margin)]
         if log_level:
-            print(f"[BAL] [{i:03d}/{len(combos):03d}] td={td:.2f} tr={tr:.2f} tc={tc:.2f} eh={eh:.2f} aa={aa} es={es:.2f} er={er:.2f} sh={sh:.2f} ...", flush=True)
-
-        profile = {
-            "tower": {"damage_mul": td, "rate_mul": tr, "range_mul": 1.0, "cost_mul": tc},
-            "enemy": {"hp_mul": eh, "armor_add": aa, "speed_mul": es, "regen_mul": er, "shield_mul": sh},
-        }
-
-        # create copies of dbs
-        towers_db = json.loads(json.dumps(game.towers_db))
-        enemies_db = json.loads(json.dumps(game.enemies_db))
-        from ..core.balance_profile import apply_profile
-        apply_profile(towers_db, enemies_db, profile)
-
-        def roll_fn(n, rarity_bias=0.0):
-            return game.perk_pool.roll(game._perk_rng, n=n, rarity_bias=rarity_bias)
-
-        waves = []
-        sumw = 0.0
-        for ep in range(episodes):
-            s = rng.randint(0, 1_000_000)
-            res = run_episode(towers_db, enemies_db, roll_fn, seed=s, max_waves=max_waves)
-            waves.append(res.waves_cleared)
-            sumw += float(res.waves_cleared)
-
-            if log_level >= 2:
-                print(f"      ep {ep+1}/{episodes}: waves={res.waves_cleared} gold={res.gold_end} lives={res.lives_end}")
-
-            # early pruning: even best possible remaining outcome can't beat current best
-            if best is not None and min_possible_score(sumw, ep+1) > best_score:
-                if log_level >= 2:
-                    print(f"      early-stop: can't beat best_score={best_score:.3f}")
-                break
-
+            print(f"[BAL] prefilter: {len(combos) - len(keep)}/{len(combos)} combos rejected before simulation", flush=True)
+        if keep:
+            combos = [combos[i] for i in keep]
+            combo_seeds = [combo_seeds[i] for i in keep]
+
+    def finish(i: int, st: Dict[str, Any]):
+        nonlocal best, best_score
+        td, tr, tc, eh, aa, es, er, sh = combos[i - 1]
+        if st.get("error"):
+            if log_level:
+                print(f"[BAL] [{i:03d}/{len(combos):03d}] skipped: an episode failed", flush=True)
+            return
+        waves = st["waves"]
         mean = sum(waves)/len(waves) if waves else 0.0
-        sc = score_mean(mean)
-        dt_s = __import__("time").time() - t0
+        sc = _score_mean(mean, target_wave)
+        dt_s = time.time() - st["t0"]
 
         if log_level:
-            print(f"      -> mean={mean:.2f} score={sc:.3f} (ran {len(waves)}/{episodes} eps in {dt_s:.2f}s)")
+            print(f"[BAL] [{i:03d}/{len(combos):03d}] td={td:.2f} tr={tr:.2f} tc={tc:.2f} eh={eh:.2f} aa={aa} es={es:.2f} er={er:.2f} sh={sh:.2f}"
+                  f" -> mean={mean:.2f} score={sc:.3f} (ran {len(waves)}/{episodes} eps in {dt_s:.2f}s)", flush=True)
 
-        if sc < best_score:
+        if sc < best_score and not st["pruned"]:
             best_score = sc
-            best = (profile, mean, waves)
+            best = (_to_profile(st["g"]), mean, waves)
+            ev.set_bound(best_score)
             if log_level:
                 print(f"[BAL] NEW BEST score={best_score:.3f} mean={mean:.2f} td={td:.2f} tr={tr:.2f} tc={tc:.2f} eh={eh:.2f} aa={aa} es={es:.2f} er={er:.2f} sh={sh:.2f}", flush=True)
+        ev.status.update(algo="RANDOM_SEARCH", target_wave=target_wave, combos_done=i, combos=len(combos),
+                         best_score=best_score if best is not None else None)
 
-    assert best is not None
-    profile, mean, waves = best
-    profile["meta"] = {"target": target, "episodes": episodes, "mean_waves": mean, "samples": waves}
-
-    os.makedirs(os.path.dirname(PROFILE_FILE), exist_ok=True)
-    with open(PROFILE_FILE, "w", encoding="utf-8") as f:
-        json.dump(profile, f, indent=2)
-    # write a human-readable summary alongside the json
     try:
-        md_path = PROFILE_FILE.replace(".json", ".md")
-        from ..core.difficulty import CFG
-        lines = []
-        lines.append("# Pathforge Balance Profile\n\n")
-        lines.append(f"- Algo: **RANDOM_SEARCH**\n")
-        lines.append(f"- Target: **{target}** (target_mean≈{target_wave})\n")
-        lines.append(f"- Episodes: **{episodes}**\n")
-        lines.append(f"- Max waves: **{max_waves}**\n")
-        lines.append(f"- Result mean waves: **{mean:.2f}**\n")
-        lines.append(f"- Samples: `{waves}`\n")
-        if waves:
-            try:
-                std = statistics.pstdev(waves) if len(waves) >= 2 else 0.0
-                lines.append(f"- std/min/median/max: **{std:.2f} / {min(waves)} / {statistics.median(waves)} / {max(waves)}**\n")
-            except Exception:
-                pass
-        lines.append("\n## Multipliers\n")
-        lines.append("### Towers\n")
-        lines.append(f"- damage_mul: `{profile['tower'].get('damage_mul')}`\n")
-        lines.append(f"- rate_mul: `{profile['tower'].get('rate_mul')}`\n")
-        lines.append(f"- range_mul: `{profile['tower'].get('range_mul')}`\n")
-        lines.append(f"- cost_mul: `{profile['tower'].get('cost_mul')}`\n")
-        lines.append("\n### Enemies\n")
-        lines.append(f"- hp_mul: `{profile['enemy'].get('hp_mul')}`\n")
-        lines.append(f"- armor_add: `{profile['enemy'].get('armor_add')}`\n")
-        lines.append(f"- speed_mul: `{profile['enemy'].get('speed_mul')}`\n")
-        lines.append(f"- regen_mul: `{profile['enemy'].get('regen_mul')}`\n")
-        lines.append(f"- shield_mul: `{profile['enemy'].get('shield_mul')}`\n")
-        lines.append("\n## Difficulty Curves (baseline v4.7.0)\n")
-        lines.append(f"- hp_slope_pre10: `{CFG.hp_slope_pre10}` | hp_slope_post10: `{CFG.hp_slope_post10}`\n")
-        lines.append(f"- shield_base_factor: `{CFG.shield_base_factor}` | shield_slope_pre10: `{CFG.shield_slope_pre10}` | shield_slope_post10: `{CFG.shield_slope_post10}`\n")
-        lines.append(f"- armor_mul_w1_5: `{CFG.armor_mul_w1_5}` | elite_shield_mul_w1_5: `{CFG.elite_shield_mul_w1_5}`\n")
-        lines.append(f"- shield caps (pct HP): default `{CFG.shield_cap_pct_default}`, elite `{CFG.shield_cap_pct_elite}`, boss `{CFG.shield_cap_pct_boss}`\n")
-        with open(md_path, "w", encoding="utf-8") as mf:
-            mf.write("".join(lines))
+        for start in range(0, len(combos), block):
+            states = {}
+            for i in range(start + 1, min(len(combos), start + block) + 1):
+                td, tr, tc, eh, aa, es, er, sh = combos[i - 1]
+                g = Genome(td=td, tr=tr, tc=tc, eh=eh, aa=int(aa), es=es, er=er, sh=sh)
+                states[i] = {"g": g, "waves": [], "sumw": 0.0, "pruned": False, "t0": time.time()}
+            for ep in range(episodes):
+                live = [i for i, st in states.items() if not st["pruned"]]
+                if not live:
+                    break
+                tasks = [(states[i]["g"], combo_seeds[i - 1][ep],
+                          (states[i]["sumw"], ep, episodes, target_wave, best_score if best is not None else float("inf")))
+                         for i in live]
+
+                def tighten(k: int, w: int, reason: str):
+                    # a combo completing here tightens the bound for the episodes still running;
+                    # reporting and the best combo stay in order (finish), pruning only needs the bound
+                    if ep == episodes - 1 and reason not in ("decided", "wall_budget", "tick_budget"):
+                        ev.set_bound(_score_mean((states[live[k]]["sumw"] + w) / episodes, target_wave))
+
+                for i, (w, reason) in zip(live, ev.run(tasks, on_result=tighten)):
+                    st = states[i]
+                    if w is None:
+                        # failed twice: drop the combo rather than score the failure
+                        st["error"] = st["pruned"] = True
+                        continue
+                    st["waves"].append(w)
+                    st["sumw"] += float(w)
+                    if log_level >= 2:
+                        print(f"      [{i:03d}] ep {ep+1}/{episodes}: waves={w} stop={reason}")
+                    if reason in ("decided", "wall_budget", "tick_budget"):
+                        # the partial count is a lower bound that already loses: skip remaining episodes
+                        st["pruned"] = True
+                    # early pruning: even best possible remaining outcome can't beat current best
+                    elif _min_possible_score(st["sumw"], ep + 1, episodes, max_waves, target_wave) > ev.best_bound:
+                        if log_level >= 2:
+                            print(f"      [{i:03d}] early-stop: can't beat best_score={ev.best_bound:.3f}")
+                        st["pruned"] = True
+                # combos are reported (and can become best) in order, as soon as they are complete
+                for i in sorted(states):
+                    st = states[i]
+                    if not (st["pruned"] or len(st["waves"]) >= episodes):
+                        break
+                    finish(i, st)
+                    del states[i]
+            for i in sorted(states):
+                finish(i, states[i])
+    finally:
+        ev.close()
         if log_level:
-            print(f"[BAL] wrote summary {md_path}", flush=True)
-    except Exception:
-        pass
-
+            print(f"[BAL] {ev.episodes_run} episodes simulated, stops: {ev.stop_counts}", flush=True)
 
+    assert best is not None
+    profile, mean, waves = best
+    profile["meta"] = {
+        "algo": "RANDOM_SEARCH",
+        "target": target,
+        "episodes": episodes,
+        "max_waves": max_waves,
+        "mean_waves": mean,
+        "std_waves": float(statistics.pstdev(waves)) if len(waves) >= 2 else 0.0,
+        "seed_mode": "per_combo",
+        "samples": waves,
+        "best_score": best_score,
+        "evals": len(combos),
+        "episodes_run": ev.episodes_run,
+    }
+    _write_profile(profile, target_wave, "per_combo", log_level)
     return profile
 
-def main():
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(prog="python -m pathforge.balance")
+    ap.add_argument("--resume", action="store_true", help="continue the GA from its last per-generation checkpoint")
+    ap.add_argument("--serve", default=None, metavar="HOST:PORT",
+                    help="evaluate episodes on remote workers (sets PATHFORGE_BALANCE_COORDINATOR)")
+    sub = ap.add_subparsers(dest="cmd")
+    wp = sub.add_parser("worker", help="pull episode jobs from a tuner started with --serve")
+    wp.add_argument("--connect", required=True, metavar="HOST:PORT")
+    wp.add_argument("--procs", type=int, default=1, help="worker processes on this machine")
+    wp.add_argument("--batch", type=int, default=2, help="episodes pulled per request")
+    wp.add_argument("--name", default=None)
+    wp.add_argument("--give-up", type=float, default=300.0, help="exit after this many seconds without a coordinator")
+    sp = sub.add_parser("sweep", help="exhaustive grid sweep (sharded, resumable; results in balance_sweep.sqlite)")
+    sp.add_argument("--shard", default=None, metavar="i/N", help="evaluate grid indices i, i+N, ... (0 <= i < N)")
+    sp.add_argument("--episodes", type=int, default=5)
+    sp.add_argument("--seed", type=int, default=123)
+    sp.add_argument("--limit", type=int, default=None, help="stop after this many combos (resume later)")
+    sp.add_argument("--summary", action="store_true", help="only rewrite balance_sweep.md from stored results")
+    xp = sub.add_parser("sensitivity", help="Morris / Sobol sensitivity of waves-cleared to genome + difficulty knobs")
+    xp.add_argument("--method", default="morris", choices=("morris", "sobol", "both"))
+    xp.add_argument("--r", type=int, default=10, help="Morris trajectories")
+    xp.add_argument("--levels", type=int, default=4, help="Morris grid levels")
+    xp.add_argument("--n", type=int, default=32, help="Sobol base samples (N*(k+2) points)")
+    xp.add_argument("--episodes", type=int, default=3)
+    xp.add_argument("--seed", type=int, default=123)
+    ep = sub.add_parser("estimate", help="fit and validate the analytical DPS/EHP estimator against simulated episodes")
+    ep.add_argument("--genomes", type=int, default=60)
+    ep.add_argument("--episodes", type=int, default=3)
+    ep.add_argument("--seed", type=int, default=123)
+    qp = sub.add_parser("rescore", help="rank stored genomes under a new objective from recorded trajectories (no simulation)")
+    qp.add_argument("--target", type=float, default=12.0, help="target mean waves cleared")
+    qp.add_argument("--cap", type=int, default=None, help="score as if episodes stopped at this wave (default max waves)")
+    qp.add_argument("--objective", default="target", choices=("target", "leaks"))
+    qp.add_argument("--std-pen", type=float, default=0.12, help="score penalty per wave of std")
+    qp.add_argument("--min-episodes", type=int, default=3)
+    qp.add_argument("--top", type=int, default=15)
+    rp = sub.add_parser("resolution", help="compare sim tick rates (waves-cleared divergence, ranking stability)")
+    rp.add_argument("--rates", default="60,30,20", help="tick rates in Hz, first one is the reference")
+    rp.add_argument("--genomes", type=int, default=6)
+    rp.add_argument("--episodes", type=int, default=4)
+    rp.add_argument("--seed", type=int, default=123)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "worker":
+        from .cluster import worker_main
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        n = max(1, int(args.procs))
+        if n == 1:
+            worker_main(args.connect, batch=args.batch, name=args.name, give_up_s=args.give_up)
+            return
+        import multiprocessing as mp
+        ctx = mp.get_context("spawn")
+        procs = [ctx.Process(target=worker_main, args=(args.connect,),
+                             kwargs={"batch": args.batch, "name": f"{args.name}#{i}" if args.name else None, "give_up_s": args.give_up})
+                 for i in range(n)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        return
+    if args.serve:
+        os.environ["PATHFORGE_BALANCE_COORDINATOR"] = str(args.serve)
+
     # Import Game in a lightweight way (dummy driver)
-    import os
     os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
     from ..game import Game
     g = Game()
+
+    if args.cmd == "sweep":
+        from .sweep import run_sweep
+        out = run_sweep(g, target="humain_solide", episodes=args.episodes, seed=args.seed, shard=args.shard,
+                        limit=0 if args.summary else args.limit)
+        print(json.dumps(out.get("meta", {}), indent=2))
+        return
+
+    if args.cmd == "sensitivity":
+        from .sensitivity import sensitivity_report
+        sensitivity_report(g, method=args.method, r=args.r, n=args.n, levels=args.levels, episodes=args.episodes, seed=args.seed)
+        return
+
+    if args.cmd == "estimate":
+        from .estimate import validate_estimator
+        validate_estimator(g, n=args.genomes, episodes=args.episodes, seed=args.seed)
+        return
+
+    if args.cmd == "rescore":
+        from .rescore import rescore_report
+        rescore_report(target_wave=args.target, cap=args.cap, objective=args.objective, std_pen=args.std_pen,
+                       min_episodes=args.min_episodes, top=args.top)
+        return
+
+    if args.cmd == "resolution":
+        from .resolution import resolution_report
+        rates = [float(x) for x in str(args.rates).split(",") if x.strip()]
+        resolution_report(g, rates=rates, genomes=args.genomes, episodes=args.episodes, seed=args.seed)
+        return
+
     # tuning uses g.perk_pool etc
-    profile = tune(g, target="humain_solide", episodes=5, seed=123)
+    profile = tune(g, target="humain_solide", episodes=5, seed=123, resume=args.resume)
     print("Wrote", PROFILE_FILE)
     print(json.dumps(profile.get("meta",{}), indent=2))
 
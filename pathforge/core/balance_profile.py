@@ -73,3 +73,80 @@ def apply_profile(towers_db: Dict[str,Any], enemies_db: Dict[str,Any], profile:
             ed["shield"] = int(round(float(ed.get("shield", 0)) * e_shield))
         except Exception:
             pass
+
+
+def _num(fn, v):
+    try:
+        return fn(v)
+    except Exception:
+        return None
+
+
+class ProfileOverlay:
+    """Profiled views of fixed base DBs without copying them.
+
+    The numeric fields apply_profile touches are parsed once; apply() returns new
+    top-level dicts whose records are shallow copies with those fields recomputed
+    (same formulas, so the result equals a deep copy + apply_profile). Everything
+    else (branches, resist, tags...) is shared with the base DBs, which the game
+    only ever reads. Used by the balance tuners, where every genome needs its own
+    profiled DBs.
+    """
+
+    def __init__(self, towers_db: Dict[str,Any], enemies_db: Dict[str,Any]):
+        self._towers = []
+        for k, td in towers_db.items():
+            base = td.get("base") or {}
+            nums = {}
+            if isinstance(base, dict):
+                for f in ("damage", "rate", "range"):
+                    if f in base:
+                        nums[f] = _num(float, base[f])
+            self._towers.append((k, td, base if isinstance(base, dict) else None, _num(int, td.get("cost", 0)), nums))
+        self._enemies = []
+        for k, ed in enemies_db.items():
+            self._enemies.append((k, ed, _num(float, ed.get("hp", 1.0)), _num(float, ed.get("spd", 1.0)),
+                                  _num(float, ed.get("regen", 0.0)), _num(float, ed.get("armor", 0)),
+                                  _num(float, ed.get("shield", 0))))
+
+    def apply(self, profile: Dict[str,Any]) -> tuple[Dict[str,Any], Dict[str,Any]]:
+        t = (profile.get("tower") or {})
+        e = (profile.get("enemy") or {})
+        muls = {"damage": float(t.get("damage_mul", 1.0)), "rate": float(t.get("rate_mul", 1.0)),
+                "range": float(t.get("range_mul", 1.0))}
+        t_cost = float(t.get("cost_mul", 1.0))
+
+        towers_db: Dict[str,Any] = {}
+        for k, td, base, cost, nums in self._towers:
+            rec = dict(td)
+            if cost is not None:
+                rec["cost"] = int(round(cost * t_cost))
+            if base is not None:
+                b = dict(base)
+                for f, v in nums.items():
+                    if v is not None:
+                        b[f] = v * muls[f]
+                rec["base"] = b
+            towers_db[k] = rec
+
+        e_hp = float(e.get("hp_mul", 1.0))
+        e_spd = float(e.get("speed_mul", 1.0))
+        e_reg = float(e.get("regen_mul", 1.0))
+        e_arm_add = float(e.get("armor_add", 0.0))
+        e_shield = float(e.get("shield_mul", 1.0))
+
+        enemies_db: Dict[str,Any] = {}
+        for k, ed, hp, spd, regen, armor, shield in self._enemies:
+            rec = dict(ed)
+            if hp is not None:
+                rec["hp"] = hp * e_hp
+            if spd is not None:
+                rec["spd"] = spd * e_spd
+            if regen is not None:
+                rec["regen"] = regen * e_reg
+            if armor is not None:
+                rec["armor"] = int(round(armor + e_arm_add))
+            if shield is not None:
+                rec["shield"] = int(round(shield * e_shield))
+            enemies_db[k] = rec
+        return towers_db, enemies_db
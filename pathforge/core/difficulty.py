@@ -43,6 +43,13 @@ class DifficultyConfig:
 CFG = DifficultyConfig()
 
 
+def set_config(cfg: DifficultyConfig) -> DifficultyConfig:
+    """Swap the active config (balance tooling varies the curves per episode); returns the previous one."""
+    global CFG
+    prev, CFG = CFG, cfg
+    return prev
+
+
 def _lerp(a: float, b: float, t: float) -> float:
     t = 0.0 if t < 0.0 else (1.0 if t > 1.0 else t)
     return a + (b - a) * t
@@ -1,18 +1,86 @@
 from __future__ import annotations
+import time
+
+from ..settings import FPS
+
+# x1 / x2 / x3, then turbo x10 / x50 (fixed substeps, reduced rendering)
+SPEEDS = (1.0, 2.0, 3.0, 10.0, 50.0)
+SUBSTEP = 1.0 / 60.0
+TURBO_MIN = 5.0
+
+# Game.loop runs scenes on a fixed tick; a slow frame is paid back with at most
+# MAX_CATCHUP ticks (the rest of the backlog is dropped instead of cascading)
+TICK = 1.0 / FPS
+MAX_CATCHUP = 5
+MAX_FRAME_DT = 0.25
+
 
 class GameClock:
     def __init__(self):
         self.time_scale = 1.0
+        # wall-clock share of a frame the sim may use before turbo stops substepping;
+        # shared by every tick run before the frame is drawn (begin_frame)
+        self.frame_budget = 0.75 / FPS
+        self._frame_t0 = time.perf_counter()
+        self.effective_scale = 1.0  # smoothed sim-seconds per real second actually achieved
+        self._frame = 0
+        self._acc = 0.0
+        self.alpha = 1.0    # render interpolation factor between the last two ticks
+        self.dropped = 0    # ticks discarded by the catch-up guard
 
     def scaled_dt(self, dt: float) -> float:
         return dt * self.time_scale
 
+    def accumulate(self, frame_dt: float) -> int:
+        """Bank real frame time; return how many fixed TICKs the loop should run now."""
+        self._acc += min(max(0.0, frame_dt), MAX_FRAME_DT)
+        n = int(self._acc / TICK)
+        if n > MAX_CATCHUP:
+            self.dropped += n - MAX_CATCHUP
+            self._acc -= (n - MAX_CATCHUP) * TICK
+            n = MAX_CATCHUP
+        self._acc -= n * TICK
+        self.alpha = min(1.0, self._acc / TICK)
+        return n
+
     def cycle_speed(self) -> int:
-        # x1 / x2 / x3
-        if self.time_scale < 1.5:
-            self.time_scale = 2.0
-        elif self.time_scale < 2.5:
-            self.time_scale = 3.0
-        else:
-            self.time_scale = 1.0
+        i = 0
+        for k, s in enumerate(SPEEDS):
+            if self.time_scale >= s - 0.5:
+                i = k
+        self.time_scale = SPEEDS[(i + 1) % len(SPEEDS)]
+        self.effective_scale = self.time_scale
         return int(self.time_scale)
+
+    @property
+    def turbo(self) -> bool:
+        return self.time_scale >= TURBO_MIN
+
+    def substeps(self, dt: float) -> tuple[int, float]:
+        """Split this frame's scaled time into n steps of ~SUBSTEP (x1 at 60 FPS: one step of dt)."""
+        total = self.scaled_dt(dt)
+        n = max(1, int(round(total / SUBSTEP)))
+        return n, total / n
+
+    def begin_frame(self):
+        """Start of a rendered frame (before its catch-up ticks run)."""
+        self._frame_t0 = time.perf_counter()
+
+    def budget_spent(self) -> bool:
+        return time.perf_counter() - self._frame_t0 > self.frame_budget
+
+    def note_frame(self, sim_dt: float, dt: float):
+        if dt > 0:
+            self.effective_scale += (sim_dt / dt - self.effective_scale) * 0.1
+
+    def render_due(self) -> bool:
+        if not self.turbo:
+            return True
+        self._frame += 1
+        every = 2 if self.time_scale <= 10.0 else 4
+        return self._frame % every == 0
+
+    def label(self) -> str:
+        if self.turbo and self.effective_scale < self.time_scale * 0.9:
+            return f"x{int(self.time_scale)}~{int(self.effective_scale)}"
+        return f"x{int(self.time_scale)}"
@@ -9,8 +9,8 @@ from ..settings import (
     T_PATH_FAST, T_PATH_MUD, T_PATH_CONDUCT, T_PATH_CRYO, T_PATH_MAGMA, T_PATH_RUNE,
 )
 
+from ..core import difficulty as _difficulty
 from ..core.difficulty import (
-    CFG as DIFF_CFG,
     hp_tier,
     shield_tier,
     armor_multiplier,
@@ -75,6 +75,9 @@ class Enemy:
     tile_v: int = T_EMPTY
 
     _sapper_t: float = 0.0
+    cur_speed: float = 0.0  # px/s from the last update (analytic projectile lead)
+    px: Optional[float] = None  # position at the previous tick (render interpolation)
+    py: Optional[float] = None
 
     # optional telemetry recorder
     telemetry: Any = None
@@ -100,11 +103,12 @@ class Enemy:
         self.resist = dict(self.arch.resist or {})
         self.shield_mult = dict(self.arch.shield_mult or {})
         # Shields: lower base factor + per-wave tier + elite easing + caps.
-        raw_shield = float(self.arch.shield) * float(DIFF_CFG.shield_base_factor) * tier_sh
+        raw_shield = float(self.arch.shield) * float(_difficulty.CFG.shield_base_factor) * tier_sh
         raw_shield *= float(elite_shield_multiplier(self.wave, self.arch.tags))
         cap = float(self.max_hp) * float(shield_cap_pct(self.arch.tags))
         self.shield = min(raw_shield, cap)
         self.base_speed = float(self.arch.spd) * float(self.tile) * float(self.speed_mul)
+        self.cur_speed = self.base_speed
         self.reward_gold = int(5 + self.wave * 1.6) + int(self.gold_bonus)
         self.tile_gold_bonus = 0
         self.tile_v = T_EMPTY
@@ -112,6 +116,31 @@ class Enemy:
     def _pos(self, c: Tuple[int,int]):
         return c[0] * self.tile + self.tile/2 + self.offset_x, c[1] * self.tile + self.tile/2 + self.offset_y
 
+    def predict_pos(self, t: float, world) -> Tuple[float, float]:
+        """Position after t seconds at the current speed, walking downhill lane cells.
+
+        Uses World.peek_next_cell (no rng), so forks resolve to the first option;
+        good enough to lead a shot, never used to move the enemy.
+        """
+        left = float(self.cur_speed) * float(t)
+        x, y = self.x, self.y
+        if left <= 0.0 or not self.alive or self.finished:
+            return x, y
+        prev, cell, nxt = self.prev_cell, self.cell, self.next_cell
+        for _ in range(64):
+            if nxt is None:
+                break
+            tx, ty = self._pos(nxt)
+            d = math.hypot(tx-x, ty-y)
+            if d >= left:
+                f = left / (d or 1.0)
+                return x + (tx-x)*f, y + (ty-y)*f
+            left -= d
+            x, y = tx, ty
+            prev, cell = cell, nxt
+            nxt = world.peek_next_cell(cell, prev)
+        return x, y
+
     def is_elite(self) -> bool:
         return "ELITE" in self.arch.tags
 
@@ -288,6 +317,7 @@ class Enemy:
                 self.spawn_signals.append("PHASE2")
 
         if stunned > 0:
+            self.cur_speed = 0.0
             return
 
         # tile effects
@@ -307,6 +337,7 @@ class Enemy:
         # Enemies gain speed as they progress along the lane (capped; bosses gain less).
         cap = 0.25 if ("BOSS" in self.arch.tags) else 0.40
         spd *= (1.0 + min(cap, 0.004 * float(self.path_i)))
+        self.cur_speed = spd
 
         # branch-capable movement (with robust fallback)
         use_branch = False
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import math
 
 @dataclass
@@ -16,8 +16,32 @@ class Projectile:
     ttl: float
     on_hit: Dict[str, Any]
     style: str = "BULLET"
+    cosmetic: bool = False  # analytic mode: rendered only, the hit is a ScheduledHit
+    px: Optional[float] = None  # position at the previous tick (render interpolation)
+    py: Optional[float] = None
 
     def update(self, dt: float):
         self.x += self.vx * dt
         self.y += self.vy * dt
         self.ttl -= dt
+
+@dataclass
+class ScheduledHit:
+    """Analytic projectile: resolved once at (x, y) when t reaches 0 (no per-frame collision).
+
+    (dx, dy) is the unit flight direction, reach the distance the shot could still
+    travel past the impact point (pierce candidates are looked up along that ray).
+    """
+    t: float
+    target: Any
+    x: float
+    y: float
+    dx: float
+    dy: float
+    reach: float
+    dmg: float
+    dmg_type: str
+    splash: float
+    pierce: int
+    on_hit: Dict[str, Any]
+    style: str = "BULLET"
@@ -1,9 +1,8 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 import math
 from ..settings import T_PATH_CONDUCT, T_PATH_MUD
-from .projectile import Projectile
 
 TARGET_MODES = ["FIRST","LAST","STRONGEST","CLOSEST","ARMORED"]
 
@@ -19,6 +18,33 @@ class TowerDef:
     branches: Dict[str, Any]
     overclock: Dict[str, Any]
 
+@dataclass
+class AoePulse:
+    """One compiled area pulse (CRYO/FLAME): damage + statuses for every target in range.
+
+    Chance-based statuses are rolled from a single batched draw of
+    len(targets) * len(rolled) values instead of interleaved rng calls per target.
+    """
+    dmg: float
+    dmg_type: str
+    src: str
+    always: List[Tuple[str, float, int, float]]          # (status, dur, stacks, strength)
+    rolled: List[Tuple[str, float, int, float, float]]   # (status, dur, stacks, strength, chance)
+
+    def apply(self, targets, rng) -> None:
+        dmg, dmg_type, src = self.dmg, self.dmg_type, self.src
+        always, rolled = self.always, self.rolled
+        rolls = [rng.random() for _ in range(len(targets) * len(rolled))] if rolled else ()
+        i = 0
+        for e in targets:
+            e.take_damage(dmg, dmg_type, src=src)
+            for k, dur, stacks, strength in always:
+                e.add_status(k, dur, stacks, strength)
+            for k, dur, stacks, strength, chance in rolled:
+                if rolls[i] < chance:
+                    e.add_status(k, dur, stacks, strength)
+                i += 1
+
 @dataclass
 class Tower:
     gx: int
@@ -145,6 +171,46 @@ class Tower:
                 v *= float(oc["range_mul"])
         return v
 
+    def compile_pulse(self, dmg: float, stats) -> "AoePulse":
+        """Resolve branch/perk/talent mods of a CRYO or FLAME pulse once per shot."""
+        bm = self._branch_mods()
+        always: List[Tuple[str, float, int, float]] = []
+        rolled: List[Tuple[str, float, int, float, float]] = []
+
+        def add(k: str, v: Dict[str, Any]):
+            try:
+                chance = float(v.get("chance", 1.0))
+            except Exception:
+                chance = 1.0
+            st = (k, float(v.get("dur", 1.0)), int(v.get("stacks", 1)), float(v.get("strength", 0.0)))
+            if chance < 1.0:
+                rolled.append(st + (chance,))
+            else:
+                always.append(st)
+
+        if self.defn.key == "CRYO":
+            strength = 0.22 + float(bm.get("slow_strength_add", 0.0)) + float(stats.tower_bonus.get("CRYO", {}).get("slow_strength_add", 0.0))
+            always.append(("SLOW", 1.0, 1, strength))
+            # optional stun
+            if bm.get("stun_chance"):
+                rolled.append(("STUN", float(bm.get("stun_dur", 0.25)), 1, 0.0, float(bm["stun_chance"])))
+            # on-hit extras (branch + global mods), global overrides branch per status
+            on_hit = {}
+            on_hit.update(bm.get("on_hit") or {})
+            on_hit.update(self.mods.get("on_hit") or {})
+            for k, v in on_hit.items():
+                add(k, v)
+            return AoePulse(dmg=dmg, dmg_type="COLD", src=self.defn.key, always=always, rolled=rolled)
+
+        burn_stacks = 1 + int(bm.get("burn_stacks_add", 0)) + int(stats.tower_bonus.get("FLAME", {}).get("burn_stacks_add", 0))
+        always.append(("BURN", 2.2, burn_stacks, 0.0))
+        # branch on-hit, then global on-hit effects (perks/talents); both apply
+        for k, v in (bm.get("on_hit") or {}).items():
+            add(k, v)
+        for k, v in (self.mods.get("on_hit") or {}).items():
+            add(k, v)
+        return AoePulse(dmg=dmg, dmg_type="FIRE", src=self.defn.key, always=always, rolled=rolled)
+
     def update_timers(self, dt: float):
         self.cd = max(0.0, self.cd - dt)
         self.overclock_time = max(0.0, self.overclock_time - dt)
@@ -200,26 +266,7 @@ class Tower:
             targets = world.query_radius(cx, cy, rng_px)
             if not targets:
                 return
-            strength = 0.22 + float(self._branch_mods().get("slow_strength_add", 0.0)) + float(stats.tower_bonus.get("CRYO", {}).get("slow_strength_add", 0.0))
-            for e in targets:
-                e.take_damage(dmg, "COLD", src=self.defn.key)
-                e.add_status("SLOW", 1.0, 1, strength)
-                # optional stun
-                bm = self._branch_mods()
-                if bm.get("stun_chance") and rng.random() < float(bm["stun_chance"]):
-                    e.add_status("STUN", float(bm.get("stun_dur", 0.25)), 1, 0.0)
-                # on-hit extras (branch + global mods), with optional chance
-                on_hit = {}
-                on_hit.update(bm.get("on_hit") or {})
-                on_hit.update(self.mods.get("on_hit") or {})
-                for k, v in on_hit.items():
-                    try:
-                        chance = float(v.get("chance", 1.0))
-                    except Exception:
-                        chance = 1.0
-                    if chance < 1.0 and rng.random() > chance:
-                        continue
-                    e.add_status(k, float(v.get("dur", 1.0)), int(v.get("stacks", 1)), float(v.get("strength", 0.0)))
+            self.compile_pulse(dmg, stats).apply(targets, rng)
             world.fx_ring(cx, cy, rng_px, (0,255,255), 0.18)
             self.cd = cooldown
             return
@@ -228,28 +275,7 @@ class Tower:
             targets = world.query_radius(cx, cy, rng_px)
             if not targets:
                 return
-            burn_stacks = 1 + int(self._branch_mods().get("burn_stacks_add", 0)) + int(stats.tower_bonus.get("FLAME", {}).get("burn_stacks_add", 0))
-            for e in targets:
-                e.take_damage(dmg, "FIRE", src=self.defn.key)
-                e.add_status("BURN", 2.2, burn_stacks, 0.0)
-                bm = self._branch_mods()
-                for k, v in (bm.get("on_hit") or {}).items():
-                    try:
-                        chance = float(v.get("chance", 1.0))
-                    except Exception:
-                        chance = 1.0
-                    if chance < 1.0 and rng.random() > chance:
-                        continue
-                    e.add_status(k, float(v.get("dur", 1.0)), int(v.get("stacks", 1)), float(v.get("strength", 0.0)))
-                # global on-hit effects (perks/talents)
-                for k, v in (self.mods.get("on_hit") or {}).items():
-                    try:
-                        chance = float(v.get("chance", 1.0))
-                    except Exception:
-                        chance = 1.0
-                    if chance < 1.0 and rng.random() > chance:
-                        continue
-                    e.add_status(k, float(v.get("dur", 1.0)), int(v.get("stacks", 1)), float(v.get("strength", 0.0)))
+            self.compile_pulse(dmg, stats).apply(targets, rng)
             # flame particles
             for _ in range(6):
                 ang = rng.random()*math.tau
@@ -287,10 +313,9 @@ class Tower:
             used_ids = {id(first)}
             curr = first
             for _ in range(chains):
-                near = [e for e in world.query_radius(curr.x, curr.y, tile*3.0) if id(e) not in used_ids]
-                if not near:
+                nxt = world.nearest_unvisited(curr.x, curr.y, tile*3.0, used_ids)
+                if nxt is None:
                     break
-                nxt = min(near, key=lambda e: (e.x-curr.x)**2+(e.y-curr.y)**2)
                 used_ids.add(id(nxt))
                 nxt.take_damage(dmg*0.72, "ENERGY", weakness_mul=getattr(world, "weakness_mul", 1.8), src=self.defn.key)
                 nxt.add_status("SHOCK", shock_dur, 1, 0.0)
@@ -319,9 +344,6 @@ class Tower:
 
         # base projectile parameters
         spd = float(self.defn.base.get("proj_speed", 12.0)) * tile
-        dx, dy = target.x - cx, target.y - cy
-        dist = math.hypot(dx,dy) or 1.0
-        vx, vy = (dx/dist)*spd, (dy/dist)*spd
 
         splash = float(self.defn.base.get("splash", 0.0))
         pierce = int(self.defn.base.get("pierce", 0))
@@ -345,20 +367,18 @@ class Tower:
 
         for i in range(total):
             spread = (i - (total-1)/2) * 0.07
-            svx = vx*math.cos(spread) - vy*math.sin(spread)
-            svy = vx*math.sin(spread) + vy*math.cos(spread)
 
             oh = dict(bm.get("on_hit") or {})
             oh.update(self.mods.get("on_hit") or {})
 
-            p = Projectile(
-                x=cx, y=cy, vx=svx, vy=svy,
+            # INTEGRATE (flying Projectile) or ANALYTIC (scheduled hit) depending on world mode
+            world.fire_projectile(
+                cx, cy, target, spd, spread,
                 dmg=dmg, dmg_type=self.defn.dmg_type,
-                splash=splash, pierce=pierce, ttl=2.6,
+                splash=splash, pierce=pierce,
                 on_hit=oh,
-                style=style
+                style=style, ttl=2.6
             )
-            world.projectiles.append(p)
 
         # muzzle feedback
         if style == "SNIPER":
@@ -6,7 +6,7 @@ import pygame
 
 from .settings import DEFAULT_W, DEFAULT_H, FPS, COLS, ROWS, TOP_BAR_FRAC, BOTTOM_BAR_FRAC
 from .assets import make_fonts
-from .core.time import GameClock
+from .core.time import GameClock, TICK
 from .core.storage import SaveManager
 from .core.balance_profile import load_profile, apply_profile
 from .core.telemetry import Telemetry
@@ -108,9 +108,33 @@ class Game:
             return list(self.perks_db)[:n]
         return self.perk_pool.roll(self._perk_rng, n=n, rarity_bias=rarity_bias)
 
+    def _apply_result(self) -> bool:
+        res = self.scene.consume_result()
+        if not res.next_scene:
+            return False
+        overlays = {"PAUSE", "PERK", "TALENT", "BESTIARY"}
+        if res.next_scene == "BACK":
+            if self.scene_stack:
+                self.scene.exit()
+                self.scene = self.scene_stack.pop()
+            else:
+                self.scene.exit()
+                self.scene = self.scenes["MENU"]
+                self.scene.enter(None)
+        elif res.next_scene in overlays:
+            self.scene_stack.append(self.scene)
+            self.scene = self.scenes[res.next_scene]
+            self.scene.enter(res.payload)
+        else:
+            self.scene_stack.clear()
+            self.scene.exit()
+            self.scene = self.scenes[res.next_scene]
+            self.scene.enter(res.payload)
+        return True
+
     def loop(self):
         while self.running:
-            dt = self.clock_pygame.tick(FPS) / 1000.0
+            frame_dt = self.clock_pygame.tick(FPS) / 1000.0
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -118,28 +142,14 @@ class Game:
                 else:
                     self.scene.handle_event(event)
 
-            self.scene.update(dt)
-
-            res = self.scene.consume_result()
-            if res.next_scene:
-                overlays = {"PAUSE", "PERK", "TALENT", "BESTIARY"}
-                if res.next_scene == "BACK":
-                    if self.scene_stack:
-                        self.scene.exit()
-                        self.scene = self.scene_stack.pop()
-                    else:
-                        self.scene.exit()
-                        self.scene = self.scenes["MENU"]
-                        self.scene.enter(None)
-                elif res.next_scene in overlays:
-                    self.scene_stack.append(self.scene)
-                    self.scene = self.scenes[res.next_scene]
-                    self.scene.enter(res.payload)
-                else:
-                    self.scene_stack.clear()
-                    self.scene.exit()
-                    self.scene = self.scenes[res.next_scene]
-                    self.scene.enter(res.payload)
+            # fixed-step sim: scenes always see dt == TICK; rendering interpolates
+            # between the last two ticks with clock.alpha
+            self.clock.begin_frame()
+            for _ in range(self.clock.accumulate(frame_dt)):
+                self.scene.update(TICK)
+                if self._apply_result():
+                    break
+            self._apply_result()
 
             self.scene.draw(self.screen)
             pygame.display.flip()
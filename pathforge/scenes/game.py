@@ -1,5 +1,5 @@
 from __future__ import annotations
-import pygame, random
+import os, pygame, random
 from typing import Optional
 
 from ..core.scene import Scene
@@ -8,8 +8,10 @@ from ..stats import CombatStats
 from ..world.grid import generate_grid, tile
 from ..world.world import World
 from ..systems.wave_director import WaveDirector
+from ..systems import forecast as wave_forecast
+from ..systems import sim_process
 from ..ui.widgets import Button
-from ..ui.hud import draw_top_bar, draw_bottom_bar
+from ..ui.hud import draw_top_bar, draw_bottom_bar, build_heat_overlay, draw_forecast_panel
 from ..spells import Spellbook
 
 TOWER_KEYS = ["GATLING","SNIPER","TESLA","CRYO","MORTAR","CANNON","BEACON","FLAME"]
@@ -54,6 +56,9 @@ class GameScene(Scene):
         self.rng = random.Random(seed)
         self.world = World(gs, tile_size=self.tile, offset_x=self.offset_x, offset_y=self.offset_y, w=self.w, h=self.game_h,
                            towers_db=self.game.towers_db, enemies_db=self.game.enemies_db, rng=self.rng)
+        # optional analytic hit resolution (PATHFORGE_PROJECTILES=analytic); default keeps flying projectiles
+        if str(os.environ.get("PATHFORGE_PROJECTILES", "integrate")).strip().lower() == "analytic":
+            self.world.projectile_mode = "ANALYTIC"
 
         # --- PAVÉS: ressource rare au départ (juste un peu plus que la distance Start->End) ---
         if not run:
@@ -117,16 +122,41 @@ class GameScene(Scene):
         self._dd_keys = []
         self._rebuild_tower_dropdown()
 
-        # wave state
-        self.wave_queue = []
+        # wave state (spawn_timer = seconds since the wave started)
+        self.schedule = None
         self.spawn_timer = 0.0
 
+        # background forecast of the next wave while building (PATHFORGE_FORECAST=0 disables)
+        if getattr(self, "forecast", None) is not None:
+            self.forecast.close()
+        self.forecast = wave_forecast.WaveForecast(self.game.towers_db, self.game.enemies_db) if wave_forecast.enabled() else None
+        self.show_forecast = True
+        self._heat_surf = None
+        self._heat_key = None
+
+        # optional: run waves in a child process, render from shared memory (PATHFORGE_SIM_PROCESS=1)
+        if getattr(self, "sim_proc", None) is not None:
+            self.sim_proc.close()
+        self.sim_proc = sim_process.SimProcess(self.game.towers_db, self.game.enemies_db, self.w, self.h) if sim_process.enabled() else None
+        self._remote_wave = False
+        self._remote_txt = []
+        self._tower_slots = None  # stable tower indices for commands while a wave runs remotely
+        self._wave_start = None   # (run, rng state, spell energy) at ASSAUT, replayed if the child dies
+        self.key_state = None     # set by the child runner (forwarded keys); None = pygame keyboard
+
         # load run content
         if run:
             self._load(run)
 
         self._recalc_plan()
 
+    def exit(self):
+        if getattr(self, "forecast", None) is not None:
+            self.forecast.close()
+        if getattr(self, "sim_proc", None) is not None:
+            self.sim_proc.close()
+            self._remote_wave = False
+
     def _pause(self):
         self.request("PAUSE", None)
 
@@ -135,7 +165,7 @@ class GameScene(Scene):
 
     def _speed(self):
         self.game.clock.cycle_speed()
-        self.btn_speed.text = f"x{int(self.game.clock.time_scale)}"
+        self.btn_speed.text = self.game.clock.label()
 
     def _set_tool(self, t):
         self.tool = t
@@ -372,19 +402,21 @@ class GameScene(Scene):
             self.world.fx_text(80, self.offset_y+10, "Chemin invalide!", (255,120,120), 0.8)
             return
         self.mode = "WAVE"
-        self.wave_queue.clear()
         self.spawn_timer = 0.0
+        if self.forecast:
+            self.forecast.cancel()
         self.world.enemies.clear()
-        self.world.projectiles.clear()
-
-        base_list = self.director.spawn_list(self.plan)
-        mult = 1.0 + 0.65*(self.wave_multi-1)
-        count = max(1, int(len(base_list)*mult))
-        for _ in range(count):
-            self.wave_queue.append(self.rng.choice(base_list))
-        if self.plan.boss and "BOSS" not in self.wave_queue:
-            self.wave_queue.insert(0,"BOSS")
-        self.rng.shuffle(self.wave_queue)
+        self.world.clear_projectiles()
+
+        if self.sim_proc and self.sim_proc.start(self.world):
+            self._remote_wave = True
+            self._remote_txt = []
+            self._tower_slots = list(self.world.towers)
+            run = self._serialize()
+            self._wave_start = (run, self.rng.getstate(), self.spells.energy)
+            self.sim_proc.start_wave(run, self.plan, self.wave_multi, self.rng.getstate(), self.spells, self.game.meta.ascension)
+        else:
+            self.schedule = self.director.compile_wave(self.plan, self.wave_multi)
 
         # telemetry
         try:
@@ -538,6 +570,161 @@ class GameScene(Scene):
         self.world.hero.state.dash_cd = float(h.get("dash_cd",0.0))
         self.world.hero.state.shock_cd = float(h.get("shock_cd",0.0))
 
+    # ---- input commands (applied here, or forwarded to the wave child process) ----
+    def _tower_index(self, t) -> int:
+        slots = self._tower_slots if self._tower_slots is not None else self.world.towers
+        try:
+            return slots.index(t)
+        except ValueError:
+            return -1
+
+    def _tower_at_index(self, i: int):
+        slots = self._tower_slots if self._tower_slots is not None else self.world.towers
+        if 0 <= i < len(slots) and slots[i] in self.world.towers:
+            return slots[i]
+        return None
+
+    def _command(self, cmd: tuple):
+        if self._remote_wave:
+            self.sim_proc.send(cmd)
+        else:
+            self._apply_command(cmd)
+
+    def _apply_command(self, cmd: tuple):
+        op = cmd[0]
+        if op == "DASH":
+            self.world.hero.dash(cmd[1], cmd[2], self.world)
+        elif op == "SHOCK":
+            self.world.rebuild_spatial()
+            self.world.hero.shock(self.world)
+        elif op == "HERO_TARGET":
+            self.world.hero.set_target(cmd[1], cmd[2])
+        elif op == "SPELL":
+            self.world.rebuild_spatial()
+            self.spells.cast(cmd[1], self.world, self.stats, (cmd[2], cmd[3]))
+        else:
+            t = self._tower_at_index(int(cmd[1]))
+            if t is None:
+                return
+            panel = pygame.Rect(self.w - 390, self.offset_y + 30, 370, 280)
+            panel.bottom = min(panel.bottom, self.game_h - 12)
+            if op == "TARGET":
+                t.cycle_target_mode()
+            elif op == "OVERCLOCK":
+                if t.can_overclock():
+                    t.trigger_overclock()
+                    t.overclock_time *= float(self.stats.overclock_dur_mul)
+                    self.world.fx_text(self.offset_x + t.gx*self.tile, t.gy*self.tile+self.offset_y, "OVERCLOCK", (255,215,0), 0.7)
+            elif op == "UPGRADE":
+                if self.stats.has_flag("flag_lock_upgrades"):
+                    self.world.fx_text(panel.x+30, panel.y+10, "Upgrades bloqués!", (255,120,120), 0.9)
+                    return
+                cost = t.upgrade_cost()
+                if self.stats.gold >= cost:
+                    self.stats.gold -= cost
+                    try:
+                        if getattr(self.game,'telemetry',None):
+                            self.game.telemetry.tower_placed(self.selected_tower_key)
+                    except Exception:
+                        pass
+                    t.upgrade()
+                    try:
+                        if getattr(self.game,'telemetry',None):
+                            self.game.telemetry.tower_upgraded(t.defn.key)
+                    except Exception:
+                        pass
+                else:
+                    self.world.fx_text(panel.x+30, panel.y+10, "Or insuffisant!", (255,120,120), 0.9)
+            elif op == "SELL":
+                self.stats.gold += int(t.spent * float(self.stats.sell_refund))
+                self.world.remove_tower(t)
+            elif op == "BRANCH":
+                if t.can_branch():
+                    t.apply_branch(cmd[2])
+
+    def _update_remote(self, dt: float):
+        """WAVE tick while the child simulates: heartbeat, mirror the published frame, finish."""
+        w = self.world
+        pressed = pygame.key.get_pressed()
+        codes = (w.k_left, w.k_right, w.k_up, w.k_down, w.k_left_alt, w.k_right_alt, w.k_up_alt, w.k_down_alt)
+        self.sim_proc.heartbeat(self.game.clock.time_scale, tuple(k for k in codes if pressed[k]))
+
+        for ev in self.sim_proc.poll_events():
+            if ev[0] == "TXT":
+                _, x, y, txt, c, ttl = ev
+                self._remote_txt.append({"t":"TXT","x":x,"y":y,"txt":txt,"c":c,"ttl":ttl,"life":ttl})
+            elif ev[0] == "END":
+                self._finish_remote_wave(*ev[1:])
+                return
+        if not self.sim_proc.alive:
+            # child died: the mirrored state is mid-wave (enemies killed and paid, gold spent),
+            # so rewind the run to ASSAUT and replay the whole wave locally
+            run, rng_state, energy = self._wave_start
+            self._remote_wave = False
+            self._tower_slots = None
+            self._wave_start = None
+            self.selected_tower = None
+            self.world.enemies.clear()
+            self.world.clear_projectiles()
+            self.world.fx = list(self._remote_txt)
+            self._load(run)
+            self.rng.setstate(rng_state)
+            self.spells.energy = energy
+            self.spawn_timer = 0.0
+            self.schedule = self.director.compile_wave(self.plan, self.wave_multi)
+            return
+
+        for f in list(self._remote_txt):
+            f["ttl"] -= dt
+            if f["ttl"] <= 0:
+                self._remote_txt.remove(f)
+
+        fr = self.sim_proc.read_frame()
+        if fr is None:
+            return
+        w.enemies = fr.enemies
+        w.projectiles = fr.projectiles
+        w.fx = fr.fx + self._remote_txt
+        w.hero.state.x, w.hero.state.y = fr.hero_x, fr.hero_y
+        self.stats.gold, self.stats.lives = fr.gold, fr.lives
+        self.stats.core_shield, self.stats.fragments = fr.core_shield, fr.fragments
+        self.spells.energy = fr.energy
+        self.spawn_timer = fr.sim_time
+        branches = {v: k for k, v in sim_process.BRANCHES.items()}
+        for t, (alive, level, br, target, oc_t, oc_cd) in zip(self._tower_slots, fr.towers):
+            if not alive:
+                if t in w.towers:
+                    w.remove_tower(t)
+                    if self.selected_tower is t:
+                        self.selected_tower = None
+                continue
+            t.level, t.target_mode_idx = level, target
+            t.branch_choice = branches.get(br)
+            t.overclock_time, t.overclock_cd = oc_t, oc_cd
+
+    def _finish_remote_wave(self, run: dict, rng_state, spells, telemetry_calls, defeated: bool):
+        self._remote_wave = False
+        self._tower_slots = None
+        self._wave_start = None
+        self.selected_tower = None
+        self.world.enemies = []
+        self.world.projectiles = []
+        self.world.fx = list(self._remote_txt)
+        self._load(run)
+        self.rng.setstate(rng_state)
+        self.spells = spells
+        tel = getattr(self.game, 'telemetry', None)
+        if tel:
+            for name, args in telemetry_calls:
+                try:
+                    getattr(tel, name)(*args)
+                except Exception:
+                    pass
+        if defeated:
+            self.request("MENU", None)
+        else:
+            self._end_wave()
+
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE: self._pause()
@@ -548,6 +735,7 @@ class GameScene(Scene):
             if event.key == pygame.K_b: self._set_tool("TOWER")
             if event.key == pygame.K_x: self._set_tool("ERASE")
             if event.key == pygame.K_g: self._start_wave()
+            if event.key == pygame.K_h: self.show_forecast = not self.show_forecast
 
             if event.key == pygame.K_v and self.tool == "PATH":
                 self.path_variant_idx = (self.path_variant_idx + 1) % len(self.path_variants)
@@ -558,31 +746,26 @@ class GameScene(Scene):
             # hero skills
             if event.key == pygame.K_SPACE:
                 mx,my = pygame.mouse.get_pos()
-                self.world.hero.dash(mx-self.world.hero.state.x, my-self.world.hero.state.y, self.world)
+                self._command(("DASH", mx-self.world.hero.state.x, my-self.world.hero.state.y))
             if event.key == pygame.K_a:
-                self.world.rebuild_spatial()
-                self.world.hero.shock(self.world)
+                self._command(("SHOCK",))
 
             # tower targeting/overclock
             if self.selected_tower and event.key == pygame.K_TAB:
-                self.selected_tower.cycle_target_mode()
+                self._command(("TARGET", self._tower_index(self.selected_tower)))
             if self.selected_tower and event.key == pygame.K_e:
-                if self.selected_tower.can_overclock():
-                    self.selected_tower.trigger_overclock()
-                    self.selected_tower.overclock_time *= float(self.stats.overclock_dur_mul)
-                    self.world.fx_text(self.offset_x + self.selected_tower.gx*self.tile, self.selected_tower.gy*self.tile+self.offset_y, "OVERCLOCK", (255,215,0), 0.7)
+                self._command(("OVERCLOCK", self._tower_index(self.selected_tower)))
 
             # spells
             if event.key in (pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4):
                 key = {pygame.K_1:"METEOR", pygame.K_2:"FREEZE", pygame.K_3:"REPAIR", pygame.K_4:"DRONE"}[event.key]
                 mx,my = pygame.mouse.get_pos()
-                self.world.rebuild_spatial()
-                self.spells.cast(key, self.world, self.stats, (mx,my))
+                self._command(("SPELL", key, mx, my))
 
         if event.type == pygame.MOUSEBUTTONDOWN:
             mx,my = event.pos
             if event.button == 3:
-                self.world.hero.set_target(mx,my)
+                self._command(("HERO_TARGET", mx, my))
                 return
 
             if self.btn_menu.click(event.pos): return
@@ -608,29 +791,10 @@ class GameScene(Scene):
                 sell = pygame.Rect(panel.x + 210, panel.bottom - 58, 140, 44)
 
                 if upg.collidepoint(event.pos):
-                    if self.stats.has_flag("flag_lock_upgrades"):
-                        self.world.fx_text(panel.x+30, panel.y+10, "Upgrades bloqués!", (255,120,120), 0.9)
-                        return
-                    cost = self.selected_tower.upgrade_cost()
-                    if self.stats.gold >= cost:
-                        self.stats.gold -= cost
-                        try:
-                            if getattr(self.game,'telemetry',None):
-                                self.game.telemetry.tower_placed(self.selected_tower_key)
-                        except Exception:
-                            pass
-                        self.selected_tower.upgrade()
-                        try:
-                            if getattr(self.game,'telemetry',None):
-                                self.game.telemetry.tower_upgraded(self.selected_tower.defn.key)
-                        except Exception:
-                            pass
-                    else:
-                        self.world.fx_text(panel.x+30, panel.y+10, "Or insuffisant!", (255,120,120), 0.9)
+                    self._command(("UPGRADE", self._tower_index(self.selected_tower)))
                     return
                 if sell.collidepoint(event.pos):
-                    self.stats.gold += int(self.selected_tower.spent * float(self.stats.sell_refund))
-                    self.world.remove_tower(self.selected_tower)
+                    self._command(("SELL", self._tower_index(self.selected_tower)))
                     self.selected_tower = None
                     return
 
@@ -638,7 +802,7 @@ class GameScene(Scene):
                     for i,br in enumerate(["A","B","C"]):
                         rr = pygame.Rect(panel.x + 20, panel.y + 84 + i * 44, 330, 38)
                         if rr.collidepoint(event.pos):
-                            self.selected_tower.apply_branch(br)
+                            self._command(("BRANCH", self._tower_index(self.selected_tower), br))
                             return
 
                 tc = self.world.tile_at_pixel(mx,my)
@@ -711,9 +875,13 @@ class GameScene(Scene):
                         if self.world.build_path_tile(*tc, tile_value=tile_val):
                             self.stats.paves -= cost
 
-    def update(self, dt: float):
-        dt = self.game.clock.scaled_dt(dt)
+    def _forecast_snapshot(self):
+        if not self.world.path_valid():
+            return None
+        return wave_forecast.snapshot_world(self.world, self.stats, self.plan, self.wave_multi)
 
+    def update(self, dt: float):
+        clock = self.game.clock
 
         # world tuning & unlock-driven UI
         self._sync_world_from_stats()
@@ -726,11 +894,40 @@ class GameScene(Scene):
             self._rebuild_tower_dropdown()
             self._unlock_sig = sig
 
+        if self._remote_wave:
+            self._update_remote(dt)
+            return
+
+        # fixed-size sim substeps (x2/x3 and turbo x10/x50). Turbo skips FX and stops
+        # once the rendered frame's sim budget is spent (across all its catch-up ticks),
+        # so frame time holds under load.
+        self.world.headless = clock.turbo and self.mode == "WAVE"
+        self.world.snapshot_positions()
+        n, step = clock.substeps(dt)
+        done = 0.0
+        for i in range(n):
+            self._step(step)
+            done += step
+            if self.mode != "WAVE" or self._result.next_scene:
+                break
+            if i + 1 < n and clock.budget_spent():
+                break
+        clock.note_frame(done, dt)
+
+        if self.mode == "BUILD" and self.forecast:
+            self.forecast.update(dt, self._forecast_snapshot)
+
+        # autosave
+        if self.game.request_save:
+            self.game.request_save = False
+            self.game.saves.save_run(self._serialize())
+
+    def _step(self, dt: float):
         # spell regen
         self.spells.tick(dt, self.stats.spell_energy_regen_mul)
 
         # hero
-        keys = pygame.key.get_pressed()
+        keys = self.key_state if self.key_state is not None else pygame.key.get_pressed()
         self.world.hero.update(dt, keys, self.world)
 
         # build spatial
@@ -738,11 +935,8 @@ class GameScene(Scene):
 
         if self.mode == "WAVE":
             self.spawn_timer += dt
-            spawn_gap = max(0.14, 0.34 - 0.03*(self.wave_multi-1))
-            if self.wave_queue and self.spawn_timer >= spawn_gap:
-                self.spawn_timer = 0.0
-                key = self.wave_queue.pop(0)
-                self.world.spawn_enemy(key, wave=self.stats.wave, gold_bonus=self.stats.gold_per_kill)
+            for key, wv in self.schedule.due(self.spawn_timer):
+                self.world.spawn_enemy(key, wave=wv, gold_bonus=self.stats.gold_per_kill)
 
             # update enemies
             for e in list(self.world.enemies):
@@ -792,41 +986,13 @@ class GameScene(Scene):
                         self.stats.fragments += 1 + (1 if e.is_elite() else 0)
                     self.world.enemies.remove(e)
 
-            # towers
-            buffs = {"dmg_mul":1.0,"rate_mul":1.0,"range_mul":1.0}
-            # beacon aura stacks
-            for t in self.world.towers:
-                a = t.aura()
-                if a:
-                    buffs["dmg_mul"] *= float(a.get("dmg_mul", 1.0))
-                    buffs["rate_mul"] *= float(a.get("rate_mul", 1.0))
-                    buffs["range_mul"] *= float(a.get("range_mul", 1.0))
-
-            powered_runes = set(self.world.powered_runes())
-            aura_r = int(getattr(self.stats, "rune_aura_radius", 2))
-
-            for t in self.world.towers:
-                # global on-hit statuses from perks
-                if self.stats.global_on_hit:
-                    oh = t.mods.setdefault("on_hit", {})
-                    for sk, sv in self.stats.global_on_hit.items():
-                        oh[sk] = dict(sv)
-                # legacy flag: global poison
-                if self.stats.has_flag("flag_global_poison_on_hit"):
-                    t.mods.setdefault("on_hit", {}).setdefault("POISON", {"dur":2.0,"stacks":1})
-                local_buffs = dict(buffs)
-                if powered_runes:
-                    for rx, ry in powered_runes:
-                        if max(abs(t.gx-rx), abs(t.gy-ry)) <= aura_r:
-                            local_buffs["dmg_mul"] *= float(getattr(self.stats, "rune_aura_dmg_mul", 1.06))
-                            local_buffs["range_mul"] *= float(getattr(self.stats, "rune_aura_range_mul", 1.05))
-                            break
-                t.update(dt, self.world, self.rng, self.stats, local_buffs)
+            # towers (beacon/rune auras, perk on-hit)
+            self.world.update_towers(dt, self.rng, self.stats)
 
             self.world.update_projectiles(dt)
             self.world.update_fx(dt)
 
-            if not self.wave_queue and not any(e.alive and not e.finished for e in self.world.enemies):
+            if self.schedule.done() and not any(e.alive and not e.finished for e in self.world.enemies):
                 self._end_wave()
 
         else:
@@ -835,15 +1001,24 @@ class GameScene(Scene):
             self.world.update_fx(dt)
             self._recalc_plan()
 
-        # autosave
-        if self.game.request_save:
-            self.game.request_save = False
-            self.game.saves.save_run(self._serialize())
-
 
     def draw(self, screen):
+        # turbo wave: render every few frames only (the last frame stays on screen);
+        # BUILD mode and the editor UI always render
+        if self.mode == "WAVE" and not self.game.clock.render_due():
+            return
         tint = tuple(self.game.biomes.get(self.world.gs.biome, {}).get("tint", [24, 32, 44]))
-        self.world.draw_map(screen, self.game.fonts, biome_tint=tint)
+        # interpolate between the last two ticks (turbo jumps many substeps per tick: draw as-is)
+        alpha = 1.0 if self.game.clock.turbo else self.game.clock.alpha
+        self.world.draw_map(screen, self.game.fonts, biome_tint=tint, alpha=alpha)
+
+        show_fc = self.forecast is not None and self.show_forecast and self.mode == "BUILD" and self.forecast.active
+        if show_fc and self.forecast.runs:
+            key = (self.forecast.gen, self.forecast.runs)
+            if self._heat_key != key:
+                self._heat_surf = build_heat_overlay(self.world, self.forecast.heat, self.forecast.rows)
+                self._heat_key = key
+            screen.blit(self._heat_surf, (self.offset_x, self.offset_y))
 
         self._recalc_plan()
         path_ok = self.world.path_valid()
@@ -880,12 +1055,15 @@ class GameScene(Scene):
             self.game.towers_db[self.selected_tower_key]["name"],
             cost,
             self.wave_multi,
-            tooltip_line="C chemin | B tours | X gomme | G assaut | TAB ciblage | E overclock | SPACE dash | A choc | 1..4 spells | F vitesse | V variante chemin",
+            tooltip_line="C chemin | B tours | X gomme | G assaut | TAB ciblage | E overclock | SPACE dash | A choc | 1..4 spells | F vitesse | V variante chemin | H prévision",
             tool_extra=tool_extra,
         )
 
+        if show_fc:
+            draw_forecast_panel(screen, self.game.fonts, self.offset_x + 8, self.offset_y + 8, self.forecast.summary())
+
         # update button visuals
-        self.btn_speed.text = f"x{int(self.game.clock.time_scale)}"
+        self.btn_speed.text = self.game.clock.label()
         self.btn_tow.text = self.game.towers_db[self.selected_tower_key]["name"]
         self.btn_tow.col = tower_color(self.game.towers_db, self.selected_tower_key)
         self.btn_go.text = f"ASSAUT x{self.wave_multi}" if self.mode == "BUILD" else "EN COURS..."
@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+"""Background wave forecast (BUILD mode).
+
+While the player edits the maze, a worker process replays the upcoming wave
+headless on a few seeds and streams back leaks and a kill-location heatmap.
+
+State is shipped as a compact ForecastSnapshot (grid as bytes, towers and combat
+stats as plain tuples) through a multiprocessing queue; the tower/enemy DBs are
+sent once when the worker starts. A newer snapshot supersedes the running
+rollout: the worker polls its job queue every few hundred ticks and drops stale
+work, and the scene ignores results tagged with an old generation.
+"""
+
+import copy
+import multiprocessing as mp
+import os
+import queue as _queue
+import random
+from array import array
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..stats import CombatStats
+
+# stats that never change a wave's outcome (economy/meta); excluded so buying
+# towers or spending pavés doesn't look like a new build on its own
+_SKIP_STATS = {"gold", "fragments", "paves", "paves_cap", "talent_pts", "talent_nodes", "perks", "perk_rerolls",
+               "unlocked_towers", "unlocked_path_tiles", "interest", "frag_chance", "sell_refund", "tower_cost_mul"}
+_STAT_FIELDS = tuple(f.name for f in fields(CombatStats) if f.name not in _SKIP_STATS)
+
+DT = 1 / 60.0
+MAX_TICKS = 20000
+CHECK_EVERY = 240  # ticks between cancellation polls
+
+
+def enabled() -> bool:
+    return str(os.environ.get("PATHFORGE_FORECAST", "1")).strip().lower() not in ("0", "false", "no", "off")
+
+
+@dataclass(frozen=True)
+class ForecastSnapshot:
+    cols: int
+    rows: int
+    grid: bytes                     # column-major: grid[x*rows + y]
+    start: Tuple[int, int]
+    end: Tuple[int, int]
+    relics: Tuple[Tuple[int, int], ...]
+    runes: Tuple[Tuple[int, int], ...]
+    towers: Tuple[Tuple[int, int, str, int, Optional[str], int], ...]  # gx, gy, key, level, branch, target
+    stats: Tuple[Any, ...]          # values of _STAT_FIELDS, in order
+    plan: Any                       # WavePlan
+    wave_multi: int
+    layout: Tuple[int, int, int, int, int]  # tile, offset_x, offset_y, w, h
+    projectile_mode: str = "INTEGRATE"
+
+
+def snapshot_world(world, stats, plan, wave_multi: int) -> ForecastSnapshot:
+    gs = world.gs
+    grid = bytes(v & 0xFF for col in gs.grid for v in col)
+    towers = tuple((t.gx, t.gy, t.defn.key, int(t.level), t.branch_choice, int(t.target_mode_idx)) for t in world.towers)
+    # copied: perks mutate flags/tower_bonus dicts in place, the last snapshot must not follow
+    st = copy.deepcopy(tuple(getattr(stats, k, None) for k in _STAT_FIELDS))
+    return ForecastSnapshot(
+        cols=gs.cols, rows=gs.rows, grid=grid, start=tuple(gs.start), end=tuple(gs.end),
+        relics=tuple(tuple(r) for r in gs.relics), runes=tuple(tuple(r) for r in getattr(gs, "runes", [])),
+        towers=towers, stats=st, plan=plan, wave_multi=int(wave_multi),
+        layout=(world.tile, world.offset_x, world.offset_y, world.w, world.h),
+        projectile_mode=str(getattr(world, "projectile_mode", "INTEGRATE")),
+    )
+
+
+def rollout(snap: ForecastSnapshot, towers_db: dict, enemies_db: dict, seed: int,
+            cancelled: Optional[Callable[[], bool]] = None) -> Optional[Tuple[int, int, int, array]]:
+    """One headless replay of the planned wave, mirroring GameScene's WAVE tick.
+
+    Returns (leaks, lives_lost, kills, heat) with heat[x*rows+y] = kills in that cell,
+    or None if cancelled.
+    """
+    from ..world.grid import GridState
+    from ..world.world import World
+    from ..settings import T_EMPTY
+    from .wave_director import WaveDirector
+
+    cols, rows = snap.cols, snap.rows
+    grid = [list(snap.grid[x*rows:(x+1)*rows]) for x in range(cols)]
+    gs = GridState(cols=cols, rows=rows, grid=grid, start=snap.start, end=snap.end,
+                   relics=list(snap.relics), runes=list(snap.runes))
+    stats = CombatStats()
+    for k, v in zip(_STAT_FIELDS, snap.stats):
+        setattr(stats, k, v)
+
+    rng = random.Random(seed)
+    tile, ox, oy, w, h = snap.layout
+    world = World(gs, tile_size=tile, offset_x=ox, offset_y=oy, w=w, h=h,
+                  towers_db=towers_db, enemies_db=enemies_db, rng=rng)
+    world.headless = True
+    world.projectile_mode = snap.projectile_mode
+    world.weakness_mul = float(getattr(stats, "weakness_mul", 1.8))
+    world.enemy_speed_mul = float(getattr(stats, "enemy_speed_mul", 1.0))
+    world.rune_vuln_chance = float(getattr(stats, "rune_vuln_chance", 0.10))
+    world.magma_burn_chance = float(getattr(stats, "magma_burn_chance", 0.25))
+    world.cryo_tile_slow_extend = float(getattr(stats, "cryo_tile_slow_extend", 0.05))
+    world.flag_all_projectiles_splash = stats.has_flag("flag_all_projectiles_splash")
+    world.flag_chain_reaction = stats.has_flag("flag_chain_reaction")
+
+    for gx, gy, key, level, branch, target in snap.towers:
+        world.gs.grid[gx][gy] = T_EMPTY
+        t = world.add_tower(gx, gy, key, allow_on_rock=True)
+        if not t:
+            continue
+        t.level = int(level)
+        t.target_mode_idx = int(target)
+        if branch:
+            t.apply_branch(branch)
+    world.invalidate_path()
+
+    plan = snap.plan
+    schedule = WaveDirector(rng).compile_wave(plan, snap.wave_multi)
+    heat = array("H", [0]) * (cols * rows)
+    leaks = kills = 0
+    t_acc = 0.0
+    ticks = 0
+    while (not schedule.done() or world.enemies) and ticks < MAX_TICKS:
+        ticks += 1
+        if cancelled is not None and ticks % CHECK_EVERY == 0 and cancelled():
+            return None
+        t_acc += DT
+        world.rebuild_spatial()
+        for key, wv in schedule.due(t_acc):
+            world.spawn_enemy(key, wave=wv, gold_bonus=stats.gold_per_kill)
+
+        for e in list(world.enemies):
+            e.update(DT)
+            while e.spawn_signals:
+                sig = e.spawn_signals.pop(0)
+                adds = {"PHASE1": ("SCOUT", 4), "PHASE2": ("ELITE", 2)}.get(sig)
+                if not adds:
+                    continue
+                for _ in range(adds[1] + snap.wave_multi):
+                    ne = world.spawn_enemy(adds[0], wave=plan.wave, gold_bonus=stats.gold_per_kill)
+                    if ne:
+                        ne.x, ne.y = e.x, e.y
+                        ne.idx = max(0, e.idx-1)
+            if e.finished:
+                leaks += 1
+                world.enemies.remove(e)
+            elif not e.alive:
+                kills += 1
+                c = world.tile_at_pixel(int(e.x), int(e.y))
+                if c:
+                    i = c[0]*rows + c[1]
+                    heat[i] = min(65535, heat[i] + 1)
+                world.enemies.remove(e)
+
+        world.update_towers(DT, rng, stats)
+        world.update_projectiles(DT)
+
+    lives_lost = max(0, leaks - int(getattr(stats, "core_shield", 0)))
+    return leaks, lives_lost, kills, heat
+
+
+def _worker_main(jobs, results, towers_db: dict, enemies_db: dict):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pending: List[Any] = []
+
+    def drain() -> bool:
+        # keep only the newest job; True if something new arrived
+        got = False
+        while True:
+            try:
+                job = jobs.get_nowait()
+            except _queue.Empty:
+                return got
+            pending[:] = [job]
+            got = True
+
+    while True:
+        if pending:
+            job = pending.pop()
+        else:
+            job = jobs.get()
+        if job is None:
+            return
+        gen, snap, seeds = job
+        if snap is None:
+            continue
+        for i, s in enumerate(seeds):
+            try:
+                out = rollout(snap, towers_db, enemies_db, int(s), cancelled=drain)
+            except Exception:
+                out = None
+            if out is None:
+                break
+            leaks, lives_lost, kills, heat = out
+            results.put((gen, i, len(seeds), leaks, lives_lost, kills, heat.tobytes()))
+            if drain():
+                break
+
+
+class WaveForecast:
+    """Scene-side handle: owns the worker, submits snapshots, accumulates streamed results."""
+
+    def __init__(self, towers_db: dict, enemies_db: dict, seeds: Optional[int] = None, poll_every: float = 0.25):
+        self.towers_db = towers_db
+        self.enemies_db = enemies_db
+        self.n_seeds = max(1, int(seeds if seeds is not None else os.environ.get("PATHFORGE_FORECAST_SEEDS", "4")))
+        self.poll_every = float(poll_every)
+        self.gen = 0
+        self._proc = None
+        self._jobs = None
+        self._results = None
+        self._last: Optional[ForecastSnapshot] = None
+        self._t = 0.0
+        self._reset(0, 0)
+
+    def _reset(self, cols: int, rows: int):
+        self.cols, self.rows = cols, rows
+        self.runs = 0
+        self.leaks: List[int] = []
+        self.lives_lost: List[int] = []
+        self.kills = 0
+        self.heat = array("L", [0]) * (cols * rows)
+
+    def start(self) -> bool:
+        if self._proc is not None:
+            return True
+        try:
+            ctx = mp.get_context("spawn")
+            self._jobs = ctx.Queue()
+            self._results = ctx.Queue()
+            self._proc = ctx.Process(target=_worker_main, args=(self._jobs, self._results, self.towers_db, self.enemies_db), daemon=True)
+            self._proc.start()
+            return True
+        except Exception:
+            self._proc = None
+            return False
+
+    def submit(self, snap: ForecastSnapshot):
+        if snap == self._last or not self.start():
+            return
+        self._last = snap
+        self.gen += 1
+        self._reset(snap.cols, snap.rows)
+        base = int(getattr(snap.plan, "wave", 1)) * 7919
+        seeds = tuple(base + i for i in range(self.n_seeds))
+        try:
+            self._jobs.put((self.gen, snap, seeds))
+        except Exception:
+            pass
+
+    def cancel(self):
+        if self._last is None:
+            return
+        self._last = None
+        self.gen += 1
+        self._reset(self.cols, self.rows)
+        try:
+            self._jobs.put((self.gen, None, ()))
+        except Exception:
+            pass
+
+    def update(self, dt: float, snapshot_fn: Callable[[], Optional[ForecastSnapshot]]):
+        """Call every BUILD frame: rate-limited change detection + non-blocking result drain."""
+        self._t += dt
+        if self._t >= self.poll_every:
+            self._t = 0.0
+            snap = snapshot_fn()
+            if snap is None:
+                self.cancel()
+            else:
+                self.submit(snap)
+        self.poll()
+
+    def poll(self):
+        if self._results is None:
+            return
+        while True:
+            try:
+                gen, i, n, leaks, lives_lost, kills, heat_b = self._results.get_nowait()
+            except _queue.Empty:
+                return
+            except Exception:
+                return
+            if gen != self.gen:
+                continue
+            self.runs += 1
+            self.leaks.append(int(leaks))
+            self.lives_lost.append(int(lives_lost))
+            self.kills += int(kills)
+            h = array("H")
+            h.frombytes(heat_b)
+            if len(h) == len(self.heat):
+                for j, v in enumerate(h):
+                    if v:
+                        self.heat[j] += v
+
+    @property
+    def active(self) -> bool:
+        return self._last is not None
+
+    @property
+    def complete(self) -> bool:
+        return self.runs >= self.n_seeds
+
+    def summary(self) -> Dict[str, Any]:
+        n = max(1, self.runs)
+        return {
+            "runs": self.runs,
+            "seeds": self.n_seeds,
+            "leaks_mean": sum(self.leaks) / n,
+            "leaks_max": max(self.leaks, default=0),
+            "lives_lost_mean": sum(self.lives_lost) / n,
+            "clean_frac": sum(1 for x in self.leaks if x == 0) / n,
+        }
+
+    def close(self):
+        if self._proc is None:
+            return
+        try:
+            self._jobs.put(None)
+            self._proc.join(timeout=0.5)
+            if self._proc.is_alive():
+                self._proc.terminate()
+        except Exception:
+            pass
+        self._proc = None
+        self._jobs = None
+        self._results = None
+        self._last = None
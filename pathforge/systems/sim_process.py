@@ -0,0 +1,417 @@
+from __future__ import annotations
+
+"""Live wave simulation in a child process (PATHFORGE_SIM_PROCESS=1).
+
+The child owns the authoritative wave: at ASSAUT the scene ships its run state
+(the save format from GameScene._serialize), the WavePlan, assault multiplier,
+rng state and spellbook; the child replays the wave with the normal GameScene
+logic and hands the final state back when the wave is cleared or lost.
+
+While the wave runs, the child publishes entity positions, HP, tower states and
+FX into a shared_memory double buffer. The pygame process only reads the front
+slot to render, forwards input as command tuples (GameScene._apply_command) and
+writes a heartbeat + time scale into the header; the child stops advancing when
+the heartbeat stalls (pause/perk overlays).
+
+Layout (little endian):
+  header: seq:int64, front:int64, heartbeat:int64, time_scale:float64
+  slot 0 / slot 1: float32[SLOT_FLOATS]
+    scalars[N_SCALARS]: n_enemies, n_proj, n_fx, n_towers, gold, lives, core_shield,
+                        fragments, energy, energy_max, hero_x, hero_y, sim_time, pad...
+    enemies[MAX_E][E_F]:  x, y, hp, max_hp, shield, arch_idx
+    proj[MAX_P][P_F]:     x, y, style (0 bullet, 1 shell)
+    fx[MAX_FX][FX_F]:     kind, x1, y1, x2|r, y2, ttl, life, w, r, g, b
+    towers[MAX_T][T_F]:   alive, level, branch (0 none, 1..3 A..C), target, oc_time, oc_cd
+Text FX are rare and variable-length: they go through the event queue instead.
+"""
+
+import multiprocessing as mp
+import os
+import queue as _queue
+import struct
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+HEADER = struct.Struct("<qqqd")
+N_SCALARS = 16
+MAX_E, E_F = 768, 6
+MAX_P, P_F = 1024, 3
+MAX_FX, FX_F = 512, 11
+MAX_T, T_F = 256, 6
+OFF_E = N_SCALARS
+OFF_P = OFF_E + MAX_E * E_F
+OFF_FX = OFF_P + MAX_P * P_F
+OFF_T = OFF_FX + MAX_FX * FX_F
+SLOT_FLOATS = OFF_T + MAX_T * T_F
+SLOT_BYTES = SLOT_FLOATS * 4
+SHM_BYTES = HEADER.size + 2 * SLOT_BYTES
+
+FX_KINDS = {"TR": 1, "R": 2, "EX": 3, "ARC": 4}
+BRANCHES = {None: 0, "A": 1, "B": 2, "C": 3}
+PUBLISH_HZ = 60.0
+STALL_S = 0.25  # heartbeat age after which the child pauses
+
+
+def enabled() -> bool:
+    return str(os.environ.get("PATHFORGE_SIM_PROCESS", "0")).strip().lower() in ("1", "true", "yes", "on")
+
+
+class EnemyView:
+    """Render-only stand-in for Enemy (what World.draw_map reads)."""
+    __slots__ = ("x", "y", "hp", "max_hp", "shield", "arch")
+    alive = True
+    finished = False
+
+    def __init__(self, x, y, hp, max_hp, shield, arch):
+        self.x, self.y, self.hp, self.max_hp, self.shield, self.arch = x, y, hp, max_hp, shield, arch
+
+
+class ProjectileView:
+    __slots__ = ("x", "y", "style")
+
+    def __init__(self, x, y, style):
+        self.x, self.y, self.style = x, y, style
+
+
+class Frame:
+    """Decoded front slot."""
+
+    def __init__(self, data, enemy_archs: List[Any]):
+        n_e, n_p, n_fx, n_t = (int(data[i]) for i in range(4))
+        (self.gold, self.lives, self.core_shield, self.fragments) = (int(data[i]) for i in range(4, 8))
+        self.energy, self.energy_max, self.hero_x, self.hero_y, self.sim_time = (float(data[i]) for i in range(8, 13))
+
+        self.enemies = []
+        for i in range(min(n_e, MAX_E)):
+            o = OFF_E + i * E_F
+            ai = int(data[o + 5])
+            if 0 <= ai < len(enemy_archs):
+                self.enemies.append(EnemyView(data[o], data[o + 1], data[o + 2], max(1e-6, data[o + 3]), data[o + 4], enemy_archs[ai]))
+        self.projectiles = []
+        for i in range(min(n_p, MAX_P)):
+            o = OFF_P + i * P_F
+            self.projectiles.append(ProjectileView(data[o], data[o + 1], "SHELL" if data[o + 2] else "BULLET"))
+        self.fx = []
+        for i in range(min(n_fx, MAX_FX)):
+            o = OFF_FX + i * FX_F
+            kind = int(data[o])
+            c = (int(data[o + 8]), int(data[o + 9]), int(data[o + 10]))
+            ttl, life = data[o + 5], data[o + 6]
+            if kind in (FX_KINDS["TR"], FX_KINDS["ARC"]):
+                self.fx.append({"t": "TR", "x1": data[o + 1], "y1": data[o + 2], "x2": data[o + 3], "y2": data[o + 4],
+                                "c": c, "ttl": ttl, "life": life, "w": int(data[o + 7])})
+            elif kind in (FX_KINDS["R"], FX_KINDS["EX"]):
+                self.fx.append({"t": "R" if kind == FX_KINDS["R"] else "EX", "x": data[o + 1], "y": data[o + 2], "r": data[o + 3],
+                                "c": c, "ttl": ttl, "life": life})
+        self.towers = []
+        for i in range(min(n_t, MAX_T)):
+            o = OFF_T + i * T_F
+            self.towers.append((bool(data[o]), int(data[o + 1]), int(data[o + 2]), int(data[o + 3]), float(data[o + 4]), float(data[o + 5])))
+
+
+_S_E = struct.Struct("<%df" % E_F)
+_S_P = struct.Struct("<%df" % P_F)
+_S_FX = struct.Struct("<%df" % FX_F)
+_S_T = struct.Struct("<%df" % T_F)
+_S_SCALARS = struct.Struct("<13f")
+
+
+def _pack_frame(buf: bytearray, scene, slots: List[Any], arch_index: Dict[str, int]):
+    w = scene.world
+    n_e = n_p = n_fx = 0
+    for e in w.enemies:
+        if n_e >= MAX_E:
+            break
+        if not e.alive or e.finished:
+            continue
+        _S_E.pack_into(buf, (OFF_E + n_e * E_F) * 4, e.x, e.y, e.hp, e.max_hp, e.shield, arch_index.get(e.arch.key, -1))
+        n_e += 1
+    for p in w.projectiles:
+        if n_p >= MAX_P:
+            break
+        _S_P.pack_into(buf, (OFF_P + n_p * P_F) * 4, p.x, p.y, 1.0 if p.style in ("MORTAR", "SHELL") else 0.0)
+        n_p += 1
+    for f in w.fx:
+        k = FX_KINDS.get(f["t"])
+        if not k:
+            continue
+        c = f["c"]
+        if k == FX_KINDS["TR"]:
+            recs = [(f["x1"], f["y1"], f["x2"], f["y2"], float(f.get("w", 2)))]
+        elif k == FX_KINDS["ARC"]:
+            pts = f["pts"]
+            recs = [(pts[i][0], pts[i][1], pts[i + 1][0], pts[i + 1][1], 2.0) for i in range(len(pts) - 1)]
+        else:
+            recs = [(f["x"], f["y"], f["r"], 0.0, 0.0)]
+        for x1, y1, x2, y2, ww in recs:
+            if n_fx >= MAX_FX:
+                break
+            _S_FX.pack_into(buf, (OFF_FX + n_fx * FX_F) * 4, k, x1, y1, x2, y2, f["ttl"], f["life"], ww, c[0], c[1], c[2])
+            n_fx += 1
+    live = set(map(id, w.towers))
+    n_t = min(len(slots), MAX_T)
+    for i in range(n_t):
+        t = slots[i]
+        _S_T.pack_into(buf, (OFF_T + i * T_F) * 4, 1.0 if id(t) in live else 0.0, t.level, BRANCHES.get(t.branch_choice, 0),
+                       t.target_mode_idx, t.overclock_time, t.overclock_cd)
+    st = scene.stats
+    h = w.hero.state
+    _S_SCALARS.pack_into(buf, 0, n_e, n_p, n_fx, n_t, st.gold, st.lives, st.core_shield, st.fragments,
+                         scene.spells.energy, scene.spells.energy_max, h.x, h.y, scene.spawn_timer)
+
+
+class _KeyState:
+    """pygame.key.get_pressed() stand-in built from the forwarded pressed key codes."""
+
+    def __init__(self, codes=()):
+        self.codes = frozenset(codes)
+
+    def __getitem__(self, k):
+        return k in self.codes
+
+
+class _Recorder:
+    """Telemetry stand-in: records calls, replayed on the real Telemetry after the wave."""
+
+    def __init__(self):
+        self.calls: List[Tuple[str, tuple]] = []
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return lambda *a: self.calls.append((name, a))
+
+
+class _RunSlot:
+    def __init__(self, run):
+        self.run = run
+
+    def load_run(self):
+        return self.run
+
+    def save_run(self, data):
+        pass
+
+
+class _HeadlessGame:
+    """Just what GameScene touches outside draw()."""
+
+    def __init__(self, towers_db, enemies_db, w, h, ascension, run):
+        from types import SimpleNamespace
+        from ..core.time import GameClock
+        self.towers_db = towers_db
+        self.enemies_db = enemies_db
+        self.perks_db = []
+        self.w, self.h = w, h
+        self.clock = GameClock()
+        self.meta = SimpleNamespace(ascension=ascension)
+        self.saves = _RunSlot(run)
+        self.telemetry = _Recorder()
+        self.request_save = False
+        self.biomes = {}
+        self.fonts = None
+
+    def roll_perks(self, n: int = 3, rarity_bias: float = 0.0):
+        return []
+
+
+def _child_main(shm_name: str, cmds, events, towers_db, enemies_db, w, h):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ["PATHFORGE_FORECAST"] = "0"
+    os.environ["PATHFORGE_SIM_PROCESS"] = "0"
+    from multiprocessing import shared_memory
+    from ..scenes.game import GameScene
+
+    class _RemoteWaveScene(GameScene):
+        def _end_wave(self):
+            self.wave_finished = True
+            self.mode = "BUILD"
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    arch_index = {k: i for i, k in enumerate(sorted(enemies_db))}
+    buf = bytearray(SLOT_BYTES)
+    seq = 0
+    try:
+        while True:
+            job = cmds.get()
+            if job is None:
+                return
+            if job[0] != "WAVE":
+                continue
+            _, run, plan, wave_multi, rng_state, spells, ascension = job
+            game = _HeadlessGame(towers_db, enemies_db, w, h, ascension, run)
+            scene = _RemoteWaveScene(game)
+            scene.enter({"new": False})
+            scene.rng.setstate(rng_state)
+            scene.spells = spells
+            scene.plan = plan
+            scene.wave_multi = int(wave_multi)
+            scene.key_state = _KeyState()
+            scene.wave_finished = False
+            scene._start_wave()
+            scene._tower_slots = list(scene.world.towers)
+
+            last = time.perf_counter()
+            hb_seen, hb_t = -1, last
+            aborted = False
+            while True:
+                while True:
+                    try:
+                        cmd = cmds.get_nowait()
+                    except _queue.Empty:
+                        break
+                    if cmd is None:
+                        return
+                    if cmd[0] == "ABORT":
+                        aborted = True
+                    elif cmd[0] == "KEYS":
+                        scene.key_state = _KeyState(cmd[1])
+                    else:
+                        scene._apply_command(cmd)
+                if aborted:
+                    break
+
+                now = time.perf_counter()
+                dt = min(0.1, now - last)
+                last = now
+                hb, scale = HEADER.unpack_from(shm.buf, 0)[2:]
+                if hb != hb_seen:
+                    hb_seen, hb_t = hb, now
+                if now - hb_t <= STALL_S:
+                    game.clock.time_scale = float(scale) or 1.0
+                    game.clock.begin_frame()
+                    scene.update(dt)
+
+                    for f in scene.world.fx:
+                        if f["t"] == "TXT" and not f.get("sent"):
+                            f["sent"] = True
+                            events.put(("TXT", f["x"], f["y"], f["txt"], tuple(f["c"]), f["ttl"]))
+
+                    # publish into the back slot, then flip
+                    front = HEADER.unpack_from(shm.buf, 0)[1]
+                    back = 1 - int(front)
+                    _pack_frame(buf, scene, scene._tower_slots, arch_index)
+                    off = HEADER.size + back * SLOT_BYTES
+                    shm.buf[off:off + SLOT_BYTES] = buf
+                    seq += 1
+                    struct.pack_into("<qq", shm.buf, 0, seq, back)
+
+                defeated = scene._result.next_scene == "MENU"
+                if scene.wave_finished or defeated:
+                    calls = [c for c in game.telemetry.calls if c[0] != "wave_start"]
+                    events.put(("END", scene._serialize(), scene.rng.getstate(), scene.spells, calls, defeated))
+                    break
+
+                sleep = (1.0 / PUBLISH_HZ) - (time.perf_counter() - now)
+                if sleep > 0:
+                    time.sleep(sleep)
+    finally:
+        try:
+            shm.close()
+        except Exception:
+            pass
+
+
+class SimProcess:
+    """Parent-side handle: owns the child, the shared buffer and the command/event queues."""
+
+    def __init__(self, towers_db: dict, enemies_db: dict, w: int, h: int):
+        self.towers_db = towers_db
+        self.enemies_db = enemies_db
+        self.w, self.h = w, h
+        self._proc = None
+        self._shm = None
+        self._cmds = None
+        self._events = None
+        self._hb = 0
+        self._keys = None
+        self._last_seq = -1
+        self._frame: Optional[Frame] = None
+        self.enemy_archs: List[Any] = []
+
+    def start(self, world) -> bool:
+        if self._proc is not None:
+            return True
+        try:
+            from multiprocessing import shared_memory
+            self.enemy_archs = [world._enemy_arch(k) for k in sorted(self.enemies_db)]
+            self._shm = shared_memory.SharedMemory(create=True, size=SHM_BYTES)
+            HEADER.pack_into(self._shm.buf, 0, 0, 0, 0, 1.0)
+            ctx = mp.get_context("spawn")
+            self._cmds = ctx.Queue()
+            self._events = ctx.Queue()
+            self._proc = ctx.Process(target=_child_main, args=(self._shm.name, self._cmds, self._events, self.towers_db, self.enemies_db, self.w, self.h), daemon=True)
+            self._proc.start()
+            return True
+        except Exception:
+            self.close()
+            return False
+
+    def start_wave(self, run: dict, plan, wave_multi: int, rng_state, spells, ascension: int):
+        self._last_seq = -1
+        self._frame = None
+        self._keys = None
+        self._cmds.put(("WAVE", run, plan, int(wave_multi), rng_state, spells, int(ascension)))
+
+    def send(self, cmd: tuple):
+        try:
+            self._cmds.put(cmd)
+        except Exception:
+            pass
+
+    def heartbeat(self, time_scale: float, pressed_keys: tuple):
+        self._hb += 1
+        struct.pack_into("<qd", self._shm.buf, 16, self._hb, float(time_scale))
+        if pressed_keys != self._keys:
+            self._keys = pressed_keys
+            self.send(("KEYS", pressed_keys))
+
+    def read_frame(self) -> Optional[Frame]:
+        """Latest published frame (None until the child publishes); torn reads are retried."""
+        buf = self._shm.buf
+        for _ in range(3):
+            seq, front = HEADER.unpack_from(buf, 0)[:2]
+            if seq == self._last_seq:
+                return self._frame
+            off = HEADER.size + int(front) * SLOT_BYTES
+            data = memoryview(bytes(buf[off:off + SLOT_BYTES])).cast("f")
+            if HEADER.unpack_from(buf, 0)[0] == seq:
+                self._last_seq = seq
+                self._frame = Frame(data, self.enemy_archs)
+                break
+        return self._frame
+
+    def poll_events(self) -> List[tuple]:
+        out = []
+        while True:
+            try:
+                out.append(self._events.get_nowait())
+            except _queue.Empty:
+                return out
+            except Exception:
+                return out
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.is_alive()
+
+    def close(self):
+        try:
+            if self._cmds is not None:
+                self._cmds.put(None)
+            if self._proc is not None:
+                self._proc.join(timeout=0.5)
+                if self._proc.is_alive():
+                    self._proc.terminate()
+        except Exception:
+            pass
+        try:
+            if self._shm is not None:
+                self._shm.close()
+                self._shm.unlink()
+        except Exception:
+            pass
+        self._proc = None
+        self._shm = None
+        self._cmds = None
+        self._events = None
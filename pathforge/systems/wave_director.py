@@ -1,8 +1,12 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List, Tuple
 import random
 
+from .wave_schedule import AliasTable, WaveSchedule
+
+BOSS_WAVE = ("BOSS","ELITE","TANK","WISP","SCOUT","MUTANT","PYRO","SCOUT")
+
 @dataclass
 class WavePlan:
     wave: int
@@ -11,9 +15,21 @@ class WavePlan:
     relics_in_path: int
 
 class WaveDirector:
+    # theme/tier weights -> alias table (a run only ever sees a handful of distinct themes)
+    _alias_cache: Dict[Tuple[Tuple[str, int], ...], AliasTable] = {}
+
     def __init__(self, rng: random.Random):
         self.rng = rng
 
+    @classmethod
+    def _alias_for(cls, weights: Dict[str, float]) -> AliasTable:
+        # same integer weights the old replicated pool used (k repeated round(wt*10) times)
+        qw = tuple((k, max(1, int(round(wt*10)))) for k, wt in weights.items())
+        table = cls._alias_cache.get(qw)
+        if table is None:
+            table = cls._alias_cache[qw] = AliasTable([k for k, _ in qw], [w for _, w in qw])
+        return table
+
     def plan(self, wave: int, relics_in_path: int, ascension: int = 0) -> WavePlan:
         # deterministic keywords for UI
         seed = (wave*73856093) ^ (relics_in_path*19349663) ^ (ascension*83492791) ^ 0xA5A5A5
@@ -38,11 +54,16 @@ class WaveDirector:
         return WavePlan(wave=wave, boss=boss, keywords=keywords, relics_in_path=relics_in_path)
 
     def spawn_list(self, plan: WavePlan) -> List[str]:
-        w = plan.wave
-
         # Boss waves: boss + a themed escort (hard)
         if plan.boss:
-            return ["BOSS","ELITE","TANK","WISP","SCOUT","MUTANT","PYRO","SCOUT"]
+            return list(BOSS_WAVE)
+        weights, count = self.spawn_weights(plan)
+        table = self._alias_for(weights)
+        return [table.sample(self.rng) for _ in range(count)]
+
+    def spawn_weights(self, plan: WavePlan) -> Tuple[Dict[str, float], int]:
+        """Roster weights and enemy count of a regular wave (what spawn_list samples from)."""
+        w = plan.wave
 
         # Progressive roster unlock by tier.
         # IMPORTANT: early waves must not include heavy-armor / shielded units,
@@ -82,11 +103,28 @@ class WaveDirector:
 
         # Create a "budget-ish" list: enemy count grows with wave.
         # Keep early waves smaller so the bot has time to stabilize.
-        out: List[str] = []
         count = 9 + int(w * 1.7)
-        pool = []
-        for k, wt in weights.items():
-            pool.extend([k] * max(1, int(round(wt*10))))
-        for _ in range(count):
-            out.append(self.rng.choice(pool))
-        return out
+        return weights, count
+
+    def compile_wave(self, plan: WavePlan, wave_multi: int = 1) -> WaveSchedule:
+        """Live-game schedule: assault multi scales the count of the same wave."""
+        base_list = self.spawn_list(plan)
+        mult = 1.0 + 0.65*(wave_multi-1)
+        count = max(1, int(len(base_list)*mult))
+        keys = [self.rng.choice(base_list) for _ in range(count)]
+        if plan.boss and "BOSS" not in keys:
+            keys.insert(0, "BOSS")
+        self.rng.shuffle(keys)
+        gap = max(0.14, 0.34 - 0.03*(wave_multi-1))
+        return WaveSchedule.from_entries([(k, plan.wave) for k in keys], gap=gap, first_at=gap)
+
+    def compile_assault(self, wave: int, wave_multi: int, relics_in_path: int = 0, ascension: int = 0, gap: float = 0.28) -> WaveSchedule:
+        """Balance-sim schedule: assault multi stacks consecutive waves (wave, wave+1, ...)."""
+        entries: List[Tuple[str, int]] = []
+        for i in range(max(1, int(wave_multi))):
+            wv = int(wave + i)
+            plan = self.plan(wv, relics_in_path=relics_in_path, ascension=ascension)
+            for k in self.spawn_list(plan):
+                entries.append((k, wv))
+        self.rng.shuffle(entries)
+        return WaveSchedule.from_entries(entries, gap=gap, first_at=0.0)
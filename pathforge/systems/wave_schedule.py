@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+"""Compiled wave spawn schedules.
+
+A WaveSchedule is built once when a wave starts (from the WaveDirector plan and the
+assault multiplier) and then consumed by cursor: spawn times, archetype ids and
+wave numbers live in flat arrays instead of a Python list popped on a timer.
+Weighted enemy picks go through cached alias tables (O(1) per draw).
+"""
+
+from array import array
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Sequence, Tuple
+import random
+
+
+class AliasTable:
+    """Vose alias method: O(n) build, O(1) weighted draw from a single rng.random()."""
+
+    __slots__ = ("items", "prob", "alias")
+
+    def __init__(self, items: Sequence[Any], weights: Sequence[float]):
+        n = len(items)
+        if n == 0:
+            raise ValueError("AliasTable needs at least one item")
+        total = float(sum(weights))
+        scaled = [float(w) * n / total for w in weights] if total > 0 else [1.0] * n
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # leftovers are 1.0 up to float error
+        self.items = list(items)
+        self.prob = prob
+        self.alias = alias
+
+    def sample(self, rng: random.Random) -> Any:
+        n = len(self.items)
+        u = rng.random() * n
+        i = int(u)
+        if i >= n:
+            i = n - 1
+        return self.items[i] if (u - i) < self.prob[i] else self.items[self.alias[i]]
+
+
+@dataclass
+class WaveSchedule:
+    keys: List[str]   # archetype id -> enemy key
+    times: array      # 'd': spawn time in seconds since wave start (non-decreasing)
+    arch: array       # 'H': archetype id per spawn
+    waves: array      # 'H': wave number per spawn (difficulty scaling)
+    cursor: int = 0
+
+    @classmethod
+    def from_entries(cls, entries: Sequence[Tuple[str, int]], gap: float, first_at: float = 0.0) -> "WaveSchedule":
+        """Evenly spaced spawns: entry i at first_at + i*gap."""
+        keys: List[str] = []
+        ids = {}
+        arch = array("H")
+        waves = array("H")
+        times = array("d")
+        for i, (k, wv) in enumerate(entries):
+            aid = ids.get(k)
+            if aid is None:
+                aid = ids[k] = len(keys)
+                keys.append(k)
+            arch.append(aid)
+            waves.append(max(0, min(65535, int(wv))))
+            times.append(float(first_at) + float(gap) * i)
+        return cls(keys=keys, times=times, arch=arch, waves=waves)
+
+    def __len__(self) -> int:
+        return len(self.arch)
+
+    def remaining(self) -> int:
+        return len(self.arch) - self.cursor
+
+    def done(self) -> bool:
+        return self.cursor >= len(self.arch)
+
+    def due(self, t: float) -> Iterator[Tuple[str, int]]:
+        """Yield (enemy_key, wave) for every spawn with time <= t, advancing the cursor."""
+        times, arch, waves, keys = self.times, self.arch, self.waves, self.keys
+        n = len(arch)
+        while self.cursor < n and times[self.cursor] <= t:
+            i = self.cursor
+            self.cursor = i + 1
+            yield keys[arch[i]], int(waves[i])
@@ -112,3 +112,37 @@ def draw_bottom_bar(
         screen.blit(tip_s, (20, row3_y))
 
     screen.set_clip(old_clip)
+
+
+def build_heat_overlay(world, heat, rows: int):
+    """Translucent kill-zone overlay (one surface, blitted at the map origin)."""
+    cols = world.gs.cols
+    tile = world.tile
+    surf = pygame.Surface((cols * tile, rows * tile), pygame.SRCALPHA)
+    hmax = max(heat) if len(heat) else 0
+    if hmax <= 0:
+        return surf
+    for x in range(cols):
+        for y in range(rows):
+            v = heat[x * rows + y]
+            if v:
+                a = int(40 + 150 * (v / hmax))
+                surf.fill((255, 90, 40, a), (x * tile, y * tile, tile, tile))
+    return surf
+
+
+def draw_forecast_panel(screen, fonts, x: int, y: int, summary: dict):
+    """Predicted leaks for the upcoming wave (BUILD mode background rollouts)."""
+    runs, seeds = int(summary.get("runs", 0)), int(summary.get("seeds", 0))
+    if runs <= 0:
+        txt = f"Prévision... (0/{seeds})"
+        col = (180, 180, 190)
+    else:
+        lm = float(summary.get("leaks_mean", 0.0))
+        txt = f"Prévision: fuites ~{lm:.1f} (max {int(summary.get('leaks_max', 0))})  PV -{summary.get('lives_lost_mean', 0.0):.1f}  [{runs}/{seeds}]"
+        col = (120, 255, 120) if lm <= 0 else ((255, 200, 90) if lm < 3 else (255, 110, 110))
+    t = fonts.s.render(txt, True, col)
+    bg = pygame.Surface((t.get_width() + 16, t.get_height() + 8), pygame.SRCALPHA)
+    bg.fill((0, 0, 0, 150))
+    screen.blit(bg, (x, y))
+    screen.blit(t, (x + 8, y + 4))
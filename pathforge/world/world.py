@@ -15,7 +15,7 @@ from .grid import GridState, tile
 from ..entities.enemy import Enemy, EnemyArch
 from ..entities.tower import Tower, TowerDef
 from ..entities.hero import Hero
-from ..entities.projectile import Projectile
+from ..entities.projectile import Projectile, ScheduledHit
 
 def buildable_for_tower(v: int) -> bool:
     return v in (T_EMPTY,)
@@ -74,8 +74,15 @@ class World:
         self.towers: List[Tower] = []
         self.enemies: List[Enemy] = []
         self.projectiles: List[Projectile] = []
+        self.pending_hits: List[ScheduledHit] = []
         self.fx: List[dict] = []
 
+        # projectile resolution: "INTEGRATE" (fly + collide every frame) or "ANALYTIC"
+        # (time-of-impact computed at fire time, damage scheduled as a hit event).
+        # headless worlds (balance sim) skip FX and cosmetic projectiles entirely.
+        self.projectile_mode = "INTEGRATE"
+        self.headless = False
+
         self._cached_path: Optional[List[Tuple[int,int]]] = None
         self._cached_dist: Optional[dict] = None
         self._cached_dist_ends: Optional[tuple] = None
@@ -94,20 +101,30 @@ class World:
         self.flag_all_projectiles_splash = False
         self.flag_chain_reaction = False
 
-        # simple spatial (list-based)
+        # simple spatial (list-based) + uniform-grid hash for nearest-neighbour hops
         self._spatial: List[Enemy] = []
+        self._hash_cell = float(tile_size) * 3.0  # matches the Tesla chain hop radius
+        self._hash: Optional[Dict[Tuple[int,int], List[Enemy]]] = None
 
     # ---- FX helpers ----
     def fx_tracer(self, x1,y1,x2,y2,color=(255,230,180), ttl=0.08, w=2):
+        if self.headless:
+            return
         self.fx.append({"t":"TR","x1":x1,"y1":y1,"x2":x2,"y2":y2,"c":color,"ttl":ttl,"life":ttl,"w":w})
 
     def fx_ring(self, x,y,r,color,ttl=0.18):
+        if self.headless:
+            return
         self.fx.append({"t":"R","x":x,"y":y,"r":2,"mr":r,"c":color,"ttl":ttl,"life":ttl})
 
     def fx_explosion(self, x,y,r,color=(255,150,80), ttl=0.22):
+        if self.headless:
+            return
         self.fx.append({"t":"EX","x":x,"y":y,"r":2,"mr":r,"c":color,"ttl":ttl,"life":ttl})
 
     def fx_arc(self, x1,y1,x2,y2,color=(100,200,255), ttl=0.12):
+        if self.headless:
+            return
         pts=[(x1,y1)]
         segs=6
         dx=x2-x1; dy=y2-y1
@@ -123,6 +140,8 @@ class World:
         self.fx.append({"t":"ARC","pts":pts,"c":color,"ttl":ttl,"life":ttl})
 
     def fx_text(self, x,y,txt,color=(255,255,255), ttl=0.7):
+        if self.headless:
+            return
         self.fx.append({"t":"TXT","x":x,"y":y,"txt":txt,"c":color,"ttl":ttl,"life":ttl})
 
     def update_fx(self, dt: float):
@@ -136,13 +155,72 @@ class World:
     # ---- spatial ----
     def rebuild_spatial(self):
         self._spatial = [e for e in self.enemies if e.alive and not e.finished]
+        self._hash = None
+
+    def _spatial_hash(self) -> Dict[Tuple[int,int], List[Enemy]]:
+        """Bucket the spatial list into a uniform grid.
+
+        Built lazily on the first neighbour query after rebuild_spatial(), i.e. after
+        enemies have moved this tick, and then shared by every tower firing in the
+        same tick (towers don't move enemies, so buckets stay valid until the next rebuild).
+        """
+        if self._hash is None:
+            cs = self._hash_cell
+            buckets: Dict[Tuple[int,int], List[Enemy]] = {}
+            for e in self._spatial:
+                k = (int(e.x // cs), int(e.y // cs))
+                b = buckets.get(k)
+                if b is None:
+                    buckets[k] = [e]
+                else:
+                    b.append(e)
+            self._hash = buckets
+        return self._hash
+
+    def nearest_unvisited(self, x: float, y: float, r: float, visited: set) -> Optional[Enemy]:
+        """Closest live enemy within r whose id() is not in visited (chain lightning hops).
+
+        Only scans the hash cells overlapping the query circle, so the cost depends on
+        local density instead of the total enemy count.
+        """
+        buckets = self._spatial_hash()
+        cs = self._hash_cell
+        best = None
+        best_d = r*r
+        for gx in range(int((x-r) // cs), int((x+r) // cs)+1):
+            for gy in range(int((y-r) // cs), int((y+r) // cs)+1):
+                b = buckets.get((gx, gy))
+                if not b:
+                    continue
+                for e in b:
+                    if not e.alive or id(e) in visited:
+                        continue
+                    d = (e.x-x)**2 + (e.y-y)**2
+                    if d <= best_d:
+                        best_d = d
+                        best = e
+        return best
 
     def query_radius(self, x: float, y: float, r: float) -> List[Enemy]:
+        """All spatial-list enemies within r (AoE pulses, splash, spells).
+
+        Scans only the hash cells overlapping the circle; result order follows the
+        buckets, not self.enemies.
+        """
         rr = r*r
         out=[]
-        for e in self._spatial:
-            if (e.x-x)**2 + (e.y-y)**2 <= rr:
-                out.append(e)
+        buckets = self._spatial_hash()
+        cs = self._hash_cell
+        x0, x1 = int((x-r) // cs), int((x+r) // cs)
+        y0, y1 = int((y-r) // cs), int((y+r) // cs)
+        for gx in range(x0, x1+1):
+            for gy in range(y0, y1+1):
+                b = buckets.get((gx, gy))
+                if not b:
+                    continue
+                for e in b:
+                    if (e.x-x)**2 + (e.y-y)**2 <= rr:
+                        out.append(e)
         return out
 
     # ---- grid/path ----
@@ -206,11 +284,10 @@ class World:
         self._cached_powered_runes = out
         return out
 
-    def next_cell(self, cell: Tuple[int,int], prev: Optional[Tuple[int,int]], rng: random.Random) -> Optional[Tuple[int,int]]:
-        """Pick the next step towards the end. Supports forks/branches."""
+    def _downhill_options(self, cell: Tuple[int,int], prev: Optional[Tuple[int,int]]) -> List[Tuple[int,int]]:
         dist = self.get_distmap()
         if cell not in dist:
-            return None
+            return []
         cx, cy = cell
         opts = []
         best = dist[cell]
@@ -222,14 +299,24 @@ class World:
                     continue
                 if nd < best:
                     opts.append((nx,ny))
-        if not opts:
-            # no downhill neighbor (dead-end or end)
-            return None
         # avoid bouncing back if possible
         if prev in opts and len(opts) > 1:
             opts = [o for o in opts if o != prev]
+        return opts
+
+    def next_cell(self, cell: Tuple[int,int], prev: Optional[Tuple[int,int]], rng: random.Random) -> Optional[Tuple[int,int]]:
+        """Pick the next step towards the end. Supports forks/branches."""
+        opts = self._downhill_options(cell, prev)
+        if not opts:
+            # no downhill neighbor (dead-end or end)
+            return None
         return rng.choice(opts)
 
+    def peek_next_cell(self, cell: Tuple[int,int], prev: Optional[Tuple[int,int]]) -> Optional[Tuple[int,int]]:
+        """Deterministic next_cell (first downhill option, no rng) for movement prediction."""
+        opts = self._downhill_options(cell, prev)
+        return opts[0] if opts else None
+
     def tile_value_at(self, x: float, y: float) -> int:
         tc = self.tile_at_pixel(int(x), int(y))
         if not tc:
@@ -431,13 +518,192 @@ class World:
         return e
 
     # ---- projectiles ----
-    def update_projectiles(self, dt: float):
+    def fire_projectile(self, x: float, y: float, target, speed: float, spread: float,
+                        dmg: float, dmg_type: str, splash: float, pierce: int,
+                        on_hit: Dict[str, Any], style: str = "BULLET", ttl: float = 2.6):
+        """Fire one shot from (x, y) at target, rotated by spread (radians).
+
+        INTEGRATE: a Projectile aimed at the target's current position, collision-tested
+        every frame by update_projectiles().
+        ANALYTIC: solve the time of impact against the target's predicted lane position
+        and schedule the damage; a cosmetic Projectile is kept for rendering unless headless.
+        """
+        cs, sn = math.cos(spread), math.sin(spread)
+        if self.projectile_mode != "ANALYTIC":
+            dx, dy = target.x - x, target.y - y
+            dist = math.hypot(dx,dy) or 1.0
+            vx, vy = (dx/dist)*speed, (dy/dist)*speed
+            self.projectiles.append(Projectile(
+                x=x, y=y, vx=vx*cs - vy*sn, vy=vx*sn + vy*cs,
+                dmg=dmg, dmg_type=dmg_type,
+                splash=splash, pierce=pierce, ttl=ttl,
+                on_hit=on_hit,
+                style=style
+            ))
+            return
+
+        # fixed-point intercept: t = |P(t) - origin| / speed (enemies are much slower than shots)
+        spd = max(1e-6, float(speed))
+        t = math.hypot(target.x - x, target.y - y) / spd
+        for _ in range(4):
+            px, py = target.predict_pos(t, self)
+            t = math.hypot(px - x, py - y) / spd
+        dx, dy = px - x, py - y
+        dist = math.hypot(dx,dy) or 1.0
+        ux, uy = dx/dist, dy/dist
+        ux, uy = ux*cs - uy*sn, ux*sn + uy*cs
+        if t <= ttl:
+            self.pending_hits.append(ScheduledHit(
+                t=t, target=target, x=x + ux*dist, y=y + uy*dist, dx=ux, dy=uy,
+                reach=(ttl - t)*spd,
+                dmg=dmg, dmg_type=dmg_type, splash=splash, pierce=pierce,
+                on_hit=on_hit, style=style
+            ))
+        if not self.headless:
+            self.projectiles.append(Projectile(
+                x=x, y=y, vx=ux*spd, vy=uy*spd,
+                dmg=dmg, dmg_type=dmg_type, splash=splash, pierce=pierce,
+                ttl=min(t, ttl), on_hit=on_hit, style=style, cosmetic=True
+            ))
+
+    def _apply_projectile_hit(self, hit: Enemy, px: float, py: float, dmg: float, dmg_type: str,
+                              splash: float, on_hit: Dict[str, Any], style: str):
+        hit.take_damage(dmg, dmg_type)
+
+        # statuses from on_hit
+        for sk, sv in (on_hit or {}).items():
+            try:
+                chance = float(sv.get("chance", 1.0))
+            except Exception:
+                chance = 1.0
+            if chance < 1.0 and self.rng.random() > chance:
+                continue
+            hit.add_status(sk, float(sv.get("dur", 1.5)), int(sv.get("stacks",1)), float(sv.get("strength",0.0)))
+
+        # splash
+        if splash and splash > 0:
+            r = splash * self.tile
+            targets = self.query_radius(hit.x, hit.y, r)
+            for e in targets:
+                if e is hit: 
+                    continue
+                e.take_damage(dmg*0.55, dmg_type)
+            # fx
+            col = (255,150,80) if dmg_type=="FIRE" else (200,210,240)
+            self.fx_explosion(hit.x, hit.y, r, col, 0.18)
+            if self.flag_chain_reaction:
+                self.fx_explosion(hit.x, hit.y, r*0.45, (255,220,160), 0.12)
+
+        # tracer on hit
+        if style == "SNIPER":
+            self.fx_tracer(px, py, hit.x, hit.y, (255,255,255), 0.12, 3)
+
+    def _resolve_scheduled_hit(self, h: ScheduledHit):
+        """Impact of an analytic shot: target if it is where we predicted, else whoever is there."""
+        r2 = (self.tile*0.35)**2
+        hit = None
+        tg = h.target
+        if tg.alive and not tg.finished and (tg.x-h.x)**2 + (tg.y-h.y)**2 < r2:
+            hit = tg
+        else:
+            best = r2
+            for e in self._spatial:
+                if not e.alive:
+                    continue
+                d = (e.x-h.x)**2 + (e.y-h.y)**2
+                if d < best:
+                    best = d
+                    hit = e
+        if hit is None:
+            return
+        self._apply_projectile_hit(hit, h.x, h.y, h.dmg, h.dmg_type, h.splash, h.on_hit, h.style)
+        if h.pierce <= 0:
+            return
+
+        # pierce: the shot keeps flying; take the next enemies along the ray (snapshot at impact)
+        rr = self.tile*0.35
+        along = []
+        for e in self._spatial:
+            if e is hit or not e.alive:
+                continue
+            ex, ey = e.x - h.x, e.y - h.y
+            a = ex*h.dx + ey*h.dy
+            if a < 0.0 or a > h.reach:
+                continue
+            if abs(ex*h.dy - ey*h.dx) < rr:
+                along.append((a, e))
+        along.sort(key=lambda it: it[0])
+        for _, e in along[:h.pierce]:
+            self._apply_projectile_hit(e, h.x, h.y, h.dmg, h.dmg_type, h.splash, h.on_hit, h.style)
+
+    def update_towers(self, dt: float, rng: random.Random, stats):
+        """Live-game tower tick: beacon aura stacks, powered rune auras, perk on-hit mods."""
+        buffs = {"dmg_mul":1.0,"rate_mul":1.0,"range_mul":1.0}
+        # beacon aura stacks
+        for t in self.towers:
+            a = t.aura()
+            if a:
+                buffs["dmg_mul"] *= float(a.get("dmg_mul", 1.0))
+                buffs["rate_mul"] *= float(a.get("rate_mul", 1.0))
+                buffs["range_mul"] *= float(a.get("range_mul", 1.0))
+
+        powered_runes = set(self.powered_runes())
+        aura_r = int(getattr(stats, "rune_aura_radius", 2))
+
+        for t in self.towers:
+            # global on-hit statuses from perks
+            if stats.global_on_hit:
+                oh = t.mods.setdefault("on_hit", {})
+                for sk, sv in stats.global_on_hit.items():
+                    oh[sk] = dict(sv)
+            # legacy flag: global poison
+            if stats.has_flag("flag_global_poison_on_hit"):
+                t.mods.setdefault("on_hit", {}).setdefault("POISON", {"dur":2.0,"stacks":1})
+            local_buffs = dict(buffs)
+            if powered_runes:
+                for rx, ry in powered_runes:
+                    if max(abs(t.gx-rx), abs(t.gy-ry)) <= aura_r:
+                        local_buffs["dmg_mul"] *= float(getattr(stats, "rune_aura_dmg_mul", 1.06))
+                        local_buffs["range_mul"] *= float(getattr(stats, "rune_aura_range_mul", 1.05))
+                        break
+            t.update(dt, self, rng, stats, local_buffs)
+
+    def update_projectiles(self, dt: float, max_step: Optional[float] = None):
+        """Resolve due scheduled hits, then move/collide flying projectiles.
+
+        max_step: coarse ticks (headless sim at 20-30 Hz) integrate projectiles in
+        substeps no longer than this, so fast shots don't tunnel through enemies.
+        """
         self.rebuild_spatial()
+
+        if self.pending_hits:
+            due = []
+            for h in self.pending_hits:
+                h.t -= dt
+                if h.t <= 0.0:
+                    due.append(h)
+            if due:
+                self.pending_hits = [h for h in self.pending_hits if h.t > 0.0]
+                for h in due:
+                    self._resolve_scheduled_hit(h)
+
+        if not self.projectiles:
+            return
+        n = 1
+        if max_step and dt > max_step:
+            n = int(math.ceil(dt / max_step - 1e-9))
+        sub = dt / n
+        for _ in range(n):
+            self._integrate_projectiles(sub)
+
+    def _integrate_projectiles(self, dt: float):
         for p in list(self.projectiles):
             p.update(dt)
             if p.ttl <= 0:
                 self.projectiles.remove(p)
                 continue
+            if p.cosmetic:
+                continue
 
             # collision check with nearest in radius
             hit = None
@@ -448,35 +714,7 @@ class World:
                 continue
 
             # apply hit
-            hit.take_damage(p.dmg, p.dmg_type)
-
-            # statuses from on_hit
-            for sk, sv in (p.on_hit or {}).items():
-                try:
-                    chance = float(sv.get("chance", 1.0))
-                except Exception:
-                    chance = 1.0
-                if chance < 1.0 and self.rng.random() > chance:
-                    continue
-                hit.add_status(sk, float(sv.get("dur", 1.5)), int(sv.get("stacks",1)), float(sv.get("strength",0.0)))
-
-            # splash
-            if p.splash and p.splash > 0:
-                r = p.splash * self.tile
-                targets = self.query_radius(hit.x, hit.y, r)
-                for e in targets:
-                    if e is hit: 
-                        continue
-                    e.take_damage(p.dmg*0.55, p.dmg_type)
-                # fx
-                col = (255,150,80) if p.dmg_type=="FIRE" else (200,210,240)
-                self.fx_explosion(hit.x, hit.y, r, col, 0.18)
-                if self.flag_chain_reaction:
-                    self.fx_explosion(hit.x, hit.y, r*0.45, (255,220,160), 0.12)
-
-            # tracer on hit
-            if p.style == "SNIPER":
-                self.fx_tracer(p.x, p.y, hit.x, hit.y, (255,255,255), 0.12, 3)
+            self._apply_projectile_hit(hit, p.x, p.y, p.dmg, p.dmg_type, p.splash, p.on_hit, p.style)
 
             # pierce
             if p.pierce > 0:
@@ -484,8 +722,29 @@ class World:
             else:
                 self.projectiles.remove(p)
 
+    def clear_projectiles(self):
+        self.projectiles.clear()
+        self.pending_hits.clear()
+
+    def snapshot_positions(self):
+        """Remember where enemies/projectiles stand before a tick (render interpolation)."""
+        for e in self.enemies:
+            e.px, e.py = e.x, e.y
+        for p in self.projectiles:
+            p.px, p.py = p.x, p.y
+
+    def _lerp_pos(self, o, alpha: float) -> Tuple[float, float]:
+        px = getattr(o, "px", None)
+        if px is None or alpha >= 1.0:
+            return o.x, o.y
+        py = o.py
+        # teleports (boss adds, respawns) are drawn where they are, not smeared across the map
+        if abs(o.x - px) + abs(o.y - py) > self.tile * 2:
+            return o.x, o.y
+        return px + (o.x - px) * alpha, py + (o.y - py) * alpha
+
     # ---- draw ----
-    def draw_map(self, screen, fonts, biome_tint=(24,32,44)):
+    def draw_map(self, screen, fonts, biome_tint=(24,32,44), alpha: float = 1.0):
         screen.fill(C_BG)
 
         relics = set(getattr(self.gs, 'relics', []))
@@ -568,14 +827,15 @@ class World:
         for e in self.enemies:
             if not e.alive:
                 continue
+            ex, ey = self._lerp_pos(e, alpha)
             r = int(self.tile*0.30) + (10 if "BOSS" in e.arch.tags else 0)
-            pygame.draw.circle(screen, e.arch.color, (int(e.x),int(e.y)), r)
+            pygame.draw.circle(screen, e.arch.color, (int(ex),int(ey)), r)
             # HP bar
             w = 30 if "BOSS" not in e.arch.tags else 52
-            pygame.draw.rect(screen, (220,0,0), (e.x-w//2, e.y-20-r//2, w, 5))
-            pygame.draw.rect(screen, (0,220,90), (e.x-w//2, e.y-20-r//2, w*max(0, e.hp/e.max_hp), 5))
+            pygame.draw.rect(screen, (220,0,0), (ex-w//2, ey-20-r//2, w, 5))
+            pygame.draw.rect(screen, (0,220,90), (ex-w//2, ey-20-r//2, w*max(0, e.hp/e.max_hp), 5))
             if e.shield > 0:
-                pygame.draw.rect(screen, (90,160,255), (e.x-w//2, e.y-26-r//2, w*min(1, e.shield/(e.max_hp*0.6)), 3))
+                pygame.draw.rect(screen, (90,160,255), (ex-w//2, ey-26-r//2, w*min(1, e.shield/(e.max_hp*0.6)), 3))
 
         # hero
         pygame.draw.circle(screen, (240,240,240), (int(self.hero.state.x), int(self.hero.state.y)), int(self.tile*0.22))
@@ -583,10 +843,11 @@ class World:
 
         # projectiles
         for p in self.projectiles:
+            qx, qy = self._lerp_pos(p, alpha)
             if p.style in ("MORTAR","SHELL"):
-                pygame.draw.circle(screen, (230,230,240), (int(p.x),int(p.y)), 4)
+                pygame.draw.circle(screen, (230,230,240), (int(qx),int(qy)), 4)
             else:
-                pygame.draw.circle(screen, (255,230,180), (int(p.x),int(p.y)), 3)
+                pygame.draw.circle(screen, (255,230,180), (int(qx),int(qy)), 3)
 
         # fx
         fx_surf = pygame.Surface((self.w, self.h), pygame.SRCALPHA)